@@ -19,6 +19,8 @@ import psutil
 import platform
 import requests
 import threading
+import copy
+from collections import OrderedDict, deque
 from functools import wraps
 
 # Initialize Flask app
@@ -50,6 +52,14 @@ system_data = {
     'last_update': datetime.now()
 }
 
+# system_data is refreshed by one background sampler thread and request
+# handlers only read it. CPU load is measured between samples instead of
+# blocking for a second per request, and the network check (which can take
+# seconds) runs less often.
+SYSTEM_SAMPLE_INTERVAL = 1.0  # Seconds
+NETWORK_CHECK_INTERVAL = 30.0  # Seconds
+last_network_check = None
+
 # LYRA state management
 lyra_state = {
     'mode': 'home',
@@ -64,6 +74,16 @@ lyra_state = {
     }
 }
 
+# Per-client sessions keyed by socket sid: each console keeps its own command
+# history on top of the shared lyra_state. Sessions are capped in number
+# (least recently used evicted first) and in history length, and idle ones
+# are evicted by the background monitor.
+MAX_CLIENT_SESSIONS = 32
+CLIENT_SESSION_HISTORY = 50
+CLIENT_SESSION_IDLE_TIMEOUT = 1800  # Seconds
+client_sessions = OrderedDict()
+client_sessions_lock = threading.Lock()
+
 # Command processing patterns
 command_patterns = {
     'greetings': ['hello', 'hi', 'hey', 'greetings'],
@@ -89,18 +109,23 @@ def auth_required(f):
     return decorated_function
 
 def update_system_data():
-    """Update system monitoring data"""
-    global system_data
+    """Update system monitoring data (called from the sampler thread)"""
+    global system_data, last_network_check
     try:
-        system_data.update({
-            'cpu_percent': psutil.cpu_percent(interval=1),
+        updates = {
+            # Load since the previous sample, so this returns immediately
+            'cpu_percent': psutil.cpu_percent(interval=None),
             'memory_percent': psutil.virtual_memory().percent,
             'disk_percent': psutil.disk_usage('/').percent if os.name != 'nt' else psutil.disk_usage('C:\\').percent,
             'temperature': get_temperature(),
-            'network_status': check_network_status(),
             'uptime': time.time() - psutil.boot_time(),
             'last_update': datetime.now()
-        })
+        }
+        now = time.monotonic()
+        if last_network_check is None or now - last_network_check >= NETWORK_CHECK_INTERVAL:
+            last_network_check = now
+            updates['network_status'] = check_network_status()
+        system_data.update(updates)
     except Exception as e:
         logger.error(f"Error updating system data: {e}")
 
@@ -159,7 +184,6 @@ def process_command(command_text):
     
     # System status
     elif any(word in command_lower for word in command_patterns['status']):
-        update_system_data()
         response.update({
             'message': f'System Status: CPU {system_data["cpu_percent"]:.1f}%, RAM {system_data["memory_percent"]:.1f}%, Temp {system_data["temperature"]:.1f}°C. All systems operational.',
             'action': 'status_report',
@@ -236,23 +260,113 @@ def process_command(command_text):
     
     return response
 
+def get_client_session(sid):
+    """Get a client's session, creating it and evicting the LRU session if full"""
+    with client_sessions_lock:
+        client = client_sessions.get(sid)
+        if client is None:
+            while len(client_sessions) >= MAX_CLIENT_SESSIONS:
+                client_sessions.popitem(last=False)
+            client = {
+                'history': deque(maxlen=CLIENT_SESSION_HISTORY),
+                'commands_processed': 0,
+                'connected_at': datetime.now().isoformat()
+            }
+            client_sessions[sid] = client
+        client_sessions.move_to_end(sid)
+        client['last_seen'] = time.monotonic()
+        return client
+
+def close_client_session(sid):
+    """Drop a client's session"""
+    with client_sessions_lock:
+        client_sessions.pop(sid, None)
+
+def evict_idle_client_sessions():
+    """Drop sessions that have been idle longer than the timeout"""
+    cutoff = time.monotonic() - CLIENT_SESSION_IDLE_TIMEOUT
+    with client_sessions_lock:
+        for sid in [sid for sid, client in client_sessions.items() if client['last_seen'] < cutoff]:
+            del client_sessions[sid]
+
+def client_session_stats():
+    """Get live session count and approximate bytes held by their histories"""
+    with client_sessions_lock:
+        histories = [list(client['history']) for client in client_sessions.values()]
+    return {
+        'sessions': len(histories),
+        'bytes': sum(len(json.dumps(entry)) for history in histories for entry in history)
+    }
+
+def record_client_command(sid, command_text, response):
+    """Add a processed command to the client's own history"""
+    client = get_client_session(sid)
+    client['commands_processed'] += 1
+    client['history'].append({
+        'command': command_text,
+        'response': response.get('message', ''),
+        'timestamp': datetime.now().isoformat()
+    })
+
+def changed_fields(previous, current):
+    """Get the fields of current that differ from previous"""
+    return {key: value for key, value in current.items() if previous.get(key) != value}
+
+def system_snapshot():
+    """Full system_update payload, marked 'delta': False"""
+    return {
+        'system_data': system_data,
+        'lyra_state': lyra_state,
+        'timestamp': datetime.now().isoformat(),
+        'delta': False
+    }
+
 # Background system monitoring
 def background_monitor():
-    """Background thread for system monitoring"""
+    """
+    Background thread pushing system_update events to all clients
+    
+    Merge contract for system_update consumers: a payload with 'delta': True
+    holds only the system_data and lyra_state fields that changed, and must
+    be merged field by field into the state the client already has. A
+    payload with 'delta': False is a full snapshot that replaces it. Every
+    client gets a snapshot on connect and on request_update, so it always
+    has a base to merge deltas into.
+    """
+    # Last state pushed to clients; only differences are sent after connect
+    last_pushed = {'system_data': {}, 'lyra_state': {}}
     while True:
         try:
-            update_system_data()
-            # Emit system data to all connected clients
-            socketio.emit('system_update', {
-                'system_data': system_data,
-                'lyra_state': lyra_state
-            })
+            evict_idle_client_sessions()
+            lyra_state['client_sessions'] = client_session_stats()
+            current = {
+                'system_data': {key: value for key, value in system_data.items() if key != 'last_update'},
+                'lyra_state': copy.deepcopy(lyra_state)
+            }
+            delta = {}
+            for section, values in current.items():
+                changes = changed_fields(last_pushed[section], values)
+                if changes:
+                    delta[section] = changes
+            
+            # Emit only changed fields to all connected clients
+            if delta:
+                socketio.emit('system_update', {**delta, 'delta': True})
+                last_pushed = current
             time.sleep(5)  # Update every 5 seconds
         except Exception as e:
             logger.error(f"Background monitor error: {e}")
             time.sleep(10)
 
-# Start background monitoring
+def system_sampler():
+    """Background thread keeping system_data current for every reader"""
+    while True:
+        update_system_data()
+        time.sleep(SYSTEM_SAMPLE_INTERVAL)
+
+# Start background sampling and monitoring
+sampler_thread = threading.Thread(target=system_sampler, daemon=True)
+sampler_thread.start()
 monitor_thread = threading.Thread(target=background_monitor, daemon=True)
 monitor_thread.start()
 
@@ -293,7 +407,6 @@ def logout():
 @auth_required
 def api_status():
     """API endpoint for system status"""
-    update_system_data()
     return jsonify({
         'system_data': system_data,
         'lyra_state': lyra_state,
@@ -326,6 +439,7 @@ def handle_connect():
         return False
     
     lyra_state['connected_users'] += 1
+    get_client_session(request.sid)
     logger.info(f"Client connected. Total users: {lyra_state['connected_users']}")
     
     emit('status', {
@@ -334,11 +448,14 @@ def handle_connect():
         'lyra_state': lyra_state,
         'timestamp': datetime.now().isoformat()
     })
+    # Base state for the system_update deltas that follow (see background_monitor)
+    emit('system_update', system_snapshot())
 
 @socketio.on('disconnect')
 def handle_disconnect():
     """Handle client disconnection"""
     lyra_state['connected_users'] = max(0, lyra_state['connected_users'] - 1)
+    close_client_session(request.sid)
     logger.info(f"Client disconnected. Total users: {lyra_state['connected_users']}")
 
 @socketio.on('command')
@@ -351,6 +468,7 @@ def handle_command(data):
         if command_type == 'text_command':
             text = command_data.get('text', '')
             response = process_command(text)
+            record_client_command(request.sid, text, response)
             emit('command_result', response)
             
         elif command_type == 'voice_start':
@@ -362,12 +480,20 @@ def handle_command(data):
             emit('voice_status', {'status': 'stopped', 'message': 'Voice recognition stopped'})
             
         elif command_type == 'system_status':
-            update_system_data()
             emit('system_status', {
                 'system_data': system_data,
                 'lyra_state': lyra_state
             })
             
+        elif command_type == 'session_info':
+            client = get_client_session(request.sid)
+            emit('session_info', {
+                'history': list(client['history']),
+                'commands_processed': client['commands_processed'],
+                'connected_at': client['connected_at'],
+                'sessions': client_session_stats()
+            })
+            
         elif command_type == 'mode_change':
             mode = command_data.get('mode', 'home')
             lyra_state['mode'] = mode
@@ -396,13 +522,8 @@ def handle_command(data):
 
 @socketio.on('request_update')
 def handle_update_request():
-    """Handle manual update requests"""
-    update_system_data()
-    emit('system_update', {
-        'system_data': system_data,
-        'lyra_state': lyra_state,
-        'timestamp': datetime.now().isoformat()
-    })
+    """Handle manual update requests with a full snapshot"""
+    emit('system_update', system_snapshot())
 
 if __name__ == '__main__':
     logger.info("Starting LYRA 3.0 Web Server...")
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+LYRA 3.0 Speech Recognition Benchmark
+Compare speech backends on a corpus of recorded WAV files
+
+Each 16-bit mono WAV file may have a reference transcript next to it with the
+same name and a .txt extension. For every available backend this reports,
+per file and in total: latency until the final transcript, real-time factor
+(processing time / audio duration), time to the first partial hypothesis for
+streaming backends, and word error rate against the reference.
+
+Usage:
+    python benchmark_stt.py path/to/corpus [--backends vosk,whisper,google]
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+# Add core modules to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'core'))
+
+from core.batch_transcribe import read_wav, word_error_rate
+from core.speech_backends import BACKENDS, DEFAULT_BACKEND_ORDER, create_backend
+
+# Audio fed to streaming backends per call, like a microphone read
+CHUNK_SECONDS = 0.1
+
+def run_file(backend, pcm, sample_rate):
+    """Transcribe one file, returning (transcript, latency, first partial latency)"""
+    chunk_bytes = int(sample_rate * CHUNK_SECONDS) * 2
+    chunks = [pcm[i:i + chunk_bytes] for i in range(0, len(pcm), chunk_bytes)]
+    first_partial = []
+    started = time.perf_counter()
+
+    def on_partial(text):
+        if not first_partial:
+            first_partial.append(time.perf_counter() - started)
+
+    transcript = backend.stream(chunks, sample_rate, on_partial)
+    latency = time.perf_counter() - started
+    return transcript, latency, first_partial[0] if first_partial else None
+
+def benchmark(corpus, backend_names):
+    """Run every requested backend over the corpus and print a report"""
+    files = sorted(glob.glob(os.path.join(corpus, '*.wav')))
+    if not files:
+        print(f"❌ No WAV files found in {corpus}")
+        return 1
+
+    corpus_audio = []
+    for path in files:
+        pcm, sample_rate = read_wav(path)
+        reference_path = os.path.splitext(path)[0] + '.txt'
+        reference = None
+        if os.path.exists(reference_path):
+            with open(reference_path, 'r', encoding='utf-8') as f:
+                reference = f.read().strip()
+        corpus_audio.append((os.path.basename(path), pcm, sample_rate, reference))
+    total_audio = sum(len(pcm) / 2 / rate for _, pcm, rate, _ in corpus_audio)
+    print(f"🎧 {len(files)} files, {total_audio:.1f} s of audio")
+
+    for name in backend_names:
+        backend = create_backend(name)
+        if not backend.available:
+            print(f"\n⚠️ {name}: not available, skipped")
+            continue
+
+        print(f"\n🔧 {name}{' (streaming)' if backend.streaming else ''}")
+        total_latency = 0.0
+        errors, reference_words = 0.0, 0
+        for filename, pcm, sample_rate, reference in corpus_audio:
+            transcript, latency, first_partial = run_file(backend, pcm, sample_rate)
+            duration = len(pcm) / 2 / sample_rate
+            total_latency += latency
+            line = f"   {filename}: {latency * 1000:.0f} ms, RTF {latency / duration:.2f}"
+            if first_partial is not None:
+                line += f", first partial {first_partial * 1000:.0f} ms"
+            if reference is not None:
+                wer = word_error_rate(reference, transcript)
+                errors += wer * len(reference.split())
+                reference_words += len(reference.split())
+                line += f", WER {wer:.0%}"
+            print(f"{line} -> {transcript!r}")
+
+        summary = f"   Total: {total_latency:.2f} s, RTF {total_latency / total_audio:.2f}"
+        if reference_words:
+            summary += f", WER {errors / reference_words:.0%}"
+        print(summary)
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark LYRA speech recognition backends')
+    parser.add_argument('corpus', help='Directory of 16-bit mono WAV files with optional .txt references')
+    parser.add_argument('--backends', default=','.join(DEFAULT_BACKEND_ORDER),
+                        help=f"Comma-separated backends from {', '.join(BACKENDS)}")
+    args = parser.parse_args()
+    return benchmark(args.corpus, [name.strip() for name in args.backends.split(',') if name.strip()])
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -14,11 +14,45 @@ This module provides LYRA with the ability to:
 import logging          # For system logging and debugging
 import json            # For JSON data handling and storage
 import os              # For file system operations
+import re              # For tokenizing queries during canonicalization
 import requests        # For HTTP API calls to external services
-import time            # For timing and delays (if needed)
-from datetime import datetime  # For timestamping learned information
+import threading       # For guarding the knowledge base against concurrent writers
+import time            # For timing and search deadlines
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED  # For parallel source queries
+from datetime import datetime, date  # For timestamping learned information
 from typing import Dict, Any, List, Optional  # For type hints and better code clarity
 
+# Words that carry no topic information in knowledge queries.
+# They are stripped before lookup so "the artificial intelligence" and
+# "artificial intelligence" resolve to the same knowledge base entry.
+QUERY_STOPWORDS = frozenset([
+    'a', 'an', 'the', 'of', 'about', 'on', 'for', 'to', 'in',
+    'what', 'who', 'where', 'when', 'which', 'is', 'are', 'was', 'were',
+    'do', 'does', 'did', 'tell', 'me', 'us', 'explain', 'describe',
+    'define', 'definition', 'meaning', 'please', 'lyra', 'can', 'you'
+])
+
+# Words ending in s that are not plurals and must not be stemmed, since
+# folding them would merge unrelated knowledge keys ("news" with "new").
+# Queries are lowercased first (speech transcripts are), so proper nouns
+# ending in s are listed here too rather than recognised by capitals.
+STEM_EXCEPTIONS = frozenset([
+    'series', 'species', 'news', 'mars', 'venus', 'gas', 'lens', 'bus',
+    'chaos', 'cosmos', 'atlas', 'canvas', 'diabetes', 'rabies', 'herpes',
+    'mathematics', 'physics', 'economics', 'politics', 'athletics',
+    'athens', 'paris', 'texas', 'wales', 'netherlands', 'philippines',
+    'carlos', 'james', 'charles', 'hercules', 'perseus', 'pegasus',
+    'olympus', 'windows', 'kubernetes'
+])
+
+# Histogram buckets for knowledge statistics as (upper bound, label);
+# the last bucket is open-ended. Sizes are bytes, ages are days.
+ENTRY_SIZE_BUCKETS = [(1024, '<1KB'), (4096, '1-4KB'), (16384, '4-16KB'), (None, '>=16KB')]
+ENTRY_AGE_BUCKETS = [(1, '<1d'), (7, '1-7d'), (30, '7-30d'), (None, '>=30d')]
+
+# Default cap on the knowledge base's serialized size, in bytes
+DEFAULT_MAX_KNOWLEDGE_BYTES = 4 * 1024 * 1024
+
 class AILearningSystem:
     """
     AI Learning System for LYRA 3.0
@@ -50,12 +84,19 @@ class AILearningSystem:
         # File path for persistent knowledge storage
         self.knowledge_base_file = 'data/knowledge_base.json'
         
+        # File path for the learned query alias table
+        self.alias_file = 'data/knowledge_aliases.json'
+        
         # Global flag to enable/disable learning functionality
         self.learning_enabled = True
         
         # In-memory knowledge base dictionary
         self.knowledge_base = {}
         
+        # Canonical query -> canonical knowledge key, learned from the
+        # titles Wikipedia resolves redirects to (e.g. "ai" -> "artificial intelligence")
+        self.aliases = {}
+        
         # Configuration for external API services
         self.api_configs = {
             'wikipedia': {
@@ -70,11 +111,54 @@ class AILearningSystem:
             'worldbank': {
                 'base_url': 'http://api.worldbank.org/v2/country/all/indicator/NY.GDP.MKTP.CD',
                 'enabled': True  # Free API for economic data
+            },
+            'duckduckgo': {
+                'base_url': 'https://api.duckduckgo.com/',
+                'enabled': True  # Free instant answer API, no key required
             }
         }
         
+        # Remote knowledge sources queried in parallel by search_and_learn.
+        # Each name maps to a _search_<name> method and an api_configs entry.
+        self.knowledge_sources = ['wikipedia', 'duckduckgo']
+        
+        # Display names used in responses to the user
+        self.source_names = {'wikipedia': 'Wikipedia', 'duckduckgo': 'DuckDuckGo'}
+        
+        # Overall deadline (seconds) for one fan-out search across all sources
+        self.search_deadline = 8.0
+        
+        # Minimum extract length for an answer to be returned immediately
+        # without waiting for the remaining sources
+        self.min_answer_length = 40
+        
+        # Worker pool shared by all fan-out searches
+        self._search_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='lyra-knowledge')
+        
+        # Late source results are stored from worker threads, so every
+        # knowledge base and alias mutation happens under this lock
+        self._kb_lock = threading.RLock()
+        
+        # Statistics maintained incrementally on every store and evict so
+        # get_knowledge_stats never has to scan the knowledge base
+        self._stats = {}
+        
+        # Per-entry accounting (source, type, size, learned day) used to
+        # reverse an entry's contribution when it is replaced or evicted
+        self._entry_accounting = {}
+        
+        # Size in bytes of the knowledge base file as last written
+        self._file_size = 0
+        
+        # Cap on the serialized size of all entries; the least recently
+        # learned entries are evicted once it is exceeded
+        self.max_knowledge_bytes = DEFAULT_MAX_KNOWLEDGE_BYTES
+        
         # Load any existing knowledge from persistent storage
         self._load_knowledge_base()
+        self._load_aliases()
+        if self._evict_over_cap():
+            self._save_knowledge_base()
         
     def _load_knowledge_base(self):
         """
@@ -109,6 +193,9 @@ class AILearningSystem:
             self.logger.error(f"Failed to load knowledge base: {e}")
             # Fallback to empty knowledge base to prevent system failure
             self.knowledge_base = {}
+        
+        # One full pass at startup; afterwards statistics are incremental
+        self._rebuild_stats()
     
     def _save_knowledge_base(self):
         """
@@ -125,21 +212,247 @@ class AILearningSystem:
         """
         try:
             # Write knowledge base to JSON file with proper formatting
-            with open(self.knowledge_base_file, 'w', encoding='utf-8') as f:
-                json.dump(self.knowledge_base, f, indent=2, ensure_ascii=False)
+            with self._kb_lock:
+                payload = json.dumps(self.knowledge_base, indent=2, ensure_ascii=False).encode('utf-8')
+                with open(self.knowledge_base_file, 'wb') as f:
+                    f.write(payload)
+                # Remember the file size so stats never need to stat the file
+                self._file_size = len(payload)
             # Log successful save operation
             self.logger.debug("Knowledge base saved successfully")
         except Exception as e:
             # Log any errors during save operation
             self.logger.error(f"Failed to save knowledge base: {e}")
     
+    def _rebuild_stats(self):
+        """
+        Recompute knowledge statistics from scratch
+        
+        Only called after loading the knowledge base; every later change
+        goes through _put_entry or _remove_entry, which keep the counters
+        current.
+        """
+        self._stats = {
+            'sources': {},
+            'types': {},
+            'total_bytes': 0,
+            'size_histogram': {label: 0 for _, label in ENTRY_SIZE_BUCKETS},
+            'learned_per_day': {}
+        }
+        self._entry_accounting = {}
+        with self._kb_lock:
+            for key, entry in self.knowledge_base.items():
+                self._account_entry(key, entry)
+        self._file_size = os.path.getsize(self.knowledge_base_file) if os.path.exists(self.knowledge_base_file) else 0
+    
+    @staticmethod
+    def _bucket_label(value: float, buckets: list) -> str:
+        """Get the histogram bucket label for a value"""
+        for bound, label in buckets:
+            if bound is None or value < bound:
+                return label
+        return buckets[-1][1]
+    
+    @staticmethod
+    def _learned_day(entry: Dict[str, Any]) -> Optional[int]:
+        """Get the day ordinal an entry was learned on, if it is recorded"""
+        try:
+            return datetime.fromisoformat(entry.get('learned_at') or entry.get('timestamp')).toordinal()
+        except (TypeError, ValueError):
+            return None
+    
+    @staticmethod
+    def _adjust_count(counts: Dict[Any, int], key: Any, delta: int):
+        """Add delta to a counter dictionary, dropping keys that reach zero"""
+        counts[key] = counts.get(key, 0) + delta
+        if counts[key] <= 0:
+            del counts[key]
+    
+    def _account_entry(self, key: str, entry: Dict[str, Any]):
+        """Add an entry's contribution to the knowledge statistics"""
+        source = entry.get('source', 'unknown')
+        entry_type = entry.get('type', 'knowledge')
+        size = len(json.dumps(entry, ensure_ascii=False).encode('utf-8'))
+        day = self._learned_day(entry)
+        
+        self._entry_accounting[key] = (source, entry_type, size, day)
+        self._adjust_count(self._stats['sources'], source, 1)
+        self._adjust_count(self._stats['types'], entry_type, 1)
+        self._stats['total_bytes'] += size
+        self._stats['size_histogram'][self._bucket_label(size, ENTRY_SIZE_BUCKETS)] += 1
+        self._adjust_count(self._stats['learned_per_day'], day, 1)
+    
+    def _unaccount_entry(self, key: str):
+        """Remove an entry's contribution from the knowledge statistics"""
+        accounting = self._entry_accounting.pop(key, None)
+        if accounting is None:
+            return
+        source, entry_type, size, day = accounting
+        self._adjust_count(self._stats['sources'], source, -1)
+        self._adjust_count(self._stats['types'], entry_type, -1)
+        self._stats['total_bytes'] -= size
+        self._stats['size_histogram'][self._bucket_label(size, ENTRY_SIZE_BUCKETS)] -= 1
+        self._adjust_count(self._stats['learned_per_day'], day, -1)
+    
+    def _put_entry(self, key: str, entry: Dict[str, Any]):
+        """
+        Insert or replace a knowledge base entry, keeping statistics current
+        
+        The entry moves to the end of the knowledge base's insertion order,
+        which is the order entries are evicted in once max_knowledge_bytes
+        is exceeded.
+        """
+        with self._kb_lock:
+            self._unaccount_entry(key)
+            self.knowledge_base.pop(key, None)
+            self.knowledge_base[key] = entry
+            self._account_entry(key, entry)
+            self._evict_over_cap(keep=key)
+    
+    def _evict_over_cap(self, keep: Optional[str] = None) -> int:
+        """
+        Evict the least recently learned entries until under max_knowledge_bytes
+        
+        Args:
+            keep: Key that is never evicted (the entry just stored)
+            
+        Returns:
+            int: Number of entries evicted
+        """
+        evicted = 0
+        with self._kb_lock:
+            while self._stats['total_bytes'] > self.max_knowledge_bytes:
+                oldest = next((key for key in self.knowledge_base if key != keep), None)
+                if oldest is None:
+                    break
+                self._remove_entry(oldest)
+                evicted += 1
+        if evicted:
+            self.logger.info(f"Evicted {evicted} knowledge entries to stay under "
+                             f"{self.max_knowledge_bytes} bytes")
+        return evicted
+    
+    def _remove_entry(self, key: str) -> bool:
+        """Evict a knowledge base entry, keeping statistics current"""
+        with self._kb_lock:
+            if key not in self.knowledge_base:
+                return False
+            del self.knowledge_base[key]
+            self._unaccount_entry(key)
+            return True
+    
+    def forget_knowledge(self, query: str) -> bool:
+        """
+        Remove the knowledge stored for a query
+        
+        Args:
+            query (str): The query or topic to forget
+            
+        Returns:
+            bool: True if an entry was removed
+        """
+        key = self._knowledge_key(query)
+        if key not in self.knowledge_base:
+            key = query.lower()
+        if self._remove_entry(key):
+            self._save_knowledge_base()
+            self.logger.info(f"Forgot knowledge about '{query}'")
+            return True
+        return False
+    
+    def _load_aliases(self):
+        """
+        Load the learned query alias table from persistent storage
+        
+        A missing or unreadable file simply leaves the alias table empty;
+        aliases are relearned as Wikipedia resolves queries again.
+        """
+        try:
+            if os.path.exists(self.alias_file):
+                with open(self.alias_file, 'r', encoding='utf-8') as f:
+                    self.aliases = json.load(f)
+                self.logger.info(f"Loaded {len(self.aliases)} query aliases")
+        except Exception as e:
+            self.logger.error(f"Failed to load query aliases: {e}")
+            self.aliases = {}
+    
+    def _save_aliases(self):
+        """Save the learned query alias table to persistent storage"""
+        try:
+            with open(self.alias_file, 'w', encoding='utf-8') as f:
+                json.dump(self.aliases, f, indent=2, ensure_ascii=False)
+        except Exception as e:
+            self.logger.error(f"Failed to save query aliases: {e}")
+    
+    @staticmethod
+    def _stem_word(word: str) -> str:
+        """
+        Apply light suffix stemming to a single lowercase query word
+        
+        Only plural endings are folded (an S-stemmer), which is enough to
+        match "drones" with "drone". Short words, words ending in -ss, -us,
+        -is or -ics, and the non-plurals and proper nouns in STEM_EXCEPTIONS
+        are left alone, so "mars", "news", "series" and "physics" keep their
+        own keys.
+        """
+        if len(word) <= 4 or word in STEM_EXCEPTIONS:
+            return word
+        if word.endswith(('ss', 'us', 'is', 'ics')):
+            return word
+        if word.endswith('ies') and not word.endswith(('eies', 'aies')):
+            return word[:-3] + 'y'
+        if word.endswith('es') and not word.endswith(('aes', 'ees', 'oes')):
+            return word[:-1]
+        if word.endswith('s'):
+            return word[:-1]
+        return word
+    
+    def _canonicalize_query(self, query: str) -> str:
+        """
+        Reduce a query to its canonical form for knowledge lookup and storage
+        
+        The query is lowercased, tokenized, stripped of stopwords and
+        articles, and lightly stemmed. If every word is a stopword the
+        lowercased query is used as-is so no query collapses to an empty key.
+        
+        Args:
+            query (str): The raw query text
+            
+        Returns:
+            str: Canonical query string
+        """
+        words = re.findall(r'\w+', query.lower())
+        canonical = ' '.join(self._stem_word(w) for w in words if w not in QUERY_STOPWORDS)
+        return canonical or ' '.join(words)
+    
+    def _knowledge_key(self, query: str) -> str:
+        """Get the knowledge base key for a query, following learned aliases"""
+        canonical = self._canonicalize_query(query)
+        return self.aliases.get(canonical, canonical)
+    
+    def _learn_alias(self, query: str, title: str):
+        """
+        Record that a query resolves to the knowledge stored under a title
+        
+        Wikipedia follows redirects and reports the target page title, so a
+        query like "AI" teaches LYRA that it means "Artificial intelligence".
+        """
+        alias = self._canonicalize_query(query)
+        target = self._canonicalize_query(title)
+        with self._kb_lock:
+            if alias and target and alias != target and self.aliases.get(alias) != target:
+                self.aliases[alias] = target
+                self._save_aliases()
+                self.logger.info(f"Learned alias '{alias}' -> '{target}'")
+    
     def search_and_learn(self, query: str) -> Dict[str, Any]:
         """
         Primary method for searching and learning new information
         
         This method implements LYRA's core learning behavior:
         1. First checks local knowledge base for existing information
-        2. If not found locally, searches external APIs (Wikipedia first)
+        2. If not found locally, queries all enabled remote sources in
+           parallel under one overall deadline (see _fan_out_search)
         3. Stores newly learned information in the knowledge base
         4. Returns structured response with status and learned data
         
@@ -154,7 +467,9 @@ class AILearningSystem:
                 - message: Human-readable summary for the user
         """
         try:
-            # First, check if we already have knowledge about this topic
+            # First, check if we already have knowledge about this topic.
+            # The local lookup is a dictionary probe, so it runs inline rather
+            # than on the pool and a hit never starts any network requests.
             existing_knowledge = self._search_knowledge_base(query)
             if existing_knowledge:
                 self.logger.info(f"Found existing knowledge for: {query}")
@@ -165,20 +480,23 @@ class AILearningSystem:
                     'message': f"I already know about {query}. {existing_knowledge.get('summary', '')[:200]}..."
                 }
             
-            # If not in local knowledge, search Wikipedia as primary source
-            wiki_result = self._search_wikipedia(query)
-            if wiki_result and wiki_result['status'] == 'success':
-                # Store newly learned information in knowledge base
-                self._store_knowledge(query, wiki_result['data'], 'wikipedia')
+            # If not in local knowledge, race all remote sources
+            found = self._fan_out_search(query)
+            if found:
+                source, data = found
+                # Store newly learned information under the resolved page title
+                # and remember the query as an alias of that title
+                title = data.get('title') or query
+                self._store_knowledge(title, data, source)
+                self._learn_alias(query, title)
                 return {
                     'status': 'success',
-                    'source': 'wikipedia',
-                    'data': wiki_result['data'],
-                    'message': f"I learned about {query} from Wikipedia. {wiki_result['data'].get('extract', '')[:200]}..."
+                    'source': source,
+                    'data': data,
+                    'message': f"I learned about {query} from {self.source_names.get(source, source)}. {data.get('extract', '')[:200]}..."
                 }
             
-            # If Wikipedia search fails, return not found status
-            # In future versions, this could try other APIs
+            # No source answered before the deadline
             return {
                 'status': 'not_found',
                 'message': f"I couldn't find information about '{query}'. Let me remember this query for future learning."
@@ -192,12 +510,92 @@ class AILearningSystem:
                 'message': f"I encountered an error while searching for '{query}': {str(e)}"
             }
     
+    def _fan_out_search(self, query: str) -> Optional[tuple]:
+        """
+        Query all enabled remote knowledge sources concurrently
+        
+        Every source in knowledge_sources whose api_configs entry is enabled
+        is submitted to the search pool at once. The first answer whose
+        extract is at least min_answer_length characters is returned
+        immediately; otherwise the best shorter answer seen before the
+        search_deadline is used. Sources that have not started are cancelled,
+        and sources still running are left to finish in the background so
+        their answers can be cached for later queries.
+        
+        Args:
+            query (str): The topic to search for
+            
+        Returns:
+            Optional[tuple]: (source name, data) of the chosen answer, or None
+        """
+        futures = {}
+        for name in self.knowledge_sources:
+            if self.api_configs.get(name, {}).get('enabled', False):
+                search = getattr(self, f'_search_{name}')
+                futures[self._search_executor.submit(search, query)] = name
+        
+        deadline = time.monotonic() + self.search_deadline
+        pending = set(futures)
+        best = None
+        fallback = None
+        
+        while pending and best is None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                if not result or result.get('status') != 'success':
+                    continue
+                answer = (futures[future], result['data'])
+                if len(result['data'].get('extract', '')) >= self.min_answer_length:
+                    best = answer
+                    break
+                if fallback is None:
+                    fallback = answer
+        
+        # Cancel what never started; cache whatever is still in flight
+        for future in pending:
+            if not future.cancel():
+                future.add_done_callback(
+                    lambda f, name=futures[future]: self._cache_late_result(query, name, f)
+                )
+        
+        if pending:
+            self.logger.debug(f"Search for '{query}' left {len(pending)} source(s) running past the decision")
+        
+        return best or fallback
+    
+    def _cache_late_result(self, query: str, source: str, future):
+        """
+        Store an answer that arrived after the fan-out search had decided
+        
+        The answer is only stored when no entry exists yet for its title, and
+        the query is only aliased to it when the query has no answer of its
+        own, so a late result never replaces the answer given to the user.
+        """
+        try:
+            result = future.result()
+            if not result or result.get('status') != 'success':
+                return
+            title = result['data'].get('title') or query
+            with self._kb_lock:
+                if self._knowledge_key(title) not in self.knowledge_base:
+                    self._store_knowledge(title, result['data'], source)
+                if self._knowledge_key(query) not in self.knowledge_base:
+                    self._learn_alias(query, title)
+        except Exception as e:
+            self.logger.error(f"Failed to cache late {source} result: {e}")
+    
     def _search_knowledge_base(self, query: str) -> Optional[Dict[str, Any]]:
         """
         Search the local knowledge base for existing information
         
         This method implements a two-tier search strategy:
-        1. First tries exact key matching (case-insensitive)
+        1. First tries exact key matching on the canonical query (following
+           learned aliases), then on the raw lowercased query for entries
+           stored before canonicalization was introduced
         2. Then tries partial matching in both directions
         
         Args:
@@ -206,18 +604,26 @@ class AILearningSystem:
         Returns:
             Optional[Dict[str, Any]]: The knowledge entry if found, None otherwise
         """
-        # Convert query to lowercase for case-insensitive matching
+        # Canonical key shared by all equivalent phrasings of the query
+        key_canonical = self._knowledge_key(query)
+        
+        # Convert query to lowercase for legacy case-insensitive matching
         query_lower = query.lower()
         
-        # First attempt: Direct/exact match in knowledge base keys
-        if query_lower in self.knowledge_base:
-            return self.knowledge_base[query_lower]
+        # Late fan-out results are stored from executor threads, so look
+        # at a snapshot taken under the lock rather than the live dictionary
+        with self._kb_lock:
+            # First attempt: Direct/exact match in knowledge base keys
+            for key in (key_canonical, query_lower):
+                if key in self.knowledge_base:
+                    return self.knowledge_base[key]
+            entries = list(self.knowledge_base.items())
         
         # Second attempt: Partial matching in both directions
         # This catches cases where the query is a substring of a stored key
         # or where a stored key is a substring of the query
-        for key, value in self.knowledge_base.items():
-            if query_lower in key or key in query_lower:
+        for key, value in entries:
+            if key_canonical and (key_canonical in key or key in key_canonical):
                 return value
         
         # No match found in knowledge base
@@ -281,12 +687,52 @@ class AILearningSystem:
             self.logger.error(f"Wikipedia search error: {e}")
             return {'status': 'error', 'error': str(e)}
     
+    def _search_duckduckgo(self, query: str) -> Dict[str, Any]:
+        """
+        Search the DuckDuckGo Instant Answer API for a topic abstract
+        
+        Args:
+            query (str): The topic to search for
+            
+        Returns:
+            Dict[str, Any]: Response with status and data/error information,
+            shaped like the Wikipedia result
+        """
+        try:
+            if not self.api_configs['duckduckgo']['enabled']:
+                return {'status': 'disabled'}
+            
+            params = {'q': query, 'format': 'json', 'no_html': 1, 'skip_disambig': 1}
+            response = requests.get(self.api_configs['duckduckgo']['base_url'], params=params, timeout=10)
+            
+            if response.status_code == 200:
+                data = response.json()
+                extract = data.get('AbstractText', '')
+                if not extract:
+                    return {'status': 'not_found'}
+                return {
+                    'status': 'success',
+                    'data': {
+                        'title': data.get('Heading', ''),
+                        'extract': extract,
+                        'summary': extract[:300] + '...' if len(extract) > 300 else extract,
+                        'url': data.get('AbstractURL', ''),
+                        'timestamp': str(datetime.now())
+                    }
+                }
+            else:
+                return {'status': 'not_found'}
+                
+        except Exception as e:
+            self.logger.error(f"DuckDuckGo search error: {e}")
+            return {'status': 'error', 'error': str(e)}
+    
     def _store_knowledge(self, query: str, data: Dict[str, Any], source: str):
         """
         Store learned information in the knowledge base
         
         This method:
-        - Normalizes the query key to lowercase for consistent storage
+        - Canonicalizes the query key so equivalent phrasings share one entry
         - Merges the learned data with metadata (source, timestamp, access count)
         - Saves the updated knowledge base to persistent storage
         - Tracks when and where the information was learned
@@ -297,19 +743,20 @@ class AILearningSystem:
             source (str): The source of the information (e.g., 'wikipedia', 'openweather')
         """
         try:
-            # Normalize the query key to lowercase for consistent storage and retrieval
-            key = query.lower()
-            
-            # Store the knowledge with metadata about the learning process
-            self.knowledge_base[key] = {
-                **data,  # Spread the learned data (title, extract, summary, etc.)
-                'source': source,  # Track where this information came from
-                'learned_at': str(datetime.now()),  # When was this learned
-                'access_count': 1  # Track how often this knowledge is accessed
-            }
+            # Canonicalize the query key for consistent storage and retrieval
+            key = self._knowledge_key(query)
             
-            # Persist the updated knowledge base to file storage
-            self._save_knowledge_base()
+            with self._kb_lock:
+                # Store the knowledge with metadata about the learning process
+                self._put_entry(key, {
+                    **data,  # Spread the learned data (title, extract, summary, etc.)
+                    'source': source,  # Track where this information came from
+                    'learned_at': str(datetime.now()),  # When was this learned
+                    'access_count': 1  # Track how often this knowledge is accessed
+                })
+                
+                # Persist the updated knowledge base to file storage
+                self._save_knowledge_base()
             
             # Log successful storage for debugging and monitoring
             self.logger.info(f"Stored knowledge about '{query}' from {source}")
@@ -372,32 +819,41 @@ class AILearningSystem:
                 'type': 'conversation'
             }
             
-            self.knowledge_base[conversation_key] = conversation_data
-            self._save_knowledge_base()
+            with self._kb_lock:
+                self._put_entry(conversation_key, conversation_data)
+                self._save_knowledge_base()
             
         except Exception as e:
             self.logger.error(f"Failed to learn from conversation: {e}")
     
     def get_knowledge_stats(self) -> Dict[str, Any]:
-        """Get statistics about the knowledge base"""
+        """
+        Get statistics about the knowledge base
+        
+        All counters are maintained incrementally, so this is constant time
+        apart from the age histogram, which walks one counter per distinct
+        learning day rather than one per entry.
+        """
         try:
-            total_entries = len(self.knowledge_base)
-            sources = {}
-            types = {}
-            
-            for entry in self.knowledge_base.values():
-                source = entry.get('source', 'unknown')
-                entry_type = entry.get('type', 'knowledge')
+            with self._kb_lock:
+                today = date.today().toordinal()
+                age_histogram = {label: 0 for _, label in ENTRY_AGE_BUCKETS}
+                age_histogram['unknown'] = 0
+                for day, count in self._stats['learned_per_day'].items():
+                    if day is None:
+                        age_histogram['unknown'] += count
+                    else:
+                        age_histogram[self._bucket_label(today - day, ENTRY_AGE_BUCKETS)] += count
                 
-                sources[source] = sources.get(source, 0) + 1
-                types[entry_type] = types.get(entry_type, 0) + 1
-            
-            return {
-                'total_entries': total_entries,
-                'sources': sources,
-                'types': types,
-                'file_size': os.path.getsize(self.knowledge_base_file) if os.path.exists(self.knowledge_base_file) else 0
-            }
+                return {
+                    'total_entries': len(self.knowledge_base),
+                    'sources': dict(self._stats['sources']),
+                    'types': dict(self._stats['types']),
+                    'total_bytes': self._stats['total_bytes'],
+                    'size_histogram': dict(self._stats['size_histogram']),
+                    'age_histogram': age_histogram,
+                    'file_size': self._file_size
+                }
             
         except Exception as e:
             self.logger.error(f"Failed to get knowledge stats: {e}")
@@ -415,8 +871,10 @@ class AILearningSystem:
         """Search local knowledge base for relevant information"""
         results = []
         query_lower = query.lower()
+        with self._kb_lock:
+            entries = list(self.knowledge_base.items())
         
-        for key, value in self.knowledge_base.items():
+        for key, value in entries:
             # Check if query matches key or content
             if query_lower in key:
                 results.append({'key': key, 'relevance': 'high', 'data': value})
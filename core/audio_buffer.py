@@ -0,0 +1,210 @@
+"""
+LYRA 3.0 Audio Buffer
+Capture ring buffer and utterance segmentation for voice input
+
+Capturing a phrase and transcribing it in the same thread loses whatever is
+said while recognition runs. These pieces let voice input split the work:
+- AudioRingBuffer: preallocated PCM ring the capture thread writes into
+  without ever blocking; a reader that falls behind loses the oldest audio
+  and the loss is counted
+- UtteranceSegmenter: endpointing that cuts the audio stream into
+  utterances (with a little pre-roll) for a recognition worker, by energy or
+  with a VoiceActivityDetector
+"""
+
+import threading
+from collections import deque
+from typing import List, Optional
+
+import numpy as np
+
+from .vad import VoiceActivityDetector
+
+
+class AudioRingBuffer:
+    """
+    Fixed-capacity ring of 16-bit mono samples with one writer and one reader
+
+    Positions are absolute sample counts since the buffer was created, so the
+    reader can tell exactly how much it missed if it fell a full lap behind.
+
+    Attributes:
+        capacity: Number of samples held
+        overruns: Times the reader fell behind and lost audio
+        dropped_samples: Samples overwritten before the reader got them
+    """
+
+    def __init__(self, capacity: int):
+        """Preallocate the ring"""
+        if capacity < 1:
+            raise ValueError(f"Ring capacity must be at least 1, got {capacity}")
+        self.capacity = capacity
+        self._samples = np.zeros(capacity, dtype=np.int16)
+        self._written = 0        # Total samples ever written
+        self._read = 0           # Total samples handed to (or lost by) the reader
+        self.overruns = 0
+        self.dropped_samples = 0
+        self._lock = threading.Lock()
+        self._data_ready = threading.Condition(self._lock)
+
+    def write(self, pcm: bytes):
+        """Append 16-bit PCM; never blocks, overwriting the oldest audio when full"""
+        samples = np.frombuffer(pcm, dtype='<i2')
+        total = len(samples)
+        if total > self.capacity:
+            samples = samples[-self.capacity:]
+        with self._lock:
+            start = (self._written + total - len(samples)) % self.capacity
+            first = min(len(samples), self.capacity - start)
+            self._samples[start:start + first] = samples[:first]
+            self._samples[:len(samples) - first] = samples[first:]
+            self._written += total
+            self._data_ready.notify()
+
+    def read(self, max_samples: Optional[int] = None, timeout: Optional[float] = None) -> bytes:
+        """
+        Take the unread audio, waiting up to timeout for some to arrive
+
+        Returns:
+            bytes: 16-bit PCM, empty if nothing arrived in time
+        """
+        with self._lock:
+            if self._written == self._read and timeout:
+                self._data_ready.wait(timeout)
+            behind = self._written - self._read
+            if behind > self.capacity:
+                # The writer lapped us; skip what was overwritten
+                self.overruns += 1
+                self.dropped_samples += behind - self.capacity
+                self._read = self._written - self.capacity
+                behind = self.capacity
+            count = behind if max_samples is None else min(behind, max_samples)
+            start = self._read % self.capacity
+            first = min(count, self.capacity - start)
+            data = np.concatenate((self._samples[start:start + first], self._samples[:count - first]))
+            self._read += count
+        return data.astype('<i2').tobytes()
+
+    @property
+    def pending(self) -> int:
+        """Samples written but not yet read"""
+        with self._lock:
+            return min(self._written - self._read, self.capacity)
+
+
+class UtteranceSegmenter:
+    """
+    Cuts a stream of audio frames into utterances
+
+    An utterance starts when a frame counts as speech and ends after pause
+    seconds of non-speech frames, or when it reaches max_seconds. A short
+    pre-roll before the first speech frame is kept so word onsets are not
+    clipped. Without a VAD a frame is speech when its RMS exceeds
+    energy_threshold; with one, the VAD decides and completed utterances are
+    trimmed of leading and trailing non-speech, and dropped if none is left.
+
+    Attributes:
+        energy_threshold: RMS in 16-bit sample units that counts as speech
+        vad: Optional VoiceActivityDetector
+        trimmed_samples: Non-speech samples the VAD cut from utterances
+    """
+
+    def __init__(self, sample_rate: int, energy_threshold: float = 300.0, pause: float = 0.8,
+                 pre_roll: float = 0.3, min_seconds: float = 0.2, max_seconds: float = 5.0,
+                 vad: Optional[VoiceActivityDetector] = None):
+        self.sample_rate = sample_rate
+        self.energy_threshold = energy_threshold
+        self.vad = vad
+        self.trimmed_samples = 0
+        self.pause = pause
+        self.min_seconds = min_seconds
+        self.max_seconds = max_seconds
+        self._pre_roll = deque()
+        self._pre_roll_samples = 0
+        self._pre_roll_limit = int(pre_roll * sample_rate)
+        self._frames = []          # Frames of the utterance in progress
+        self._samples = 0
+        self._quiet_samples = 0
+        self._voiced_samples = 0
+        self.in_utterance = False
+
+    @property
+    def current_audio(self) -> bytes:
+        """Audio of the utterance in progress so far, pre-roll included; empty between utterances"""
+        return b''.join(self._frames) if self.in_utterance else b''
+
+    def process(self, pcm: bytes) -> List[bytes]:
+        """
+        Feed one frame of 16-bit PCM
+
+        Returns:
+            List of completed utterances (usually empty)
+        """
+        samples = np.frombuffer(pcm, dtype='<i2').astype(np.float32)
+        if not len(samples):
+            return []
+        if self.vad:
+            loud = self.vad.is_speech(pcm)
+        else:
+            loud = np.sqrt(np.mean(samples ** 2)) >= self.energy_threshold
+        completed = []
+
+        if not self.in_utterance:
+            if loud:
+                self.in_utterance = True
+                self._frames = list(self._pre_roll)
+                self._samples = self._pre_roll_samples
+                self._pre_roll.clear()
+                self._pre_roll_samples = 0
+                self._quiet_samples = 0
+                self._voiced_samples = 0
+            else:
+                self._pre_roll.append(pcm)
+                self._pre_roll_samples += len(samples)
+                while self._pre_roll and self._pre_roll_samples - len(self._pre_roll[0]) // 2 >= self._pre_roll_limit:
+                    self._pre_roll_samples -= len(self._pre_roll.popleft()) // 2
+                return completed
+
+        self._frames.append(pcm)
+        self._samples += len(samples)
+        if loud:
+            self._quiet_samples = 0
+            self._voiced_samples += len(samples)
+        else:
+            self._quiet_samples += len(samples)
+
+        if (self._quiet_samples >= self.pause * self.sample_rate
+                or self._samples >= self.max_seconds * self.sample_rate):
+            if self._voiced_samples >= self.min_seconds * self.sample_rate:
+                utterance = b''.join(self._frames)
+                if self.vad:
+                    trimmed = self.vad.trim(utterance)
+                    self.trimmed_samples += (len(utterance) - len(trimmed)) // 2
+                    utterance = trimmed
+                if utterance:
+                    completed.append(utterance)
+            self.in_utterance = False
+            self._frames = []
+            self._samples = 0
+        return completed
+
+    def restart(self):
+        """
+        Start a new utterance here, discarding the one in progress
+
+        The last pre-roll worth of audio is kept as the start of the new
+        utterance, e.g. when the user talks over audio that was already
+        being captured as an utterance.
+        """
+        if not self.in_utterance:
+            return
+        kept, kept_samples = [], 0
+        for frame in reversed(self._frames):
+            if kept_samples >= self._pre_roll_limit:
+                break
+            kept.insert(0, frame)
+            kept_samples += len(frame) // 2
+        self._frames = kept
+        self._samples = kept_samples
+        self._quiet_samples = 0
+        self._voiced_samples = 0
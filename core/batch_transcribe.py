@@ -0,0 +1,233 @@
+"""
+LYRA 3.0 Batch Transcription
+Transcribes recorded WAV files in parallel, for field recordings and testing
+
+VoiceInput only transcribes live microphone audio, one phrase at a time. This
+module runs a speech backend over whole files instead:
+- Files are decoded and transcribed in a pool of worker processes, each with
+  its own backend instance, so recognition uses every CPU core
+- WAV files of any PCM sample width and channel count are decoded with NumPy
+  and mixed down to 16-bit mono
+- Results are written as JSON Lines as soon as each file finishes, followed
+  by a summary record with throughput and real-time factor
+- A reference transcript next to a WAV file (same name, .txt) adds a word
+  error rate to its result
+"""
+
+import glob
+import json
+import logging
+import os
+import time
+import wave
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple, Union
+
+import numpy as np
+
+from .speech_backends import SpeechBackend, SpeechBackendError, create_backend, select_backend
+
+# Backend of the current worker process, created once by _init_worker
+_worker_backend: Optional[SpeechBackend] = None
+
+
+def read_wav(path: str) -> Tuple[bytes, int]:
+    """
+    Read a PCM WAV file as 16-bit mono
+
+    8-, 16-, 24- and 32-bit files are converted to 16 bits and multiple
+    channels are averaged.
+
+    Returns:
+        Tuple of (pcm bytes, sample rate)
+    """
+    with wave.open(path, 'rb') as wav:
+        width = wav.getsampwidth()
+        channels = wav.getnchannels()
+        sample_rate = wav.getframerate()
+        raw = wav.readframes(wav.getnframes())
+    if width == 2 and channels == 1:
+        return raw, sample_rate
+
+    if width == 1:
+        samples = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) * 256.0
+    elif width == 2:
+        samples = np.frombuffer(raw, dtype='<i2').astype(np.float32)
+    elif width == 3:
+        # Little-endian 24-bit: place the three bytes in the top of an int32
+        triples = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        samples = ((triples[:, 0] << 8 | triples[:, 1] << 16 | triples[:, 2] << 24) >> 16).astype(np.float32)
+    elif width == 4:
+        samples = (np.frombuffer(raw, dtype='<i4') >> 16).astype(np.float32)
+    else:
+        raise ValueError(f"{path}: unsupported sample width of {width} bytes")
+    samples = samples.reshape(-1, channels).mean(axis=1)
+    return np.clip(samples, -32768, 32767).astype('<i2').tobytes(), sample_rate
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """Word-level edit distance divided by the number of reference words"""
+    ref = reference.lower().split()
+    hyp = hypothesis.lower().split()
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, start=1):
+        current = [i]
+        for j, hyp_word in enumerate(hyp, start=1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1,
+                               previous[j - 1] + (ref_word != hyp_word)))
+        previous = current
+    return previous[-1] / len(ref)
+
+
+def collect_files(source: Union[str, Iterable[str]]) -> List[str]:
+    """Expand a directory (searched recursively) or a list of paths into sorted WAV files"""
+    if isinstance(source, str):
+        if os.path.isdir(source):
+            return sorted(glob.glob(os.path.join(source, '**', '*.wav'), recursive=True))
+        return [source]
+    return list(source)
+
+
+def _init_worker(backend_name: str, options: Dict[str, Any]):
+    """Create the worker process's backend; models load on its first file"""
+    global _worker_backend
+    _worker_backend = create_backend(backend_name, **options)
+
+
+def _transcribe_file(path: str, backend: Optional[SpeechBackend] = None) -> Dict[str, Any]:
+    """Decode and transcribe one file, returning its result record"""
+    backend = backend or _worker_backend
+    result = {'type': 'result', 'file': path, 'backend': backend.name}
+    started = time.perf_counter()
+    try:
+        pcm, sample_rate = read_wav(path)
+        decoded = time.perf_counter()
+        result['duration'] = round(len(pcm) / 2 / sample_rate, 3)
+        result['transcript'] = backend.transcribe(pcm, sample_rate) if pcm else ''
+        finished = time.perf_counter()
+        result['decode_time'] = round(decoded - started, 4)
+        result['transcribe_time'] = round(finished - decoded, 4)
+        result['rtf'] = round((finished - started) / result['duration'], 4) if result['duration'] else None
+    except (OSError, EOFError, wave.Error, ValueError, SpeechBackendError) as e:
+        result['error'] = str(e)
+        return result
+
+    reference_path = os.path.splitext(path)[0] + '.txt'
+    if os.path.exists(reference_path):
+        with open(reference_path, 'r', encoding='utf-8') as f:
+            result['reference'] = f.read().strip()
+        result['wer'] = round(word_error_rate(result['reference'], result['transcript']), 4)
+    return result
+
+
+class BatchTranscriber:
+    """
+    Transcribes many WAV files on a process pool
+
+    Attributes:
+        backend_name: Speech backend every worker uses
+        workers: Number of worker processes; 0 transcribes in this process
+    """
+
+    def __init__(self, backend: Optional[str] = None, workers: Optional[int] = None,
+                 backend_options: Optional[Dict[str, Any]] = None):
+        """
+        Initialize a batch transcriber
+
+        Args:
+            backend: Backend name; by default the first available one
+            workers: Worker processes, by default one per CPU core
+            backend_options: Keyword arguments for the backend's constructor
+        """
+        self.logger = logging.getLogger(__name__)
+        self.backend_options = backend_options or {}
+        if backend is None:
+            selected = select_backend()
+            if selected is None:
+                raise SpeechBackendError("No speech recognition backend available")
+            backend = selected.name
+        elif not create_backend(backend, **self.backend_options).available:
+            raise SpeechBackendError(f"Speech backend {backend} is not available")
+        self.backend_name = backend
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+
+    def transcribe(self, source: Union[str, Iterable[str]]) -> Iterator[Dict[str, Any]]:
+        """
+        Transcribe files, yielding each result as soon as it is ready
+
+        Results arrive in completion order, not file order. The last record
+        yielded is the summary from summarize().
+        """
+        files = collect_files(source)
+        started = time.perf_counter()
+        results = []
+        self.logger.info(f"Transcribing {len(files)} files with {self.backend_name} "
+                         f"on {self.workers or 'no'} worker processes")
+
+        if self.workers == 0 or len(files) <= 1:
+            backend = create_backend(self.backend_name, **self.backend_options)
+            for path in files:
+                result = _transcribe_file(path, backend)
+                results.append(result)
+                yield result
+        else:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(files)),
+                                     initializer=_init_worker,
+                                     initargs=(self.backend_name, self.backend_options)) as pool:
+                futures = [pool.submit(_transcribe_file, path) for path in files]
+                for future in as_completed(futures):
+                    result = future.result()
+                    results.append(result)
+                    yield result
+
+        yield self.summarize(results, time.perf_counter() - started)
+
+    def summarize(self, results: List[Dict[str, Any]], wall_time: float) -> Dict[str, Any]:
+        """
+        Aggregate statistics over a batch
+
+        rtf is processing time over audio duration summed across all files
+        (the cost per second of audio); wall_rtf is elapsed time over audio
+        duration, which parallelism brings down; throughput is audio seconds
+        transcribed per elapsed second.
+        """
+        done = [result for result in results if 'error' not in result]
+        audio = sum(result['duration'] for result in done)
+        processing = sum(result['decode_time'] + result['transcribe_time'] for result in done)
+        scored = [result for result in done if 'wer' in result]
+        summary = {
+            'type': 'summary',
+            'backend': self.backend_name,
+            'workers': self.workers,
+            'files': len(results),
+            'errors': len(results) - len(done),
+            'audio_seconds': round(audio, 3),
+            'wall_seconds': round(wall_time, 3),
+            'rtf': round(processing / audio, 4) if audio else None,
+            'wall_rtf': round(wall_time / audio, 4) if audio else None,
+            'throughput': round(audio / wall_time, 3) if wall_time else None
+        }
+        if scored:
+            words = sum(len(result['reference'].split()) for result in scored)
+            errors = sum(result['wer'] * len(result['reference'].split()) for result in scored)
+            summary['wer'] = round(errors / words, 4) if words else 0.0
+        return summary
+
+    def run(self, source: Union[str, Iterable[str]], output: TextIO) -> Dict[str, Any]:
+        """
+        Transcribe files and write every record to output as JSON Lines
+
+        Returns:
+            Dict: The summary record
+        """
+        summary = {}
+        for record in self.transcribe(source):
+            output.write(json.dumps(record) + '\n')
+            output.flush()
+            if record['type'] == 'summary':
+                summary = record
+            elif 'error' in record:
+                self.logger.warning(f"Could not transcribe {record['file']}: {record['error']}")
+        return summary
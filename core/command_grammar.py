@@ -0,0 +1,95 @@
+"""
+LYRA 3.0 Command Grammar
+Restricts speech recognition of commands to LYRA's command language
+
+Spoken commands use a small language of device names, verbs, modes,
+directions and numbers, yet open-vocabulary recognition searches the whole
+dictionary for them: slower, and prone to hearing "hover" as "however". The
+grammar built here from the DecisionEngine's command patterns and handler
+vocabulary lets a recognizer that supports it (Vosk) decode command-mode
+utterances against just those words. Knowledge questions still need the open
+vocabulary, so a constrained transcript with a question opening or mostly
+unknown words is decoded again without the grammar.
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional
+
+# Marker Vosk emits for speech outside the grammar
+UNKNOWN_WORD = '[unk]'
+
+# Glue words that commonly surround command words
+FILLER_WORDS = ['lyra', 'please', 'the', 'a', 'to', 'go', 'turn', 'on', 'off', 'and', 'now',
+                'mode', 'start', 'stop', 'set', 'by', 'meters', 'degrees', 'percent']
+
+NUMBER_WORDS = ['zero', 'one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine',
+                'ten', 'eleven', 'twelve', 'thirteen', 'fourteen', 'fifteen', 'sixteen',
+                'seventeen', 'eighteen', 'nineteen', 'twenty', 'thirty', 'forty', 'fifty',
+                'sixty', 'seventy', 'eighty', 'ninety', 'hundred', 'point']
+
+
+class CommandGrammar:
+    """
+    Word list and phrases a command may be made of
+
+    Attributes:
+        phrases: Command phrases, each a hint for multi-word commands
+        words: Every word allowed in a command
+        question_words: First words of utterances that need open vocabulary
+    """
+
+    def __init__(self, phrases: Iterable[str], question_phrases: Iterable[str] = (),
+                 extra_words: Iterable[str] = ()):
+        self.phrases = sorted({phrase.lower().strip() for phrase in phrases if phrase.strip()})
+        question_phrases = [phrase.lower().strip() for phrase in question_phrases if phrase.strip()]
+        self.question_words = sorted({phrase.split()[0] for phrase in question_phrases})
+        words = set(extra_words)
+        for phrase in self.phrases + question_phrases:
+            words.update(phrase.split())
+        self.words = sorted(words)
+
+    def recognizer_grammar(self) -> List[str]:
+        """
+        Grammar in the form Vosk's KaldiRecognizer takes: allowed words and
+        phrases, plus the unknown-word marker so out-of-grammar speech shows
+        up as such instead of being forced onto the nearest command
+        """
+        return sorted(set(self.words) | set(self.phrases)) + [UNKNOWN_WORD]
+
+    def needs_open_vocabulary(self, transcript: str) -> bool:
+        """
+        Whether a grammar-constrained transcript should be decoded again
+        without the grammar: it is empty, contains a question opening (which
+        may follow the wake word), or is mostly speech outside the grammar
+        """
+        words = transcript.lower().split()
+        if not words:
+            return True
+        if any(word in self.question_words for word in words):
+            return True
+        unknown = sum(1 for word in words if word == UNKNOWN_WORD)
+        return unknown * 2 > len(words)
+
+    @staticmethod
+    def clean(transcript: str) -> str:
+        """Drop unknown-word markers from an accepted transcript"""
+        return ' '.join(word for word in transcript.split() if word != UNKNOWN_WORD)
+
+
+def build_command_grammar(decision_engine, wake_words: Optional[Iterable[str]] = None) -> CommandGrammar:
+    """
+    Build the command grammar from a DecisionEngine
+
+    Args:
+        decision_engine: Engine whose get_command_vocabulary() defines the commands
+        wake_words: Wake word phrases to allow as well
+
+    Returns:
+        CommandGrammar covering every command intent, with the question
+        openings kept only as triggers for open-vocabulary decoding
+    """
+    vocabulary: Dict[str, List[str]] = decision_engine.get_command_vocabulary()
+    questions = vocabulary.pop('questions', [])
+    phrases = [re.sub(r'[^a-z0-9\s\-]', ' ', phrase.lower()) for entries in vocabulary.values()
+               for phrase in entries]
+    return CommandGrammar(phrases + list(wake_words or []), questions, FILLER_WORDS + NUMBER_WORDS)
@@ -10,7 +10,8 @@ system's memory and state management center. It handles:
 - Session management and activity tracking
 - Device state management for TRINETRA (UGV) and KRAIT-3 (UAV)
 - Environmental context and situational awareness
-- Persistent storage and retrieval of context data
+- Persistent storage and retrieval of context data (append-only journal
+  plus periodic compacted snapshots)
 
 The Context Manager provides:
 - Thread-safe state management
@@ -24,10 +25,168 @@ The Context Manager provides:
 
 import json  # For JSON serialization/deserialization of context data
 import logging  # For logging context operations and errors
+import threading  # For serializing writers to shared context structures
+import time  # For monotonic timestamps on conversation entries
+from collections import deque  # For queuing change events in commit order
+from bisect import bisect_left  # For time-window lookups in conversation history
 from datetime import datetime, timedelta  # For timestamp management and time-based operations
-from typing import Dict, Any, List, Optional  # For type hints and better code documentation
+from typing import Dict, Any, List, Optional, Callable, Iterable  # For type hints and better code documentation
 import os  # For file system operations and path handling
 
+from .metrics_store import MetricsStore  # For bounded history of numeric state fields
+
+class ConversationHistory:
+    """
+    Fixed-capacity ring buffer of conversation entries
+    
+    Entries are stored in preallocated slots alongside a monotonic timestamp,
+    so appending never reallocates or re-slices and time-window queries use
+    binary search instead of parsing timestamp strings.
+    
+    Writers are serialized by a lock; readers never take it. Every write
+    bumps a sequence number before and after touching the slots (a seqlock),
+    so a reader copies the slots and simply retries if a write overlapped
+    the copy. Readers always get a consistent snapshot list they can iterate
+    freely while new entries keep arriving.
+    
+    Attributes:
+        capacity: Maximum number of entries retained; the oldest is overwritten
+    """
+    
+    def __init__(self, capacity: int = 100):
+        """Initialize an empty history holding at most capacity entries"""
+        if capacity < 1:
+            raise ValueError(f"History capacity must be at least 1, got {capacity}")
+        self.capacity = capacity
+        self._entries = [None] * capacity
+        self._times = [0.0] * capacity
+        # (index of oldest entry, number of entries), replaced as one tuple
+        self._state = (0, 0)
+        # Even when idle, odd while a write is in progress
+        self._seq = 0
+        self._write_lock = threading.Lock()
+    
+    def append(self, entry: Dict[str, Any], timestamp: Optional[float] = None):
+        """Add an entry, overwriting the oldest one when the buffer is full"""
+        stamp = time.monotonic() if timestamp is None else timestamp
+        with self._write_lock:
+            start, count = self._state
+            self._seq += 1
+            slot = (start + count) % self.capacity
+            self._entries[slot] = entry
+            self._times[slot] = stamp
+            if count < self.capacity:
+                self._state = (start, count + 1)
+            else:
+                self._state = ((start + 1) % self.capacity, count)
+            self._seq += 1
+    
+    def _ordered(self, items: list, start: int, count: int) -> list:
+        """Unroll ring slots into oldest-first order"""
+        end = start + count
+        if end <= self.capacity:
+            return items[start:end]
+        return items[start:] + items[:end - self.capacity]
+    
+    def snapshot(self) -> tuple:
+        """
+        Get a consistent copy of the history without blocking writers
+        
+        Returns:
+            tuple: (entries, monotonic timestamps), both oldest first
+        """
+        while True:
+            seq = self._seq
+            if seq & 1:
+                # A write is in progress; let the writer finish
+                time.sleep(0)
+                continue
+            entries = self._entries[:]
+            times = self._times[:]
+            start, count = self._state
+            if self._seq == seq:
+                return self._ordered(entries, start, count), self._ordered(times, start, count)
+    
+    def latest(self, limit: int) -> List[Dict[str, Any]]:
+        """Get up to limit of the most recent entries, oldest first"""
+        if limit <= 0:
+            return []
+        entries, _ = self.snapshot()
+        return entries[-limit:]
+    
+    def since(self, stamp: float) -> List[Dict[str, Any]]:
+        """Get entries recorded at or after a monotonic timestamp"""
+        entries, times = self.snapshot()
+        return entries[bisect_left(times, stamp):]
+    
+    def drop_older_than(self, stamp: float) -> int:
+        """
+        Discard entries recorded before a monotonic timestamp
+        
+        Returns:
+            int: Number of entries discarded
+        """
+        with self._write_lock:
+            start, count = self._state
+            times = self._ordered(self._times, start, count)
+            dropped = bisect_left(times, stamp)
+            if dropped:
+                self._seq += 1
+                for offset in range(dropped):
+                    self._entries[(start + offset) % self.capacity] = None
+                self._state = ((start + dropped) % self.capacity, count - dropped)
+                self._seq += 1
+            return dropped
+    
+    def clear(self):
+        """Discard all entries"""
+        with self._write_lock:
+            self._seq += 1
+            self._entries = [None] * self.capacity
+            self._state = (0, 0)
+            self._seq += 1
+    
+    def __len__(self) -> int:
+        return self._state[1]
+    
+    def __iter__(self):
+        return iter(self.snapshot()[0])
+
+class FrozenDict(dict):
+    """
+    Read-only dictionary used for published context snapshots
+    
+    Snapshots are shared between threads without copying, so any attempt to
+    mutate one raises TypeError. Being a dict subclass, a snapshot can still
+    be passed straight to json.dumps or a SocketIO emit. Use dict(snapshot)
+    or snapshot.copy() to get a mutable copy.
+    """
+    
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Context snapshots are read-only; use the ContextManager update methods")
+    
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+    __ior__ = _readonly
+    
+    def copy(self) -> Dict[str, Any]:
+        """Get a mutable shallow copy"""
+        return dict(self)
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively convert dicts to FrozenDict and lists to tuples"""
+    if isinstance(value, dict):
+        return FrozenDict((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+# Stands in for the session duration in the cached summary until it is read
+_DURATION_PLACEHOLDER = '\x00session_duration\x00'
+
+
 class ContextManager:
     """
     Manages system context, state, and memory for LYRA 3.0
@@ -37,39 +196,95 @@ class ContextManager:
     conversation history. It provides persistent storage and retrieval of
     context data across sessions.
     
+    Mode, system state, device states and user preferences are published
+    together as one immutable snapshot (read-copy-update). Writers take a
+    lock, build a new snapshot that shares every unchanged part with the old
+    one, and swap it in with a single reference assignment. Readers never
+    lock: they grab the current snapshot reference and can hold on to it,
+    serialize it or iterate it while writers carry on.
+    
+    Mutations also publish typed change events (see EVENT_TYPES) to
+    subscribers, carrying only what changed, so UIs can be updated by push
+    instead of polling.
+    
     Attributes:
         logger: Logger instance for context operations
         current_mode: Current operational mode (home, defense, night, manual)
         system_state: Dictionary storing component states and health information
-        conversation_history: List of recent conversation entries with timestamps
+        conversation_history: Ring buffer of recent conversation entries with timestamps
         user_preferences: Dictionary of user-specific settings and preferences
         device_states: Connection and status information for external devices
         session_start_time: Timestamp when current session began
         last_activity: Timestamp of last system activity
     """
     
-    def __init__(self):
-        """Initialize the Context Manager with default settings and load persistent data"""
+    # Change events published to subscribers
+    EVENT_MODE_CHANGED = 'mode_changed'
+    EVENT_DEVICE_STATE_CHANGED = 'device_state_changed'
+    EVENT_SYSTEM_STATE_CHANGED = 'system_state_changed'
+    EVENT_CONVERSATION_ENTRY_ADDED = 'conversation_entry_added'
+    EVENT_TYPES = (EVENT_MODE_CHANGED, EVENT_DEVICE_STATE_CHANGED,
+                   EVENT_SYSTEM_STATE_CHANGED, EVENT_CONVERSATION_ENTRY_ADDED)
+    
+    def __init__(self, history_size: int = 100, config_dir: str = 'config',
+                 fsync_interval: float = 1.0, compact_every: int = 500):
+        """
+        Initialize the Context Manager with default settings and load persistent data
+        
+        Args:
+            history_size: Number of conversation entries kept in memory
+            config_dir: Directory holding the context snapshot and journal
+            fsync_interval: Maximum seconds a journaled mutation may stay
+                unsynced to disk (the most a crash can lose)
+            compact_every: Journal records after which a fresh snapshot is
+                written and the journal truncated
+        """
         # Initialize logging for context operations and debugging
         self.logger = logging.getLogger(__name__)
         
-        # Set default operational mode - 'home' is the standard startup mode
-        self.current_mode = 'home'
+        # Serializes writers; readers use the published snapshot without locking
+        self._write_lock = threading.RLock()
+        
+        # Bumped on every mutation visible in the context summary; the summary
+        # is cached as (version, summary, JSON prefix, JSON suffix) and only
+        # rebuilt once the version has moved on
+        self._version = 0
+        self._summary_cache = None
+        
+        # Published state snapshot, replaced as a whole on every mutation
+        self._state = _freeze({
+            # Set default operational mode - 'home' is the standard startup mode
+            'mode': 'home',
+            
+            # System state to track component health and status
+            'system_state': {},
+            
+            # User preferences for personalization settings
+            'user_preferences': {},
+            
+            # Device states for external hardware (TRINETRA UGV, KRAIT-3 UAV)
+            'device_states': {
+                'trinetra': {'connected': False, 'status': 'offline'},  # TRINETRA ground vehicle
+                'krait3': {'connected': False, 'status': 'offline'}     # KRAIT-3 aerial vehicle
+            }
+        })
         
-        # Initialize system state dictionary to track component health and status
-        self.system_state = {}
+        # Initialize fixed-size conversation history for storing user interactions
+        self.conversation_history = ConversationHistory(history_size)
         
-        # Initialize conversation history list for storing user interactions
-        self.conversation_history = []
+        # Multi-resolution history of numeric system and device state fields
+        self.metrics = MetricsStore()
         
-        # Initialize user preferences dictionary for personalization settings
-        self.user_preferences = {}
+        # Change event subscribers as (token, callback, event types or None),
+        # replaced as a whole tuple so publishing never needs the lock
+        self._subscribers = ()
+        self._next_subscriber_token = 1
         
-        # Initialize device states for external hardware (TRINETRA UGV, KRAIT-3 UAV)
-        self.device_states = {
-            'trinetra': {'connected': False, 'status': 'offline'},  # TRINETRA ground vehicle
-            'krait3': {'connected': False, 'status': 'offline'}     # KRAIT-3 aerial vehicle
-        }
+        # Change events queued under the write lock in commit order and
+        # delivered one at a time, so subscribers see them in that order
+        self._event_queue = deque()
+        self._dispatch_lock = threading.Lock()
+        self._dispatch_thread = None
         
         # Record session start time for duration tracking
         self.session_start_time = datetime.now()
@@ -77,16 +292,67 @@ class ContextManager:
         # Track last activity for timeout and session management
         self.last_activity = datetime.now()
         
+        # Persistent storage: a compacted snapshot plus an append-only journal
+        # of preference and device-state mutations made since that snapshot.
+        # Resolved now, as journal flushes run later on a timer thread when
+        # the working directory may have changed
+        config_dir = os.path.abspath(config_dir)
+        self.context_file = os.path.join(config_dir, 'context.json')
+        self.journal_file = os.path.join(config_dir, 'context.journal')
+        self.fsync_interval = fsync_interval
+        self.compact_every = compact_every
+        self._journal = None
+        self._journal_records = 0
+        self._journal_pending = []       # Records queued since the last flush
+        self._journal_generation = 0     # Bumped whenever the journal is truncated
+        self._journal_flush_lock = threading.Lock()
+        self._last_fsync = 0.0
+        self._fsync_timer = None
+        
         # Load persistent data from previous sessions
         self._load_context()
         
+    @property
+    def current_mode(self) -> str:
+        """Current operational mode"""
+        return self._state['mode']
+    
+    @property
+    def system_state(self) -> Dict[str, Any]:
+        """Read-only snapshot of component states"""
+        return self._state['system_state']
+    
+    @property
+    def device_states(self) -> Dict[str, Any]:
+        """Read-only snapshot of device states"""
+        return self._state['device_states']
+    
+    @property
+    def user_preferences(self) -> Dict[str, Any]:
+        """Read-only snapshot of user preferences"""
+        return self._state['user_preferences']
+    
+    def _publish(self, **changes):
+        """
+        Publish a new state snapshot with the given top-level parts replaced
+        
+        Unchanged parts are shared with the previous snapshot, so a mutation
+        costs one small dictionary per level touched rather than a deep copy.
+        """
+        with self._write_lock:
+            self._state = FrozenDict({**self._state, **changes})
+            self._version += 1
+    
     def _load_context(self):
         """
-        Load persistent context data from storage file
+        Load persistent context data from storage
         
-        Attempts to load user preferences and device states from the context.json
-        file in the config directory. If the file doesn't exist or cannot be read,
-        the system will continue with default values.
+        Loads the latest snapshot (context.json) and then replays the journal
+        tail (context.journal) recorded since that snapshot. If the files
+        don't exist or cannot be read, the system will continue with default
+        values. A torn final journal line, left by a crash mid-write, ends the
+        replay without discarding the records before it, and is truncated
+        away so records appended from now on are replayed next time.
         
         Handles:
         - User preference restoration from previous sessions
@@ -94,58 +360,174 @@ class ContextManager:
         - Graceful fallback to defaults if loading fails
         """
         try:
-            # Define the path to the context storage file
-            context_file = 'config/context.json'
-            
-            # Check if the context file exists before attempting to load
-            if os.path.exists(context_file):
-                # Open and read the JSON context file
-                with open(context_file, 'r') as f:
+            # Check if the snapshot file exists before attempting to load
+            if os.path.exists(self.context_file):
+                # Open and read the JSON snapshot file
+                with open(self.context_file, 'r') as f:
                     # Parse JSON data from the file
                     data = json.load(f)
                     
-                    # Restore user preferences, using empty dict as fallback
-                    self.user_preferences = data.get('user_preferences', {})
-                    
-                    # Restore device states, using current defaults as fallback
-                    self.device_states = data.get('device_states', self.device_states)
+                    # Restore user preferences and device states, keeping defaults as fallback
+                    self._publish(
+                        user_preferences=_freeze(data.get('user_preferences', {})),
+                        device_states=_freeze(data.get('device_states', self.device_states))
+                    )
                     
                     # Log successful context restoration
                     self.logger.info("Context loaded successfully")
         except Exception as e:
             # Log warning if context loading fails but continue with defaults
             self.logger.warning(f"Could not load context: {e}")
+        
+        try:
+            if os.path.exists(self.journal_file):
+                replayed = 0
+                valid_end = 0      # Byte offset just past the last intact record
+                torn = False
+                with open(self.journal_file, 'rb') as f:
+                    for line in f:
+                        try:
+                            record = json.loads(line.decode('utf-8'))
+                        except ValueError:
+                            torn = True
+                            break
+                        self._apply_journal_record(record)
+                        replayed += 1
+                        valid_end += len(line)
+                        if not line.endswith(b'\n'):
+                            # Intact but cut off before its newline; the
+                            # next appended record must not join this line
+                            with open(self.journal_file, 'ab') as journal:
+                                journal.write(b'\n')
+                            valid_end += 1
+                if torn:
+                    # Appending after the fragment would hide every later
+                    # record from the next replay, so cut the fragment off
+                    self.logger.warning(f"Truncating torn context journal record at byte {valid_end}")
+                    os.truncate(self.journal_file, valid_end)
+                self._journal_records = replayed
+                self.logger.info(f"Replayed {replayed} context journal records")
+        except Exception as e:
+            self.logger.warning(f"Could not replay context journal: {e}")
     
-    def save_context(self):
+    def _apply_journal_record(self, record: Dict[str, Any]):
+        """Apply one journal record to the published state without re-journaling it"""
+        if record.get('op') == 'pref':
+            self._publish(user_preferences=FrozenDict({
+                **self.user_preferences, record['key']: _freeze(record['value'])
+            }))
+        elif record.get('op') == 'device':
+            devices = self.device_states
+            device_state = _freeze({**devices.get(record['device'], {}), **record['state']})
+            self._publish(device_states=FrozenDict({**devices, record['device']: device_state}))
+    
+    def _journal_append(self, record: Dict[str, Any]):
         """
-        Save current context data to persistent storage
+        Queue one mutation record for the journal
         
-        Saves the current state of user preferences and device connections
-        to a JSON file for restoration in future sessions. Creates the
-        config directory if it doesn't exist.
+        Called with the write lock held so journal order matches the order
+        mutations were published. Queuing is just a list append; serializing,
+        writing and fsyncing happen in _fsync_journal off the write path, at
+        most once per fsync_interval, so any mutation reaches disk within one
+        interval and a typical mutation costs no I/O at all.
+        """
+        self._journal_pending.append(record)
+        self._journal_records += 1
         
-        Data saved includes:
-        - User preferences and personalization settings
-        - Device connection states and statuses
-        - Timestamp of last save operation
+        if self._journal_records >= self.compact_every:
+            try:
+                self._write_snapshot()
+            except Exception as e:
+                self.logger.error(f"Could not compact context journal: {e}")
+        elif self._fsync_timer is None:
+            delay = max(0.0, self.fsync_interval - (time.monotonic() - self._last_fsync))
+            self._fsync_timer = threading.Timer(delay, self._fsync_journal)
+            self._fsync_timer.daemon = True
+            self._fsync_timer.start()
+    
+    def _fsync_journal(self):
+        """Write queued journal records and force them to disk"""
+        # The flush lock keeps batches in order when two flushes overlap
+        with self._journal_flush_lock:
+            with self._write_lock:
+                self._fsync_timer = None
+                batch, self._journal_pending = self._journal_pending, []
+                generation = self._journal_generation
+            
+            # Serialize outside the write lock so writers are never held up by it
+            data = ''.join(json.dumps(record, separators=(',', ':'), default=str) + '\n'
+                           for record in batch)
+            
+            with self._write_lock:
+                # A snapshot written meanwhile already covers this batch
+                if generation != self._journal_generation:
+                    return
+                try:
+                    if self._journal is None:
+                        os.makedirs(os.path.dirname(self.journal_file) or '.', exist_ok=True)
+                        self._journal = open(self.journal_file, 'a', encoding='utf-8')
+                    self._journal.write(data)
+                    self._journal.flush()
+                    os.fsync(self._journal.fileno())
+                except (OSError, ValueError) as e:
+                    self.logger.error(f"Could not sync context journal: {e}")
+                self._last_fsync = time.monotonic()
+    
+    def _write_snapshot(self):
+        """
+        Write a compacted snapshot and truncate the journal
         
-        Raises:
-            Exception: If file writing fails or directory creation fails
+        The snapshot is written to a temporary file, synced and atomically
+        renamed over the old one before the journal is truncated. A crash in
+        between leaves the old journal next to the new snapshot, and because
+        journal records are plain assignments, replaying them again is harmless.
         """
-        try:
+        with self._write_lock:
+            state = self._state
             # Ensure the config directory exists for storing context data
-            os.makedirs('config', exist_ok=True)
+            os.makedirs(os.path.dirname(self.context_file) or '.', exist_ok=True)
             
             # Prepare context data dictionary with current state information
             context_data = {
-                'user_preferences': self.user_preferences,  # User settings and preferences
-                'device_states': self.device_states,        # Current device connection states
-                'last_saved': str(datetime.now())           # Timestamp of this save operation
+                'user_preferences': state['user_preferences'],  # User settings and preferences
+                'device_states': state['device_states'],        # Current device connection states
+                'last_saved': str(datetime.now())               # Timestamp of this save operation
             }
             
             # Write context data to JSON file with readable formatting
-            with open('config/context.json', 'w') as f:
+            temp_file = self.context_file + '.tmp'
+            with open(temp_file, 'w') as f:
                 json.dump(context_data, f, indent=4)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_file, self.context_file)
+            
+            # Start a fresh journal on top of the new snapshot; queued records
+            # are already part of it
+            if self._journal is not None:
+                self._journal.close()
+            self._journal = open(self.journal_file, 'w', encoding='utf-8')
+            self._journal_pending = []
+            self._journal_generation += 1
+            self._journal_records = 0
+            os.fsync(self._journal.fileno())
+            self._last_fsync = time.monotonic()
+    
+    def save_context(self):
+        """
+        Save current context data to persistent storage
+        
+        Mutations are already journaled as they happen; this writes a
+        compacted snapshot of user preferences and device connections and
+        truncates the journal, e.g. before shutdown.
+        
+        Data saved includes:
+        - User preferences and personalization settings
+        - Device connection states and statuses
+        - Timestamp of last save operation
+        """
+        try:
+            self._write_snapshot()
                 
             # Log successful save operation for debugging
             self.logger.debug("Context saved successfully")
@@ -153,13 +535,93 @@ class ContextManager:
             # Log error if context saving fails
             self.logger.error(f"Could not save context: {e}")
     
+    def subscribe(self, callback: Callable[[Dict[str, Any]], None],
+                  event_types: Optional[Iterable[str]] = None) -> int:
+        """
+        Register a callback for context change events
+        
+        Callbacks run synchronously after the new state has been published
+        and receive one event dictionary:
+        {'type': <event type>, 'data': <what changed>, 'timestamp': <str>}.
+        Events are delivered one at a time in the order their changes were
+        committed, so when two threads change the same component at once,
+        the callback may run on the other thread. Exceptions raised by a
+        callback are logged and do not affect other subscribers or the caller.
+        
+        Args:
+            callback: Function called with each event
+            event_types: Event types to receive; all events when None
+            
+        Returns:
+            int: Token for unsubscribe()
+        """
+        types = frozenset(event_types) if event_types is not None else None
+        if types is not None and not types <= set(self.EVENT_TYPES):
+            raise ValueError(f"Unknown event types: {sorted(types - set(self.EVENT_TYPES))}")
+        with self._write_lock:
+            token = self._next_subscriber_token
+            self._next_subscriber_token += 1
+            self._subscribers = self._subscribers + ((token, callback, types),)
+        return token
+    
+    def unsubscribe(self, token: int):
+        """Remove a subscriber registered with subscribe()"""
+        with self._write_lock:
+            self._subscribers = tuple(sub for sub in self._subscribers if sub[0] != token)
+    
+    def _queue_event(self, event_type: str, data: Dict[str, Any]):
+        """
+        Queue a change event for delivery
+        
+        Called with the write lock held, in the same critical section that
+        committed the change, so the queue is in commit order. The caller
+        runs _dispatch_events() once it has released the lock.
+        """
+        if self._subscribers:
+            self._event_queue.append({'type': event_type, 'data': data, 'timestamp': str(datetime.now())})
+    
+    def _dispatch_events(self):
+        """
+        Deliver queued change events to matching subscribers in commit order
+        
+        Only one thread delivers at a time and it drains the whole queue, so
+        an event is never overtaken by one committed after it. A change made
+        by a subscriber callback is queued behind the event being delivered.
+        """
+        if self._dispatch_thread == threading.get_ident():
+            return
+        with self._dispatch_lock:
+            self._dispatch_thread = threading.get_ident()
+            try:
+                while self._event_queue:
+                    event = self._event_queue.popleft()
+                    for _, callback, types in self._subscribers:
+                        if types is None or event['type'] in types:
+                            try:
+                                callback(event)
+                            except Exception as e:
+                                self.logger.error(f"Context subscriber failed on {event['type']}: {e}")
+            finally:
+                self._dispatch_thread = None
+    
+    @staticmethod
+    def _changed_fields(previous: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+        """Get the fields of current that differ from previous, ignoring update stamps"""
+        return {key: value for key, value in current.items()
+                if key != 'last_updated' and previous.get(key, object()) != value}
+    
     def set_mode(self, mode: str):
         """Set current operation mode"""
         valid_modes = ['home', 'defense', 'night', 'manual']
         if mode in valid_modes:
-            self.current_mode = mode
+            with self._write_lock:
+                previous_mode = self.current_mode
+                self._publish(mode=mode)
+                if mode != previous_mode:
+                    self._queue_event(self.EVENT_MODE_CHANGED, {'mode': mode, 'previous_mode': previous_mode})
             self.logger.info(f"Mode changed to: {mode}")
             self._update_activity()
+            self._dispatch_events()
         else:
             self.logger.warning(f"Invalid mode: {mode}")
     
@@ -169,45 +631,73 @@ class ContextManager:
     
     def update_system_state(self, component: str, state: Dict[str, Any]):
         """Update system component state"""
-        self.system_state[component] = {
-            **state,
-            'last_updated': str(datetime.now())
-        }
+        component_state = _freeze({**state, 'last_updated': str(datetime.now())})
+        with self._write_lock:
+            previous = self.system_state.get(component, FrozenDict())
+            self._publish(system_state=FrozenDict({**self.system_state, component: component_state}))
+            changes = self._changed_fields(previous, component_state)
+            if changes:
+                self._queue_event(self.EVENT_SYSTEM_STATE_CHANGED, {'component': component, 'changes': changes})
+        self.metrics.record_many(component, state)
         self._update_activity()
         self.logger.debug(f"Updated {component} state")
+        self._dispatch_events()
     
     def get_system_state(self, component: str = None) -> Dict[str, Any]:
-        """Get system state for component or all components"""
+        """Get read-only system state for component or all components"""
         if component:
-            return self.system_state.get(component, {})
+            return self.system_state.get(component, FrozenDict())
         return self.system_state
     
     def add_conversation_entry(self, entry: Dict[str, Any]):
-        """Add entry to conversation history"""
+        """Add entry to conversation history, evicting the oldest when full"""
         entry['timestamp'] = str(datetime.now())
-        self.conversation_history.append(entry)
-        
-        # Keep only last 100 entries
-        if len(self.conversation_history) > 100:
-            self.conversation_history = self.conversation_history[-100:]
-        
+        with self._write_lock:
+            self.conversation_history.append(entry)
+            self._queue_event(self.EVENT_CONVERSATION_ENTRY_ADDED, {'entry': entry})
         self._update_activity()
+        self._dispatch_events()
     
     def get_conversation_history(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get recent conversation history"""
-        return self.conversation_history[-limit:]
+        return self.conversation_history.latest(limit)
+    
+    def get_conversation_since(self, seconds: float) -> List[Dict[str, Any]]:
+        """Get conversation entries from the last given number of seconds"""
+        return self.conversation_history.since(time.monotonic() - seconds)
     
     def update_device_state(self, device: str, state: Dict[str, Any]):
         """Update device connection and state"""
-        if device in self.device_states:
-            self.device_states[device].update(state)
-            self.device_states[device]['last_updated'] = str(datetime.now())
-            self.logger.info(f"Updated {device} state: {state}")
-            self._update_activity()
+        with self._write_lock:
+            devices = self.device_states
+            if device not in devices:
+                return
+            changes = {**state, 'last_updated': str(datetime.now())}
+            device_state = _freeze({**devices[device], **changes})
+            self._publish(device_states=FrozenDict({**devices, device: device_state}))
+            self._journal_append({'op': 'device', 'device': device, 'state': changes})
+            changes = self._changed_fields(devices[device], device_state)
+            if changes:
+                self._queue_event(self.EVENT_DEVICE_STATE_CHANGED, {'device': device, 'changes': changes})
+        self.metrics.record_many(device, state)
+        self.logger.info(f"Updated {device} state: {state}")
+        self._update_activity()
+        self._dispatch_events()
+    
+    def query_metrics(self, metric: str, start: Optional[float] = None, end: Optional[float] = None,
+                      resolution: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get the recorded history of a numeric state field
+        
+        Metrics are named component.field or device.field, e.g.
+        'host.cpu_usage' or 'krait3.altitude'. Times are Unix timestamps;
+        see MetricsStore.query for the resolution rules.
+        """
+        return self.metrics.query(metric, start, end, resolution)
     
     def get_device_state(self, device: str) -> Dict[str, Any]:
-        """Get device state"""
-        return self.device_states.get(device, {})
+        """Get read-only device state"""
+        return self.device_states.get(device, FrozenDict())
     
     def is_device_connected(self, device: str) -> bool:
         """Check if device is connected"""
@@ -215,7 +705,9 @@ class ContextManager:
     
     def set_user_preference(self, key: str, value: Any):
         """Set user preference"""
-        self.user_preferences[key] = value
+        with self._write_lock:
+            self._publish(user_preferences=FrozenDict({**self.user_preferences, key: _freeze(value)}))
+            self._journal_append({'op': 'pref', 'key': key, 'value': value})
         self.logger.debug(f"Set user preference: {key} = {value}")
         self._update_activity()
     
@@ -223,8 +715,9 @@ class ContextManager:
         """Get user preference"""
         return self.user_preferences.get(key, default)
     
-    def get_session_info(self) -> Dict[str, Any]:
-        """Get session information"""
+    def get_session_info(self, state: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Get session information, optionally from an already captured snapshot"""
+        state = state or self._state
         now = datetime.now()
         session_duration = now - self.session_start_time
         
@@ -232,28 +725,75 @@ class ContextManager:
             'session_start': str(self.session_start_time),
             'session_duration': str(session_duration),
             'last_activity': str(self.last_activity),
-            'current_mode': self.current_mode,
+            'current_mode': state['mode'],
             'commands_processed': len(self.conversation_history)
         }
     
     def _update_activity(self):
         """Update last activity timestamp"""
-        self.last_activity = datetime.now()
+        with self._write_lock:
+            self.last_activity = datetime.now()
+            self._version += 1
     
     def get_context_summary(self) -> Dict[str, Any]:
-        """Get summary of current context"""
-        return {
-            'mode': self.current_mode,
-            'session_info': self.get_session_info(),
-            'device_states': self.device_states,
-            'system_health': self._get_system_health(),
-            'active_components': list(self.system_state.keys())
-        }
+        """
+        Get summary of current context
+        
+        Every field comes from one captured snapshot, so the summary is
+        internally consistent even while other threads are updating state.
+        The summary is cached and only rebuilt after a mutation; the returned
+        dictionary is read-only and carries a freshly computed session_duration.
+        """
+        _, summary, _, _ = self._get_cached_summary()
+        return FrozenDict({
+            **summary,
+            'session_info': FrozenDict({
+                **summary['session_info'],
+                'session_duration': str(datetime.now() - self.session_start_time)
+            })
+        })
     
-    def _get_system_health(self) -> str:
+    def get_context_summary_json(self) -> bytes:
+        """
+        Get the context summary serialized as UTF-8 JSON, ready to send
+        
+        Only the session duration changes between mutations, so it is spliced
+        into pre-serialized bytes instead of re-encoding the whole summary.
+        """
+        _, _, prefix, suffix = self._get_cached_summary()
+        duration = json.dumps(str(datetime.now() - self.session_start_time)).encode('utf-8')
+        return prefix + duration + suffix
+    
+    def _get_cached_summary(self):
+        """Get the cached summary, rebuilding it if state changed since it was built"""
+        cache = self._summary_cache
+        version = self._version
+        if cache is not None and cache[0] == version:
+            return cache
+        
+        # Read the version before the state, so a concurrent mutation can only
+        # make this entry look older than it is, never newer
+        state = self._state
+        session_info = self.get_session_info(state)
+        session_info['session_duration'] = _DURATION_PLACEHOLDER
+        summary = _freeze({
+            'mode': state['mode'],
+            'session_info': session_info,
+            'device_states': state['device_states'],
+            'system_health': self._get_system_health(state['device_states']),
+            'active_components': list(state['system_state'].keys())
+        })
+        encoded = json.dumps(summary, default=str).encode('utf-8')
+        prefix, suffix = encoded.split(json.dumps(_DURATION_PLACEHOLDER).encode('utf-8'), 1)
+        cache = (version, summary, prefix, suffix)
+        self._summary_cache = cache
+        return cache
+    
+    def _get_system_health(self, device_states: Optional[Dict[str, Any]] = None) -> str:
         """Determine overall system health"""
-        connected_devices = sum(1 for device in self.device_states.values() if device.get('connected', False))
-        total_devices = len(self.device_states)
+        device_states = self.device_states if device_states is None else device_states
+        connected_devices = sum(1 for device in device_states.values() if device.get('connected', False))
+        total_devices = len(device_states)
         
         if connected_devices == total_devices:
             return 'excellent'
@@ -264,19 +804,19 @@ class ContextManager:
     
     def cleanup_old_data(self):
         """Cleanup old conversation history and temporary data"""
-        cutoff_time = datetime.now() - timedelta(hours=24)
+        cutoff_time = time.monotonic() - timedelta(hours=24).total_seconds()
         
-        # Remove old conversation entries
-        self.conversation_history = [
-            entry for entry in self.conversation_history
-            if datetime.fromisoformat(entry.get('timestamp', '1970-01-01')) > cutoff_time
-        ]
+        # Remove old conversation entries (binary search on monotonic timestamps)
+        removed = self.conversation_history.drop_older_than(cutoff_time)
+        if removed:
+            with self._write_lock:
+                self._version += 1
         
-        self.logger.info("Cleaned up old context data")
+        self.logger.info(f"Cleaned up old context data ({removed} conversation entries)")
     
     def reset_session(self):
         """Reset session data"""
-        self.conversation_history = []
+        self.conversation_history.clear()
         self.session_start_time = datetime.now()
-        self.last_activity = datetime.now()
+        self._update_activity()
         self.logger.info("Session reset")
@@ -26,6 +26,9 @@ from datetime import datetime
 from typing import Dict, Any, List, Optional
 from .ai_learning import AILearningSystem
 
+# Openings of questions answered from the knowledge base rather than as commands
+QUESTION_PREFIXES = ['what is', 'tell me about', 'explain', 'who is', 'where is']
+
 class DecisionEngine:
     """
     Logical Yielding Response Algorithm (LYRA) Decision Engine
@@ -36,6 +39,7 @@ class DecisionEngine:
         self.context_manager = context_manager
         self.logger = logging.getLogger(__name__)
         self.command_patterns = self._load_command_patterns()
+        self.handler_vocabulary = self._load_handler_vocabulary()
         self.learning_enabled = True
         self.ai_learning = AILearningSystem()
         
@@ -90,6 +94,81 @@ class DecisionEngine:
             }
         }
     
+    def _load_handler_vocabulary(self) -> Dict[str, List[str]]:
+        """
+        Load the phrases the intent handlers and entity extraction look for
+        
+        The command patterns only pick the intent; these are the words each
+        handler then checks to choose an action, so keep them in step with
+        the handlers.
+        """
+        return {
+            'system_control': ['system status', 'health check', 'switch to', 'change mode',
+                               'defense mode', 'home mode', 'night mode', 'manual mode'],
+            'trinetra_control': ['move forward', 'move backward', 'turn left', 'turn right', 'stop',
+                                 'start patrol', 'take a snapshot', 'start stream'],
+            'krait3_control': ['launch', 'takeoff', 'land', 'hover', 'return home', 'navigate to waypoint'],
+            'voice_control': ['start listening', 'stop listening', 'be quiet'],
+            'general': ['hello', 'help', 'thank you', 'goodbye', 'knowledge stats', 'what do you know'],
+            'entities': ['forward', 'backward', 'left', 'right', 'up', 'down',
+                         'north', 'south', 'east', 'west'],
+            'questions': QUESTION_PREFIXES + ['weather in']
+        }
+    
+    def get_command_vocabulary(self) -> Dict[str, List[str]]:
+        """
+        Get the words and phrases spoken commands are made of, by intent
+        
+        Combines the literal words of every command pattern (including custom
+        ones) with the handler vocabulary, e.g. to build a recognition
+        grammar for the speech recognizer.
+        """
+        vocabulary = {}
+        for intent, data in self.command_patterns.items():
+            words = []
+            for pattern in data['patterns']:
+                # Drop escapes such as \d, then keep the literal words
+                for word in re.findall(r'[a-z][a-z0-9\-]*', re.sub(r'\\.', ' ', pattern.lower())):
+                    if word not in words:
+                        words.append(word)
+            vocabulary[intent] = words
+        for intent, phrases in self.handler_vocabulary.items():
+            vocabulary.setdefault(intent, [])
+            vocabulary[intent] += [phrase for phrase in phrases if phrase not in vocabulary[intent]]
+        return vocabulary
+
+    def get_response_templates(self) -> List[str]:
+        """
+        Get the fixed messages the intent handlers answer with
+
+        Runs each device and system handler on its own handler vocabulary, so
+        parameterised messages such as 'Switching to night mode' come out for
+        every mode, direction and flight action, e.g. for the speech output to
+        synthesize ahead of time. Knowledge and weather answers vary and are
+        not included.
+        """
+        handlers = {
+            'system_control': self._handle_system_control,
+            'trinetra_control': self._handle_trinetra_control,
+            'krait3_control': self._handle_krait3_control,
+            'voice_control': self._handle_voice_control
+        }
+        samples = {intent: list(self.handler_vocabulary[intent]) for intent in handlers}
+        samples['trinetra_control'] += [f"move {direction}" for direction in ['forward', 'backward', 'left', 'right']]
+
+        templates = []
+        for intent, handler in handlers.items():
+            for command in samples[intent]:
+                message = handler({}, command)['message']
+                if message not in templates:
+                    templates.append(message)
+        # Only the general replies that do not consult the knowledge base
+        for command in ['hello', 'help', 'thank you', 'goodbye']:
+            message = self._handle_general({}, command)['message']
+            if message not in templates:
+                templates.append(message)
+        return templates
+
     def process_command(self, command: str) -> Dict[str, Any]:
         """
         Process a command using LYRA's decision engine
@@ -391,7 +470,7 @@ class DecisionEngine:
             }
         
         # AI Learning integration for questions
-        elif any(question in command for question in ['what is', 'tell me about', 'explain', 'who is', 'where is']):
+        elif any(question in command for question in QUESTION_PREFIXES):
             return self._handle_knowledge_query(command)
         
         elif 'weather' in command:
@@ -424,7 +503,7 @@ class DecisionEngine:
         """Handle knowledge queries using AI learning system"""
         # Extract the topic from the command
         topic = command.lower()
-        for prefix in ['what is', 'tell me about', 'explain', 'who is', 'where is']:
+        for prefix in QUESTION_PREFIXES:
             if prefix in topic:
                 topic = topic.replace(prefix, '').strip()
                 break
@@ -0,0 +1,206 @@
+"""
+LYRA 3.0 Metrics Store
+In-process multi-resolution time-series storage for system and device metrics
+
+The context manager only keeps the latest value of every system and device
+field. This module keeps their history so the diagnostics tab can chart it
+without an external database:
+- One fixed-size NumPy ring buffer per metric and resolution tier
+- Automatic downsampling into 1 s, 1 min and 1 h tiers with min/max/mean
+- Range queries at a chosen (or automatically picked) resolution
+- Memory bounded by the tier capacities regardless of uptime
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+# Resolution tiers as (name, bucket seconds, bucket count). Every bucket
+# takes 40 bytes (five 8-byte fields), so with the default capacities a metric
+# keeps 15 minutes at 1 s, one day at 1 min and 30 days at 1 h in 3060
+# buckets, about 120 KB per metric.
+DEFAULT_TIERS = (
+    ('1s', 1, 15 * 60),
+    ('1m', 60, 24 * 60),
+    ('1h', 3600, 30 * 24),
+)
+
+# Metrics tracked at most; further names are dropped. Bounds the store at
+# about 7.5 MB, well within the Pi's budget.
+DEFAULT_MAX_METRICS = 64
+
+
+class MetricTier:
+    """
+    Fixed-size ring of aggregated buckets at one resolution
+
+    Slots are addressed directly by bucket number modulo capacity, so a sample
+    lands in its slot in O(1) and a slot left over from an earlier lap of the
+    ring is recognised by its stored bucket number and reset on reuse.
+    """
+
+    def __init__(self, name: str, seconds: int, capacity: int):
+        """Preallocate the ring for capacity buckets of the given width"""
+        self.name = name
+        self.seconds = seconds
+        self.capacity = capacity
+        self.bucket = np.full(capacity, -1, dtype=np.int64)  # Bucket number held by each slot
+        self.min = np.zeros(capacity, dtype=np.float64)
+        self.max = np.zeros(capacity, dtype=np.float64)
+        self.sum = np.zeros(capacity, dtype=np.float64)
+        self.count = np.zeros(capacity, dtype=np.int64)
+
+    @property
+    def retention(self) -> int:
+        """Number of seconds of history this tier can hold"""
+        return self.seconds * self.capacity
+
+    def add(self, timestamp: float, value: float):
+        """Fold one sample into its bucket"""
+        bucket = int(timestamp // self.seconds)
+        slot = bucket % self.capacity
+        if self.bucket[slot] != bucket:
+            # Slot still holds an older lap of the ring; start it afresh
+            self.bucket[slot] = bucket
+            self.min[slot] = value
+            self.max[slot] = value
+            self.sum[slot] = value
+            self.count[slot] = 1
+            return
+        if value < self.min[slot]:
+            self.min[slot] = value
+        if value > self.max[slot]:
+            self.max[slot] = value
+        self.sum[slot] += value
+        self.count[slot] += 1
+
+    def query(self, start: float, end: float) -> Dict[str, List[float]]:
+        """Return the populated buckets between start and end, oldest first"""
+        first = int(start // self.seconds)
+        last = int(end // self.seconds)
+        # Nothing older than one lap of the ring can still be present
+        first = max(first, last - self.capacity + 1)
+        if last < first:
+            return {'timestamps': [], 'min': [], 'max': [], 'mean': []}
+
+        buckets = np.arange(first, last + 1, dtype=np.int64)
+        slots = buckets % self.capacity
+        present = self.bucket[slots] == buckets
+        slots = slots[present]
+        counts = self.count[slots]
+        return {
+            'timestamps': (buckets[present] * self.seconds).astype(np.float64).tolist(),
+            'min': self.min[slots].tolist(),
+            'max': self.max[slots].tolist(),
+            'mean': (self.sum[slots] / counts).tolist()
+        }
+
+
+class MetricsStore:
+    """
+    Multi-resolution time-series store for numeric metrics
+
+    Every recorded sample is aggregated into all tiers at once, which keeps
+    the coarse tiers exactly consistent with the fine ones without a separate
+    rollup job. Metrics are created on first use and capped in number so a
+    misbehaving producer cannot grow memory without bound.
+
+    Attributes:
+        tiers: Tier definitions as (name, bucket seconds, bucket count)
+        max_metrics: Maximum number of distinct metric names kept
+    """
+
+    def __init__(self, tiers: Tuple[Tuple[str, int, int], ...] = DEFAULT_TIERS,
+                 max_metrics: int = DEFAULT_MAX_METRICS):
+        """Initialize an empty store"""
+        self.logger = logging.getLogger(__name__)
+        self.tiers = tuple(sorted(tiers, key=lambda tier: tier[1]))
+        self.max_metrics = max_metrics
+        self._series = {}  # Metric name -> {tier name: MetricTier}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, value: float, timestamp: Optional[float] = None) -> bool:
+        """
+        Record one sample of a metric
+
+        Args:
+            name: Metric name, e.g. 'host.cpu_usage' or 'krait3.altitude'
+            value: Numeric sample; booleans and non-finite values are ignored
+            timestamp: Unix time of the sample, defaults to now
+
+        Returns:
+            bool: True if the sample was stored
+        """
+        if isinstance(value, bool) or not isinstance(value, (int, float, np.number)):
+            return False
+        value = float(value)
+        if not np.isfinite(value):
+            return False
+        timestamp = time.time() if timestamp is None else timestamp
+
+        with self._lock:
+            series = self._series.get(name)
+            if series is None:
+                if len(self._series) >= self.max_metrics:
+                    self.logger.warning(f"Metric limit reached, dropping samples for {name}")
+                    return False
+                series = {tier_name: MetricTier(tier_name, seconds, capacity)
+                          for tier_name, seconds, capacity in self.tiers}
+                self._series[name] = series
+            for tier in series.values():
+                tier.add(timestamp, value)
+        return True
+
+    def record_many(self, prefix: str, values: Dict[str, Any], timestamp: Optional[float] = None) -> int:
+        """Record every numeric field of a state dictionary as prefix.field"""
+        timestamp = time.time() if timestamp is None else timestamp
+        return sum(1 for key, value in values.items()
+                   if self.record(f"{prefix}.{key}", value, timestamp))
+
+    def query(self, name: str, start: Optional[float] = None, end: Optional[float] = None,
+              resolution: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Return a metric's history over a time range
+
+        Args:
+            name: Metric name
+            start: Unix time of the range start, defaults to one hour before end
+            end: Unix time of the range end, defaults to now
+            resolution: Tier name ('1s', '1m', '1h'); by default the finest
+                tier that still covers the whole range
+
+        Returns:
+            Dict with status, resolution and parallel timestamps/min/max/mean lists
+        """
+        end = time.time() if end is None else end
+        start = end - 3600 if start is None else start
+        tier_names = [tier_name for tier_name, _, _ in self.tiers]
+
+        if resolution is None:
+            resolution = next((tier_name for tier_name, seconds, capacity in self.tiers
+                               if seconds * capacity >= end - start), tier_names[-1])
+        elif resolution not in tier_names:
+            return {'status': 'error', 'message': f'Unknown resolution: {resolution}'}
+
+        with self._lock:
+            series = self._series.get(name)
+            if series is None:
+                return {'status': 'error', 'message': f'Unknown metric: {name}'}
+            data = series[resolution].query(start, end)
+        return {'status': 'success', 'metric': name, 'resolution': resolution, **data}
+
+    def list_metrics(self) -> List[str]:
+        """Get the names of all recorded metrics"""
+        with self._lock:
+            return sorted(self._series)
+
+    def memory_usage(self) -> int:
+        """Get the number of bytes held by all ring buffers"""
+        with self._lock:
+            return sum(array.nbytes
+                       for series in self._series.values()
+                       for tier in series.values()
+                       for array in (tier.bucket, tier.min, tier.max, tier.sum, tier.count))
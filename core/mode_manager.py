@@ -4,8 +4,9 @@ Handles different operational modes (Home, Defense, Night, Manual)
 """
 
 import logging
+import threading
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Callable
 
 class ModeManager:
     """
@@ -22,7 +23,18 @@ class ModeManager:
                 'voice_sensitivity': 0.7,
                 'auto_responses': True,
                 'security_level': 'low',
-                'features': ['voice_control', 'web_search', 'smart_home', 'entertainment']
+                'features': ['voice_control', 'web_search', 'smart_home', 'entertainment'],
+                # Runtime resource profile applied to subsystems on mode change
+                'profile': {
+                    'detection_fps': 10,          # Detection frames per second, 0 = unthrottled
+                    'detection_imgsz': 640,       # Detection model input size in pixels
+                    'status_interval': 5,         # Seconds between status samples
+                    'listen_duty_cycle': 1.0,     # Fraction of time the microphone listens
+                    'noise_margin': 3.0,          # Speech threshold as a multiple of the noise floor
+                    'energy_threshold': None,     # Fixed speech threshold, None = adaptive
+                    'tts_verbosity': 'full',      # 'full' or 'brief' (first sentence only)
+                    'log_level': 'INFO'
+                }
             },
             'defense': {
                 'name': 'Defense Mode',
@@ -30,7 +42,17 @@ class ModeManager:
                 'voice_sensitivity': 0.9,
                 'auto_responses': False,
                 'security_level': 'high',
-                'features': ['voice_control', 'surveillance', 'intrusion_detection', 'emergency_alerts']
+                'features': ['voice_control', 'surveillance', 'intrusion_detection', 'emergency_alerts'],
+                'profile': {
+                    'detection_fps': 0,
+                    'detection_imgsz': 480,
+                    'status_interval': 2,
+                    'listen_duty_cycle': 1.0,
+                    'noise_margin': 2.5,
+                    'energy_threshold': None,
+                    'tts_verbosity': 'brief',
+                    'log_level': 'INFO'
+                }
             },
             'night': {
                 'name': 'Night Mode',
@@ -38,7 +60,17 @@ class ModeManager:
                 'voice_sensitivity': 0.5,
                 'auto_responses': False,
                 'security_level': 'medium',
-                'features': ['voice_control', 'emergency_only', 'quiet_responses']
+                'features': ['voice_control', 'emergency_only', 'quiet_responses'],
+                'profile': {
+                    'detection_fps': 2,
+                    'detection_imgsz': 320,
+                    'status_interval': 15,
+                    'listen_duty_cycle': 0.5,
+                    'noise_margin': 3.5,
+                    'energy_threshold': None,
+                    'tts_verbosity': 'brief',
+                    'log_level': 'WARNING'
+                }
             },
             'manual': {
                 'name': 'Manual Mode',
@@ -46,11 +78,29 @@ class ModeManager:
                 'voice_sensitivity': 0.8,
                 'auto_responses': False,
                 'security_level': 'medium',
-                'features': ['voice_control', 'manual_control', 'system_monitoring']
+                'features': ['voice_control', 'manual_control', 'system_monitoring'],
+                'profile': {
+                    'detection_fps': 10,
+                    'detection_imgsz': 480,
+                    'status_interval': 5,
+                    'listen_duty_cycle': 1.0,
+                    'noise_margin': 3.0,
+                    'energy_threshold': None,
+                    'tts_verbosity': 'full',
+                    'log_level': 'INFO'
+                }
             }
         }
         self.mode_history = []
         
+        # Subsystems that act on the runtime profile, as name -> apply callable
+        self.profile_targets = {}
+        self._profile_lock = threading.RLock()
+        
+        # Resource caps layered over every mode's profile, e.g. by the thermal
+        # scheduler; an empty dict leaves the profiles as configured
+        self.profile_limits = {}
+        
     def set_mode(self, mode: str) -> Dict[str, Any]:
         """Set the operational mode"""
         if mode not in self.mode_configs:
@@ -59,8 +109,15 @@ class ModeManager:
                 'message': f'Unknown mode: {mode}. Available modes: {list(self.mode_configs.keys())}'
             }
         
-        previous_mode = self.current_mode
-        self.current_mode = mode
+        with self._profile_lock:
+            previous_mode = self.current_mode
+            failed = self._apply_profile(self.get_profile(mode), self.get_profile(previous_mode))
+            if failed:
+                return {
+                    'status': 'error',
+                    'message': f'Could not apply {mode} profile to {failed}; kept {previous_mode} mode'
+                }
+            self.current_mode = mode
         
         # Log mode change
         self.mode_history.append({
@@ -79,6 +136,97 @@ class ModeManager:
             'mode_config': self.mode_configs[mode]
         }
     
+    def register_profile_target(self, name: str, apply: Callable[[Dict[str, Any]], None]):
+        """
+        Register a subsystem that acts on the runtime profile
+        
+        apply is called with the full profile of every mode switched to,
+        starting with the current mode's profile right away.
+        """
+        with self._profile_lock:
+            apply(self.get_profile())
+            self.profile_targets[name] = apply
+    
+    def unregister_profile_target(self, name: str):
+        """Stop applying profiles to a subsystem"""
+        with self._profile_lock:
+            self.profile_targets.pop(name, None)
+    
+    def get_profile(self, mode: Optional[str] = None) -> Dict[str, Any]:
+        """Get the runtime resource profile for the current or specified mode, with limits applied"""
+        target_mode = mode or self.current_mode
+        profile = dict(self.mode_configs.get(target_mode, self.mode_configs['home'])['profile'])
+        return self._limit_profile(profile, self.profile_limits)
+    
+    @staticmethod
+    def _limit_profile(profile: Dict[str, Any], limits: Dict[str, Any]) -> Dict[str, Any]:
+        """Cap a profile so it uses no more resources than the limits allow"""
+        for key, limit in limits.items():
+            value = profile.get(key)
+            if value is None:
+                continue
+            if key == 'detection_fps':
+                # 0 means unthrottled, the most expensive setting of all
+                if limit > 0 and (value == 0 or value > limit):
+                    profile[key] = limit
+            elif key == 'status_interval':
+                profile[key] = max(value, limit)
+            elif key in ('detection_imgsz', 'listen_duty_cycle'):
+                profile[key] = min(value, limit)
+        return profile
+    
+    def set_profile_limits(self, limits: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Replace the resource limits and reapply the current profile
+        
+        Args:
+            limits: Caps keyed like profile fields: a maximum detection_fps,
+                detection_imgsz and listen_duty_cycle and a minimum
+                status_interval. An empty dict lifts all limits.
+        """
+        with self._profile_lock:
+            previous_profile = self.get_profile()
+            previous_limits = self.profile_limits
+            self.profile_limits = dict(limits)
+            failed = self._apply_profile(self.get_profile(), previous_profile)
+            if failed:
+                self.profile_limits = previous_limits
+                return {
+                    'status': 'error',
+                    'message': f'Could not apply profile limits to {failed}'
+                }
+        return {
+            'status': 'success',
+            'profile_limits': dict(limits),
+            'profile': self.get_profile()
+        }
+    
+    def _apply_profile(self, profile: Dict[str, Any], previous_profile: Dict[str, Any]) -> Optional[str]:
+        """
+        Apply a profile to every registered subsystem, or to none of them
+        
+        If a subsystem rejects the profile, the ones already switched are
+        given the previous profile back so the system never runs with a mix
+        of two modes' settings.
+        
+        Returns:
+            Name of the subsystem that failed, or None on success
+        """
+        applied = []
+        for name, apply in self.profile_targets.items():
+            try:
+                apply(dict(profile))
+                applied.append(apply)
+            except Exception as e:
+                self.logger.error(f"Failed to apply profile to {name}: {e}")
+                for revert in applied:
+                    try:
+                        revert(dict(previous_profile))
+                    except Exception as revert_error:
+                        self.logger.error(f"Failed to restore profile: {revert_error}")
+                return name
+        return None
+    
     def get_current_mode(self) -> Dict[str, Any]:
         """Get current mode information"""
         return {
@@ -157,13 +305,35 @@ class ModeManager:
         return self.mode_history[-limit:] if self.mode_history else []
     
     def customize_mode(self, mode: str, config_updates: Dict[str, Any]) -> Dict[str, Any]:
-        """Customize mode configuration"""
+        """
+        Customize mode configuration
+        
+        A 'profile' update is merged into the mode's profile, so a single
+        setting such as a fixed energy_threshold can be overridden; if the
+        mode is active the new profile is applied right away.
+        """
         if mode not in self.mode_configs:
             return {
                 'status': 'error',
                 'message': f'Mode {mode} not found'
             }
         
+        with self._profile_lock:
+            if isinstance(config_updates.get('profile'), dict):
+                previous_profile = self.get_profile(mode)
+                previous_config = dict(self.mode_configs[mode]['profile'])
+                self.mode_configs[mode]['profile'].update(config_updates['profile'])
+                if mode == self.current_mode:
+                    failed = self._apply_profile(self.get_profile(mode), previous_profile)
+                    if failed:
+                        self.mode_configs[mode]['profile'] = previous_config
+                        return {
+                            'status': 'error',
+                            'message': f'Could not apply {mode} profile to {failed}'
+                        }
+                self.logger.info(f"Updated {mode} mode profile: {config_updates['profile']}")
+                config_updates = {key: value for key, value in config_updates.items() if key != 'profile'}
+        
         # Update configuration
         for key, value in config_updates.items():
             if key in self.mode_configs[mode]:
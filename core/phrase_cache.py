@@ -0,0 +1,200 @@
+"""
+LYRA 3.0 Phrase Cache
+On-disk LRU cache of synthesized speech
+
+Greetings, wake responses, mode-switch confirmations and device
+acknowledgements are spoken over and over, and every time pyttsx3 synthesizes
+them from scratch before the first sample plays. This module keeps the
+synthesized audio of such phrases as WAV files so TTSOutput can play them
+directly:
+- Keyed by text, voice, rate and volume, so a voice change never plays stale audio
+- Least recently used phrases evicted to keep the cache under a size limit
+- Index persisted next to the audio and rebuilt from the files if it is lost
+- Files written under a temporary name and renamed, so a crash never leaves
+  a half-written phrase behind
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+DEFAULT_CACHE_DIR = 'data/tts_cache'
+
+# About 15 minutes of 22 kHz 16-bit speech
+DEFAULT_MAX_BYTES = 40 * 1024 * 1024
+
+INDEX_FILE = 'index.json'
+
+
+class PhraseCache:
+    """
+    Least recently used cache of synthesized phrases on disk
+
+    Entries are looked up with get() and added with put(), which calls back
+    into the speech engine to write the audio file.
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.logger = logging.getLogger(__name__)
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # key -> {'text': ..., 'bytes': ...}, least recently used first
+        self._entries: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+
+    @staticmethod
+    def make_key(text: str, settings: Dict[str, Any]) -> str:
+        """Cache key for a phrase spoken with the given voice, rate and volume"""
+        identity = [text.strip(), settings.get('voice'), settings.get('rate'), settings.get('volume')]
+        return hashlib.sha1(json.dumps(identity).encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.wav")
+
+    def _load_index(self):
+        """Load the index, keeping only entries whose audio file still exists"""
+        index_path = os.path.join(self.directory, INDEX_FILE)
+        entries = []
+        try:
+            with open(index_path, 'r') as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Phrase cache index unreadable, rebuilding: {e}")
+
+        for entry in entries:
+            path = self._path(entry['key'])
+            if os.path.exists(path):
+                self._entries[entry['key']] = {'text': entry.get('text', ''),
+                                               'bytes': os.path.getsize(path)}
+
+        # Audio files missing from the index (e.g. the index write was lost)
+        # are kept as least recently used rather than orphaned
+        for name in os.listdir(self.directory):
+            key, extension = os.path.splitext(name)
+            if key.endswith('.tmp'):
+                # Left over from synthesis interrupted by a crash
+                os.remove(os.path.join(self.directory, name))
+            elif extension == '.wav' and key not in self._entries:
+                self._entries[key] = {'text': '', 'bytes': os.path.getsize(self._path(key))}
+                self._entries.move_to_end(key, last=False)
+        self._evict()
+
+    def _save_index(self):
+        """Write the index atomically, least recently used first"""
+        index_path = os.path.join(self.directory, INDEX_FILE)
+        temp_path = index_path + '.tmp'
+        try:
+            with open(temp_path, 'w') as f:
+                json.dump([{'key': key, 'text': entry['text']} for key, entry in self._entries.items()], f)
+            os.replace(temp_path, index_path)
+        except OSError as e:
+            self.logger.warning(f"Could not save phrase cache index: {e}")
+
+    def _evict(self):
+        """Drop least recently used phrases until the cache fits its size limit"""
+        while self._entries and self.total_bytes > self.max_bytes:
+            key, entry = self._entries.popitem(last=False)
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+            self.evictions += 1
+            self.logger.debug(f"Evicted cached phrase: {entry['text'][:50]}")
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(entry['bytes'] for entry in self._entries.values())
+
+    def contains(self, text: str, settings: Dict[str, Any]) -> bool:
+        """Check for a phrase without counting a hit or refreshing it"""
+        with self._lock:
+            return self.make_key(text, settings) in self._entries
+
+    def get(self, text: str, settings: Dict[str, Any]) -> Optional[str]:
+        """
+        Look up a phrase
+
+        Returns:
+            Path of the cached WAV file (marked most recently used), or None
+        """
+        key = self.make_key(text, settings)
+        with self._lock:
+            if key not in self._entries or not os.path.exists(self._path(key)):
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._path(key)
+
+    def put(self, text: str, settings: Dict[str, Any], synthesize: Callable[[str, str], None]) -> Optional[str]:
+        """
+        Synthesize a phrase into the cache
+
+        Args:
+            text: Phrase to cache
+            settings: Voice settings the phrase is spoken with
+            synthesize: Called as synthesize(text, path) to write the WAV file
+
+        Returns:
+            Path of the cached WAV file, or None if synthesis failed
+        """
+        key = self.make_key(text, settings)
+        path = self._path(key)
+        temp_path = os.path.join(self.directory, f"{key}.tmp.wav")
+        try:
+            synthesize(text, temp_path)
+            size = os.path.getsize(temp_path)
+            if size == 0:
+                raise OSError("synthesizer wrote no audio")
+            os.replace(temp_path, path)
+        except Exception as e:
+            self.logger.warning(f"Could not cache phrase '{text[:50]}': {e}")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            return None
+
+        with self._lock:
+            self._entries[key] = {'text': text.strip(), 'bytes': size}
+            self._entries.move_to_end(key)
+            self._evict()
+            self._save_index()
+            return path if key in self._entries else None
+
+    def discard(self, text: str, settings: Dict[str, Any]):
+        """Remove a phrase, e.g. because its audio turned out to be unplayable"""
+        key = self.make_key(text, settings)
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                try:
+                    os.remove(self._path(key))
+                except OSError:
+                    pass
+                self._save_index()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache size and hit statistics"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'phrases': len(self._entries),
+                'bytes': self.total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'evictions': self.evictions
+            }
@@ -6,11 +6,13 @@ Handles GPIO, Camera, I2C, SPI, and hardware monitoring
 import logging
 import os
 import json
+import time
 import cv2
 import numpy as np
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 from threading import Thread, Lock
+from .telemetry import get_sampler
 
 class Pi5Hardware:
     """
@@ -36,6 +38,10 @@ class Pi5Hardware:
             'last_detection_time': None
         }
         
+        # Runtime profile: detection rate cap (0 = unthrottled) and model input size
+        self.detection_fps = 0
+        self.detection_imgsz = 640
+        
         # Initialize hardware components
         self._init_gpio()
         self._init_camera()
@@ -43,6 +49,11 @@ class Pi5Hardware:
         self._init_yolo()
         self._detect_hardware()
         
+        # Host metrics come from the shared background sampler; vcgencmd
+        # spawns a process, so the GPU temperature is sampled less often
+        self.telemetry = get_sampler()
+        self.telemetry.add_source('gpu_temp', self.get_gpu_temperature, interval=5.0)
+        
     def _init_gpio(self):
         """Initialize GPIO support"""
         try:
@@ -160,20 +171,36 @@ class Pi5Hardware:
             pass
         return 0.0
     
+    def get_load_metrics(self) -> Dict[str, float]:
+        """
+        Get CPU temperature, CPU load and memory pressure without blocking
+        
+        Read from the telemetry snapshot, so this is cheap enough to poll
+        from a scheduler.
+        """
+        snapshot = self.telemetry.snapshot()
+        return {
+            'cpu_temp': snapshot.get('cpu_temp', 0.0),
+            'cpu_percent': snapshot.get('cpu_percent', 0.0),
+            'memory_percent': snapshot.get('memory_percent', 0.0)
+        }
+    
     def get_system_status(self) -> Dict[str, Any]:
-        """Get comprehensive system status"""
+        """Get comprehensive system status from the telemetry snapshot"""
         try:
             import psutil
             
+            snapshot = self.telemetry.snapshot()
             status = {
-                'cpu_percent': psutil.cpu_percent(interval=1),
-                'memory_percent': psutil.virtual_memory().percent,
-                'disk_percent': psutil.disk_usage('/').percent,
-                'cpu_temp': self.get_cpu_temperature(),
-                'gpu_temp': self.get_gpu_temperature(),
-                'cpu_freq': psutil.cpu_freq().current if psutil.cpu_freq() else 0,
-                'load_avg': os.getloadavg() if hasattr(os, 'getloadavg') else [0, 0, 0],
+                'cpu_percent': snapshot.get('cpu_percent', 0.0),
+                'memory_percent': snapshot.get('memory_percent', 0.0),
+                'disk_percent': snapshot.get('disk_percent', 0.0),
+                'cpu_temp': snapshot.get('cpu_temp', 0.0),
+                'gpu_temp': snapshot.get('gpu_temp') or 0.0,
+                'cpu_freq': snapshot.get('cpu_freq', 0),
+                'load_avg': snapshot.get('load_avg', [0, 0, 0]),
                 'boot_time': psutil.boot_time(),
+                'sample_age': snapshot.get('age'),
                 'timestamp': str(datetime.now())
             }
             
@@ -375,6 +402,16 @@ class Pi5Hardware:
         except Exception as e:
             return {'status': 'error', 'message': str(e)}
     
+    def apply_profile(self, profile: Dict[str, Any]):
+        """Apply the mode's detection rate and model input size"""
+        fps = float(profile.get('detection_fps', self.detection_fps))
+        imgsz = int(profile.get('detection_imgsz', self.detection_imgsz))
+        if fps < 0 or imgsz <= 0 or imgsz % 32:
+            raise ValueError(f"Invalid detection profile: {fps} fps at {imgsz} px")
+        # The detection loop reads both on every frame
+        self.detection_fps, self.detection_imgsz = fps, imgsz
+        self.logger.info(f"Detection profile: {fps or 'unthrottled'} fps at {imgsz} px")
+    
     def _detection_loop(self, camera_index, confidence):
         """Main detection loop for continuous detection"""
         cap = None
@@ -382,19 +419,22 @@ class Pi5Hardware:
             cap = cv2.VideoCapture(camera_index)
             cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
             cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+            # Keep only the newest frame so throttled detection never lags behind
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
             
             frame_count = 0
             total_inference_time = 0
             
             while self.detection_active:
+                frame_started = time.monotonic()
                 ret, frame = cap.read()
                 if not ret:
                     continue
                 
                 start_time = cv2.getTickCount()
                 
-                # Run detection on frame
-                results = self.yolo_model(frame, conf=confidence, verbose=False)
+                # Run detection on frame at the profile's model input size
+                results = self.yolo_model(frame, conf=confidence, imgsz=self.detection_imgsz, verbose=False)
                 
                 end_time = cv2.getTickCount()
                 inference_time = (end_time - start_time) / cv2.getTickFrequency() * 1000
@@ -423,8 +463,14 @@ class Pi5Hardware:
                     self.detection_stats['avg_inference_time'] = total_inference_time / frame_count
                     self.detection_stats['last_detection_time'] = str(datetime.now())
                 
-                # Small delay to prevent excessive CPU usage
-                cv2.waitKey(1)
+                # Hold to the profile's frame rate; unthrottled just yields briefly
+                fps = self.detection_fps
+                if fps > 0:
+                    remaining = 1.0 / fps - (time.monotonic() - frame_started)
+                    if remaining > 0:
+                        time.sleep(remaining)
+                else:
+                    cv2.waitKey(1)
                 
         except Exception as e:
             self.logger.error(f"Detection loop error: {e}")
@@ -0,0 +1,213 @@
+"""
+LYRA 3.0 Session Registry
+Per-client conversation contexts on top of the shared context manager
+
+Every connected operator console gets its own session holding its
+conversation history and preferences, while device states, system state and
+the operational mode stay shared in the ContextManager. The registry keeps
+memory predictable when many consoles are connected:
+- Each session's history is capped by entry count and by serialized bytes
+- Each session's preferences are capped by serialized bytes
+- The number of sessions is capped, least recently used evicted first
+- Sessions idle longer than the timeout are evicted
+- Live session counts and byte totals are exposed for monitoring
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+
+def _entry_size(value: Any) -> int:
+    """Approximate memory cost of a value as its serialized JSON length"""
+    return len(json.dumps(value, default=str))
+
+
+class ClientSession:
+    """
+    Conversation context of one client
+
+    Attributes:
+        session_id: Socket sid or login name the session is keyed by
+        max_history: Maximum number of conversation entries kept
+        max_bytes: Maximum serialized size of history plus preferences
+    """
+
+    def __init__(self, session_id: str, context_manager, max_history: int = 50,
+                 max_bytes: int = 64 * 1024):
+        """Create an empty session backed by the shared context manager"""
+        self.session_id = session_id
+        self.context_manager = context_manager
+        self.max_history = max_history
+        self.max_bytes = max_bytes
+        self.created = datetime.now()
+        self.last_seen = time.monotonic()
+        self._history = deque()      # (entry, size) pairs, oldest first
+        self._history_bytes = 0
+        self._preferences = {}
+        self._preference_sizes = {}
+        self._preference_bytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def bytes_used(self) -> int:
+        """Serialized size of this session's history and preferences"""
+        return self._history_bytes + self._preference_bytes
+
+    def touch(self):
+        """Mark the session as active now"""
+        self.last_seen = time.monotonic()
+
+    def add_conversation_entry(self, entry: Dict[str, Any]):
+        """Add entry to this session's history, dropping the oldest beyond the caps"""
+        entry = {**entry, 'timestamp': str(datetime.now())}
+        size = _entry_size(entry)
+        with self._lock:
+            self._history.append((entry, size))
+            self._history_bytes += size
+            while self._history and (len(self._history) > self.max_history
+                                     or self.bytes_used > self.max_bytes):
+                _, dropped = self._history.popleft()
+                self._history_bytes -= dropped
+        self.touch()
+
+    def get_recent_conversation(self, count: int = 5) -> List[Dict[str, Any]]:
+        """Get the most recent entries of this session's history"""
+        with self._lock:
+            entries = [entry for entry, _ in self._history]
+        return entries[-count:] if count > 0 else []
+
+    def set_preference(self, key: str, value: Any) -> bool:
+        """
+        Set a preference for this session only
+
+        Returns:
+            bool: False if the value would exceed the session's byte cap
+        """
+        size = _entry_size({key: value})
+        with self._lock:
+            new_bytes = self._preference_bytes - self._preference_sizes.get(key, 0) + size
+            if self._history_bytes + new_bytes > self.max_bytes:
+                # Make room by dropping history before refusing the preference
+                while self._history and self._history_bytes + new_bytes > self.max_bytes:
+                    _, dropped = self._history.popleft()
+                    self._history_bytes -= dropped
+                if self._history_bytes + new_bytes > self.max_bytes:
+                    return False
+            self._preferences[key] = value
+            self._preference_sizes[key] = size
+            self._preference_bytes = new_bytes
+        self.touch()
+        return True
+
+    def get_preference(self, key: str, default: Any = None) -> Any:
+        """Get a preference, falling back to the shared user preferences"""
+        with self._lock:
+            if key in self._preferences:
+                return self._preferences[key]
+        return self.context_manager.get_user_preference(key, default)
+
+    def _details(self) -> Dict[str, Any]:
+        """Get this session's own details for the summary"""
+        with self._lock:
+            return {
+                'session_id': self.session_id,
+                'created': str(self.created),
+                'conversation_entries': len(self._history),
+                'preferences': dict(self._preferences),
+                'bytes_used': self.bytes_used
+            }
+
+    def get_summary(self) -> Dict[str, Any]:
+        """Get the shared context summary together with this session's details"""
+        summary = dict(self.context_manager.get_context_summary())
+        summary['client_session'] = self._details()
+        return summary
+
+    def get_summary_json(self, **extra) -> bytes:
+        """
+        Get get_summary() serialized as UTF-8 JSON, ready to emit
+
+        The shared summary comes pre-serialized from the context manager;
+        only this session's details and any extra top-level fields are
+        encoded here and spliced in before its closing brace.
+        """
+        fields = json.dumps({'client_session': self._details(), **extra}, default=str).encode('utf-8')
+        return self.context_manager.get_context_summary_json()[:-1] + b', ' + fields[1:]
+
+
+class SessionRegistry:
+    """
+    LRU registry of client sessions
+
+    Attributes:
+        max_sessions: Maximum number of live sessions
+        idle_timeout: Seconds of inactivity after which a session is evicted
+    """
+
+    def __init__(self, context_manager, max_sessions: int = 32, idle_timeout: float = 1800,
+                 max_history: int = 50, max_session_bytes: int = 64 * 1024):
+        """Initialize an empty registry"""
+        self.logger = logging.getLogger(__name__)
+        self.context_manager = context_manager
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.max_history = max_history
+        self.max_session_bytes = max_session_bytes
+        self._sessions = OrderedDict()  # Least recently used first
+        self._evicted = 0
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> ClientSession:
+        """Get a client's session, creating it and evicting the LRU session if full"""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is not None:
+                self._sessions.move_to_end(session_id)
+                session.touch()
+                return session
+
+            while len(self._sessions) >= self.max_sessions:
+                evicted_id, _ = self._sessions.popitem(last=False)
+                self._evicted += 1
+                self.logger.info(f"Evicted least recently used session {evicted_id}")
+
+            session = ClientSession(session_id, self.context_manager,
+                                    self.max_history, self.max_session_bytes)
+            self._sessions[session_id] = session
+            return session
+
+    def close(self, session_id: str) -> bool:
+        """Remove a client's session, e.g. when its socket disconnects"""
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def evict_idle(self) -> int:
+        """Evict sessions idle longer than idle_timeout and return how many went"""
+        cutoff = time.monotonic() - self.idle_timeout
+        with self._lock:
+            idle = [session_id for session_id, session in self._sessions.items()
+                    if session.last_seen < cutoff]
+            for session_id in idle:
+                del self._sessions[session_id]
+            self._evicted += len(idle)
+        if idle:
+            self.logger.info(f"Evicted {len(idle)} idle sessions")
+        return len(idle)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get live session count, memory use and eviction total"""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            evicted = self._evicted
+        return {
+            'sessions': len(sessions),
+            'max_sessions': self.max_sessions,
+            'bytes': sum(session.bytes_used for session in sessions),
+            'max_session_bytes': self.max_session_bytes,
+            'evicted': evicted
+        }
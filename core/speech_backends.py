@@ -0,0 +1,288 @@
+"""
+LYRA 3.0 Speech Backends
+Pluggable speech-to-text engines for voice input
+
+VoiceInput used to send every phrase to Google's web service, which costs a
+network round trip per utterance and stops working offline. This module puts
+recognition behind one small interface so a local engine can be used instead:
+- VoskBackend: offline Kaldi recognizer that streams partial hypotheses
+  while the user is still speaking
+- WhisperBackend: offline faster-whisper model, final results only
+- GoogleBackend: the previous online recognizer, kept as a fallback
+
+All backends take 16-bit mono PCM, the format speech_recognition's
+Microphone produces and the WAV files in a test corpus use.
+"""
+
+import abc
+import json
+import logging
+import os
+from typing import Callable, Iterable, List, Optional
+
+import numpy as np
+
+try:
+    import vosk
+    VOSK_AVAILABLE = True
+except ImportError:
+    VOSK_AVAILABLE = False
+
+try:
+    from faster_whisper import WhisperModel
+    WHISPER_AVAILABLE = True
+except ImportError:
+    WHISPER_AVAILABLE = False
+
+try:
+    import speech_recognition as sr
+    GOOGLE_AVAILABLE = True
+except ImportError:
+    GOOGLE_AVAILABLE = False
+
+# Offline engines first; Google is only a fallback
+DEFAULT_BACKEND_ORDER = ['vosk', 'whisper', 'google']
+
+
+class SpeechBackendError(Exception):
+    """Raised when a backend cannot produce a transcript, e.g. a service error"""
+
+
+class SpeechBackend(abc.ABC):
+    """
+    Base class for speech-to-text engines
+
+    Attributes:
+        name: Short backend name used in configuration and benchmarks
+        streaming: True if stream() reports partial hypotheses
+        supports_grammar: True if decoding can be restricted to a word list
+    """
+
+    name = 'base'
+    streaming = False
+    supports_grammar = False
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def available(self) -> bool:
+        """Whether the engine and its model can be used"""
+        return False
+
+    @abc.abstractmethod
+    def transcribe(self, pcm: bytes, sample_rate: int, grammar: Optional[List[str]] = None) -> str:
+        """
+        Transcribe one complete utterance
+
+        Args:
+            pcm: 16-bit little-endian mono PCM samples
+            sample_rate: Samples per second of pcm
+            grammar: Words and phrases to restrict decoding to; ignored by
+                backends without supports_grammar
+
+        Returns:
+            str: The transcript, empty if nothing was understood
+        """
+
+    def stream(self, chunks: Iterable[bytes], sample_rate: int,
+               on_partial: Optional[Callable[[str], None]] = None,
+               grammar: Optional[List[str]] = None) -> str:
+        """
+        Transcribe audio arriving in chunks and return the final transcript
+
+        Non-streaming engines wait for the audio to end and transcribe it in
+        one go; streaming engines call on_partial with each new hypothesis.
+        Either way the transcript covers all of the audio.
+        """
+        session = self.open_stream(sample_rate, on_partial, grammar)
+        for chunk in chunks:
+            session.feed(chunk)
+        return session.finish()
+
+    def open_stream(self, sample_rate: int,
+                    on_partial: Optional[Callable[[str], None]] = None,
+                    grammar: Optional[List[str]] = None) -> 'SpeechStream':
+        """Start recognizing an utterance that is fed in as it is captured"""
+        return SpeechStream(self, sample_rate, on_partial, grammar)
+
+
+class SpeechStream:
+    """
+    One utterance being recognized while it is still being spoken
+
+    Audio is fed chunk by chunk as it is captured and finish() returns the
+    transcript once the utterance has ended. This base version keeps the
+    audio and transcribes it in one go, so it reports no partials.
+    """
+
+    def __init__(self, backend: SpeechBackend, sample_rate: int,
+                 on_partial: Optional[Callable[[str], None]] = None,
+                 grammar: Optional[List[str]] = None):
+        self.backend = backend
+        self.sample_rate = sample_rate
+        self.on_partial = on_partial
+        self.grammar = grammar
+        self._chunks = []
+
+    def feed(self, chunk: bytes):
+        """Add the next chunk of 16-bit mono PCM"""
+        self._chunks.append(chunk)
+
+    def finish(self) -> str:
+        """End the utterance and return its transcript"""
+        return self.backend.transcribe(b''.join(self._chunks), self.sample_rate, self.grammar)
+
+
+class VoskStream(SpeechStream):
+    """Vosk recognizer fed one chunk at a time, reporting each new hypothesis"""
+
+    def __init__(self, backend: 'VoskBackend', sample_rate: int,
+                 on_partial: Optional[Callable[[str], None]] = None,
+                 grammar: Optional[List[str]] = None):
+        super().__init__(backend, sample_rate, on_partial, grammar)
+        self._recognizer = backend._recognizer(sample_rate, grammar)
+        # Vosk closes a segment at every pause of about half a second; the
+        # audio may go on after it ("turn on ... the lights"), so segments
+        # are collected until the audio ends
+        self._segments = []
+        self._last_partial = ''
+
+    def feed(self, chunk: bytes):
+        if self._recognizer.AcceptWaveform(chunk):
+            text = json.loads(self._recognizer.Result()).get('text', '')
+            if text:
+                self._segments.append(text)
+            self._last_partial = ''
+            return
+        partial = json.loads(self._recognizer.PartialResult()).get('partial', '')
+        if partial and partial != self._last_partial and self.on_partial:
+            self.on_partial(' '.join(self._segments + [partial]))
+        self._last_partial = partial
+
+    def finish(self) -> str:
+        text = json.loads(self._recognizer.FinalResult()).get('text', '')
+        if text:
+            self._segments.append(text)
+        return ' '.join(self._segments)
+
+
+class VoskBackend(SpeechBackend):
+    """Offline streaming recognizer based on Vosk (Kaldi)"""
+
+    name = 'vosk'
+    streaming = True
+    supports_grammar = True
+
+    def __init__(self, model_path: str = 'models/vosk-model-small-en-us'):
+        super().__init__()
+        self.model_path = model_path
+        self._model = None
+
+    @property
+    def available(self) -> bool:
+        return VOSK_AVAILABLE and os.path.isdir(self.model_path)
+
+    def _recognizer(self, sample_rate: int, grammar: Optional[List[str]] = None):
+        """
+        Create a recognizer, loading the model on first use
+
+        With a grammar the recognizer only considers those words, which
+        needs a model with a dynamic graph such as the small models; grammar
+        words missing from the model's vocabulary are skipped.
+        """
+        if self._model is None:
+            vosk.SetLogLevel(-1)
+            self._model = vosk.Model(self.model_path)
+            self.logger.info(f"Vosk model loaded from {self.model_path}")
+        if grammar:
+            return vosk.KaldiRecognizer(self._model, sample_rate, json.dumps(grammar))
+        return vosk.KaldiRecognizer(self._model, sample_rate)
+
+    def transcribe(self, pcm: bytes, sample_rate: int, grammar: Optional[List[str]] = None) -> str:
+        return self.stream([pcm], sample_rate, grammar=grammar)
+
+    def open_stream(self, sample_rate: int,
+                    on_partial: Optional[Callable[[str], None]] = None,
+                    grammar: Optional[List[str]] = None) -> SpeechStream:
+        return VoskStream(self, sample_rate, on_partial, grammar)
+
+
+class WhisperBackend(SpeechBackend):
+    """Offline recognizer based on a small faster-whisper model"""
+
+    name = 'whisper'
+    SAMPLE_RATE = 16000  # Whisper models expect 16 kHz audio
+
+    def __init__(self, model_size: str = 'tiny.en', compute_type: str = 'int8'):
+        super().__init__()
+        self.model_size = model_size
+        self.compute_type = compute_type
+        self._model = None
+
+    @property
+    def available(self) -> bool:
+        return WHISPER_AVAILABLE
+
+    def transcribe(self, pcm: bytes, sample_rate: int, grammar: Optional[List[str]] = None) -> str:
+        if self._model is None:
+            self._model = WhisperModel(self.model_size, device='cpu', compute_type=self.compute_type)
+            self.logger.info(f"Whisper model {self.model_size} loaded")
+        audio = pcm_to_float(pcm, sample_rate, self.SAMPLE_RATE)
+        segments, _ = self._model.transcribe(audio, beam_size=1, language='en')
+        return ' '.join(segment.text.strip() for segment in segments).strip()
+
+
+class GoogleBackend(SpeechBackend):
+    """Online recognizer using Google's web speech API through speech_recognition"""
+
+    name = 'google'
+
+    def __init__(self):
+        super().__init__()
+        self._recognizer = sr.Recognizer() if GOOGLE_AVAILABLE else None
+
+    @property
+    def available(self) -> bool:
+        return GOOGLE_AVAILABLE
+
+    def transcribe(self, pcm: bytes, sample_rate: int, grammar: Optional[List[str]] = None) -> str:
+        try:
+            return self._recognizer.recognize_google(sr.AudioData(pcm, sample_rate, 2))
+        except sr.UnknownValueError:
+            return ''
+        except sr.RequestError as e:
+            raise SpeechBackendError(f"Google speech service error: {e}") from e
+
+
+BACKENDS = {
+    'vosk': VoskBackend,
+    'whisper': WhisperBackend,
+    'google': GoogleBackend
+}
+
+
+def pcm_to_float(pcm: bytes, sample_rate: int, target_rate: int) -> np.ndarray:
+    """Convert 16-bit PCM to float32 in [-1, 1], resampled linearly to target_rate"""
+    audio = np.frombuffer(pcm, dtype='<i2').astype(np.float32) / 32768.0
+    if sample_rate != target_rate and len(audio):
+        duration = len(audio) / sample_rate
+        target_times = np.arange(int(duration * target_rate)) / target_rate
+        audio = np.interp(target_times, np.arange(len(audio)) / sample_rate, audio).astype(np.float32)
+    return audio
+
+
+def create_backend(name: str, **options) -> SpeechBackend:
+    """Create a backend by name"""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown speech backend: {name}. Available: {list(BACKENDS)}")
+    return BACKENDS[name](**options)
+
+
+def select_backend(order: Optional[List[str]] = None) -> Optional[SpeechBackend]:
+    """Create the first available backend in order, offline engines first by default"""
+    for name in order or DEFAULT_BACKEND_ORDER:
+        backend = create_backend(name)
+        if backend.available:
+            return backend
+    return None
@@ -0,0 +1,212 @@
+"""
+LYRA 3.0 Speech Queue
+Priority queue of phrases waiting to be spoken
+
+A plain FIFO speaks every phrase in the order it was requested, so rapid GUI
+button presses build a backlog of speech that lags further and further behind
+what the devices are actually doing. This queue keeps speech current:
+- Priority levels (critical, high, normal, low), FIFO within a level
+- Duplicate phrases coalesced into the one already waiting (or playing)
+- Status phrases on a topic superseded by newer ones, e.g. only the latest
+  "TRINETRA moving ..." is kept
+- Phrases that waited longer than their priority's age limit skipped as stale
+
+It offers the parts of queue.Queue the TTS worker uses (get with timeout
+raising queue.Empty, task_done, join, empty) so it is a drop-in replacement.
+"""
+
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+# Lower level is spoken first
+PRIORITY_LEVELS = {'critical': 0, 'high': 1, 'normal': 2, 'low': 3}
+
+# Seconds a phrase may wait before it no longer reflects reality; None never expires
+MAX_QUEUE_AGE = {'critical': None, 'high': 30.0, 'normal': 10.0, 'low': 5.0}
+
+
+class SpeechQueue:
+    """
+    Thread-safe priority queue of phrases with coalescing, superseding and
+    staleness
+
+    Items are dicts with text, priority, topic, queued_at (monotonic
+    seconds) and stopped, an Event set by stop_current(). The item handed
+    out by get() stays current until task_done().
+    """
+
+    def __init__(self, max_age: Optional[Dict[str, Optional[float]]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.logger = logging.getLogger(__name__)
+        self.max_age = dict(MAX_QUEUE_AGE, **(max_age or {}))
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._items: List[Dict[str, Any]] = []
+        self._sequence = 0
+        self._unfinished = 0
+        self._closed = False
+        self.current: Optional[Dict[str, Any]] = None
+        self.stats = {'queued': 0, 'coalesced': 0, 'superseded': 0, 'stale': 0, 'max_depth': 0}
+
+    def put(self, text: str, priority: str = 'normal', topic: Optional[str] = None) -> str:
+        """
+        Queue a phrase
+
+        Args:
+            text: Phrase to speak
+            priority: One of PRIORITY_LEVELS
+            topic: Status topic; a newer phrase on the same topic replaces
+                any waiting one
+
+        Returns:
+            'queued', or 'coalesced' if the phrase was already waiting or playing
+        """
+        if priority not in PRIORITY_LEVELS:
+            raise ValueError(f"Unknown speech priority: {priority}")
+        now = self._clock()
+        with self._cond:
+            current = self.current
+            if current and current['text'] == text and priority != 'critical':
+                self.stats['coalesced'] += 1
+                return 'coalesced'
+
+            for item in self._items:
+                if item['text'] == text:
+                    # Keep its place in line, but at the more urgent priority
+                    # and as fresh as the latest request
+                    if PRIORITY_LEVELS[priority] < PRIORITY_LEVELS[item['priority']]:
+                        item['priority'] = priority
+                    item['queued_at'] = now
+                    item['topic'] = topic or item['topic']
+                    self.stats['coalesced'] += 1
+                    return 'coalesced'
+
+            if topic:
+                superseded = [item for item in self._items if item['topic'] == topic]
+                for item in superseded:
+                    self._items.remove(item)
+                    self.logger.debug(f"Superseded queued speech: {item['text'][:50]}")
+                self._unfinished -= len(superseded)
+                self.stats['superseded'] += len(superseded)
+
+            self._sequence += 1
+            self._items.append({'text': text, 'priority': priority, 'topic': topic,
+                                'queued_at': now, 'sequence': self._sequence,
+                                'stopped': threading.Event()})
+            self._unfinished += 1
+            self.stats['queued'] += 1
+            self.stats['max_depth'] = max(self.stats['max_depth'], len(self._items))
+            self._cond.notify()
+            return 'queued'
+
+    def _is_stale(self, item: Dict[str, Any], now: float) -> bool:
+        limit = self.max_age.get(item['priority'])
+        return limit is not None and now - item['queued_at'] > limit
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Take the most urgent phrase that is not stale
+
+        Returns:
+            The item, which becomes current until task_done(), or None once
+            the queue is closed
+
+        Raises:
+            queue.Empty: Nothing to speak within the timeout
+        """
+        deadline = None if timeout is None else self._clock() + timeout
+        with self._cond:
+            while True:
+                if self._closed:
+                    return None
+                now = self._clock()
+                stale = [item for item in self._items if self._is_stale(item, now)]
+                for item in stale:
+                    self._items.remove(item)
+                    self.logger.debug(f"Skipped stale speech: {item['text'][:50]}")
+                self._unfinished -= len(stale)
+                self.stats['stale'] += len(stale)
+                if stale and self._unfinished == 0:
+                    self._cond.notify_all()
+
+                if self._items:
+                    item = min(self._items, key=lambda entry: (PRIORITY_LEVELS[entry['priority']],
+                                                               entry['sequence']))
+                    self._items.remove(item)
+                    self.current = item
+                    return item
+
+                remaining = None if deadline is None else deadline - self._clock()
+                if remaining is not None and remaining <= 0:
+                    raise queue.Empty
+                self._cond.wait(remaining)
+
+    def stop_current(self, below: Optional[str] = None) -> bool:
+        """
+        Tell the phrase handed out by get() to stop
+
+        This runs under the queue lock, so a phrase taken just before is
+        stopped even if its speaker has not started it yet, and a phrase
+        taken just after is not.
+
+        Args:
+            below: Only stop the phrase if it is less urgent than this priority
+
+        Returns:
+            True if a phrase was told to stop
+        """
+        with self._cond:
+            current = self.current
+            if current is None:
+                return False
+            if below is not None and PRIORITY_LEVELS[current['priority']] <= PRIORITY_LEVELS[below]:
+                return False
+            current['stopped'].set()
+            return True
+
+    def task_done(self):
+        """Mark the current phrase finished"""
+        with self._cond:
+            self.current = None
+            self._unfinished = max(0, self._unfinished - 1)
+            if self._unfinished == 0:
+                self._cond.notify_all()
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued phrase has been spoken or dropped"""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._unfinished == 0, timeout)
+
+    def clear(self) -> int:
+        """Drop every waiting phrase, returning how many were dropped"""
+        with self._cond:
+            dropped = len(self._items)
+            self._items.clear()
+            self._unfinished -= dropped
+            if self._unfinished == 0:
+                self._cond.notify_all()
+            return dropped
+
+    def close(self):
+        """Wake the worker so it can exit; get() returns None from now on"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def empty(self) -> bool:
+        with self._cond:
+            return not self._items
+
+    def qsize(self) -> int:
+        with self._cond:
+            return len(self._items)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue depth, the age of the oldest waiting phrase and drop counters"""
+        with self._cond:
+            now = self._clock()
+            oldest = max((now - item['queued_at'] for item in self._items), default=0.0)
+            return dict(self.stats, depth=len(self._items), oldest_age=round(oldest, 2))
@@ -0,0 +1,278 @@
+"""
+LYRA 3.0 Telemetry
+Shared background sampler of host CPU, memory, disk, temperature and network
+
+Status requests used to measure CPU load with psutil.cpu_percent(interval=1),
+blocking the handler thread for a full second per request, and the GUI polls
+once per client per interval. Here one daemon thread samples the host at a
+configurable rate and every status call reads its cached snapshot instead:
+- CPU load from /proc/stat jiffy deltas between samples
+- Memory from /proc/meminfo (MemAvailable), disk usage from the filesystem
+- CPU temperature and clock from sysfs, load average from /proc/loadavg
+- Network throughput from /proc/net/dev byte deltas
+- psutil's non-blocking calls where /proc is not available (e.g. Windows)
+- Slower readings, such as vcgencmd or a connectivity check, added as
+  sources that run on a second thread at their own, longer interval, so a
+  check that blocks for seconds never delays the core samples
+"""
+
+import logging
+import os
+import shutil
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+# Seconds between samples
+DEFAULT_INTERVAL = 1.0
+
+THERMAL_ZONE = 'class/thermal/thermal_zone0/temp'
+CPU_FREQ = 'devices/system/cpu/cpu0/cpufreq/scaling_cur_freq'
+
+
+class TelemetrySampler:
+    """
+    Samples host metrics in a background thread into a cached snapshot
+
+    Attributes:
+        interval: Seconds between samples
+        samples: Number of samples taken
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, disk_path: Optional[str] = None,
+                 proc_root: str = '/proc', sys_root: str = '/sys'):
+        """
+        Initialize the sampler
+
+        Args:
+            interval: Seconds between samples
+            disk_path: Filesystem to report usage of; the system drive by default
+            proc_root: Location of procfs (another directory in tests)
+            sys_root: Location of sysfs
+        """
+        self.logger = logging.getLogger(__name__)
+        self.interval = interval
+        self.disk_path = disk_path or os.path.abspath(os.sep)
+        self.proc_root = proc_root
+        self.sys_root = sys_root
+        self.use_proc = os.path.exists(os.path.join(proc_root, 'stat'))
+        self.samples = 0
+        self._snapshot: Dict[str, Any] = {}
+        self._sources: Dict[str, Dict[str, Any]] = {}
+        self._source_values: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._previous_cpu = None
+        self._previous_net = None
+        self._previous_time = None
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._source_thread = None
+
+    def start(self):
+        """Take a first sample now and keep sampling in a background thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self.sample()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._source_thread = threading.Thread(target=self._run_sources, daemon=True)
+        self._source_thread.start()
+        source = 'procfs' if self.use_proc else 'psutil' if PSUTIL_AVAILABLE else 'no CPU source'
+        self.logger.info(f"Telemetry sampler started ({source}, every {self.interval:g} s)")
+
+    def stop(self):
+        """Stop the background thread"""
+        self._stop_event.set()
+        for thread in (self._thread, self._source_thread):
+            if thread:
+                thread.join(timeout=2)
+        self.logger.info("Telemetry sampler stopped")
+
+    def set_interval(self, interval: float):
+        """Change the sampling rate; takes effect after the current wait"""
+        self.interval = max(0.1, interval)
+
+    def add_source(self, name: str, read: Callable[[], Any], interval: float = 5.0):
+        """
+        Sample an extra reading into the snapshot under name
+
+        The reading runs on the source thread every interval seconds and
+        shows up in the snapshot from the next sample on. If it raises, the
+        previous value is kept.
+        """
+        with self._lock:
+            self._sources[name] = {'read': read, 'interval': interval, 'due': 0.0}
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.sample()
+            except Exception as e:
+                self.logger.error(f"Telemetry sample failed: {e}")
+
+    def _run_sources(self):
+        while not self._stop_event.is_set():
+            self.sample_sources()
+            self._stop_event.wait(0.5)
+
+    def sample_sources(self):
+        """Run every extra source that is due"""
+        now = time.monotonic()
+        with self._lock:
+            due = [(name, source) for name, source in self._sources.items() if now >= source['due']]
+        for name, source in due:
+            source['due'] = now + source['interval']
+            try:
+                value = source['read']()
+            except Exception as e:
+                self.logger.debug(f"Telemetry source {name} failed: {e}")
+                continue
+            with self._lock:
+                self._source_values[name] = value
+
+    def _read(self, root: str, path: str) -> Optional[str]:
+        try:
+            with open(os.path.join(root, path), 'r') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _cpu_times(self):
+        """(busy, total) jiffies summed over all CPUs"""
+        fields = [int(value) for value in self._read(self.proc_root, 'stat').split('\n', 1)[0].split()[1:9]]
+        # user nice system idle iowait irq softirq steal
+        idle = fields[3] + fields[4]
+        total = sum(fields)
+        return total - idle, total
+
+    def _memory(self) -> Dict[str, float]:
+        meminfo = {}
+        for line in self._read(self.proc_root, 'meminfo').splitlines():
+            key, _, value = line.partition(':')
+            meminfo[key] = int(value.split()[0]) if value.split() else 0
+        total = meminfo.get('MemTotal', 0)
+        available = meminfo.get('MemAvailable', meminfo.get('MemFree', 0))
+        return {
+            'memory_percent': round(100.0 * (total - available) / total, 1) if total else 0.0,
+            'memory_available_mb': round(available / 1024, 1)
+        }
+
+    def _net_bytes(self):
+        """(received, sent) bytes over all interfaces but loopback"""
+        received = sent = 0
+        for line in (self._read(self.proc_root, 'net/dev') or '').splitlines()[2:]:
+            name, _, counters = line.partition(':')
+            if name.strip() == 'lo':
+                continue
+            counters = counters.split()
+            received += int(counters[0])
+            sent += int(counters[8])
+        return received, sent
+
+    def _sample_proc(self, elapsed: Optional[float]) -> Dict[str, Any]:
+        """Readings from procfs and sysfs, with rates since the previous sample"""
+        readings = self._memory()
+
+        busy, total = self._cpu_times()
+        cpu_percent = 0.0
+        if self._previous_cpu and total > self._previous_cpu[1]:
+            cpu_percent = 100.0 * (busy - self._previous_cpu[0]) / (total - self._previous_cpu[1])
+        self._previous_cpu = (busy, total)
+        readings['cpu_percent'] = round(cpu_percent, 1)
+
+        loadavg = self._read(self.proc_root, 'loadavg')
+        readings['load_avg'] = [float(value) for value in loadavg.split()[:3]] if loadavg else [0.0, 0.0, 0.0]
+
+        net = self._net_bytes()
+        if self._previous_net and elapsed:
+            readings['net_rx_bytes_per_s'] = round((net[0] - self._previous_net[0]) / elapsed)
+            readings['net_tx_bytes_per_s'] = round((net[1] - self._previous_net[1]) / elapsed)
+        self._previous_net = net
+
+        temperature = self._read(self.sys_root, THERMAL_ZONE)
+        if temperature:
+            readings['cpu_temp'] = round(int(temperature) / 1000.0, 1)
+        frequency = self._read(self.sys_root, CPU_FREQ)
+        if frequency:
+            readings['cpu_freq'] = round(int(frequency) / 1000.0)
+        return readings
+
+    def _sample_psutil(self) -> Dict[str, Any]:
+        """Readings from psutil's non-blocking calls"""
+        if not PSUTIL_AVAILABLE:
+            return {'cpu_percent': 0.0, 'memory_percent': 0.0}
+        frequency = psutil.cpu_freq()
+        return {
+            # Load since the previous call, i.e. the previous sample
+            'cpu_percent': psutil.cpu_percent(interval=None),
+            'memory_percent': psutil.virtual_memory().percent,
+            'cpu_freq': round(frequency.current) if frequency else 0,
+            'load_avg': list(os.getloadavg()) if hasattr(os, 'getloadavg') else [0.0, 0.0, 0.0]
+        }
+
+    def sample(self) -> Dict[str, Any]:
+        """
+        Take one sample now and make it the snapshot
+
+        Returns:
+            The new snapshot
+        """
+        now = time.monotonic()
+        elapsed = now - self._previous_time if self._previous_time else None
+        self._previous_time = now
+
+        readings = self._sample_proc(elapsed) if self.use_proc else self._sample_psutil()
+        try:
+            usage = shutil.disk_usage(self.disk_path)
+            readings['disk_percent'] = round(100.0 * usage.used / usage.total, 1)
+        except OSError:
+            readings['disk_percent'] = 0.0
+
+        readings['sampled_at'] = time.time()
+        readings['_monotonic'] = now
+        with self._lock:
+            readings.update(self._source_values)
+            self._snapshot = readings
+            self.samples += 1
+        return self.snapshot()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get the latest sample without waiting for anything
+
+        Returns:
+            Copy of the readings, with 'age' in seconds since they were taken
+        """
+        with self._lock:
+            snapshot = dict(self._snapshot)
+        taken = snapshot.pop('_monotonic', None)
+        snapshot['age'] = round(time.monotonic() - taken, 3) if taken is not None else None
+        return snapshot
+
+
+_shared_sampler: Optional[TelemetrySampler] = None
+_shared_lock = threading.Lock()
+
+
+def get_sampler(interval: Optional[float] = None) -> TelemetrySampler:
+    """
+    Get the process-wide sampler, starting it on first use
+
+    Args:
+        interval: Sampling interval to use; None keeps the current one
+    """
+    global _shared_sampler
+    with _shared_lock:
+        if _shared_sampler is None:
+            _shared_sampler = TelemetrySampler(interval or DEFAULT_INTERVAL)
+            _shared_sampler.start()
+        elif interval is not None:
+            _shared_sampler.set_interval(interval)
+        return _shared_sampler
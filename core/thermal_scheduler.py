@@ -0,0 +1,176 @@
+"""
+LYRA 3.0 Thermal Scheduler
+Steps runtime profiles down under heat and load, and back up when it passes
+
+The Raspberry Pi 5 starts throttling its clocks at 80°C, and sustained YOLO
+detection in a closed enclosure gets there without anyone noticing. This
+scheduler watches CPU temperature, CPU load and memory pressure and caps the
+active mode's runtime profile before the firmware has to step in:
+- Three levels: normal, reduced and minimal
+- Escalation happens on the first sample over a threshold
+- Recovery needs every metric below a lower threshold for several samples
+  in a row, so readings hovering around a threshold cannot make it flap
+- Every level change is logged with the metric and value behind it
+"""
+
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Any, Callable, Optional
+
+# Profile caps per level, handed to ModeManager.set_profile_limits
+THROTTLE_LEVELS = (
+    ('normal', {}),
+    ('reduced', {'detection_fps': 5, 'detection_imgsz': 480, 'status_interval': 10}),
+    ('minimal', {'detection_fps': 1, 'detection_imgsz': 320, 'status_interval': 30,
+                 'listen_duty_cycle': 0.5}),
+)
+
+# Per metric: (level entered at or above each value, level left below each value)
+# for the reduced and minimal levels. The gap between the two is the hysteresis.
+DEFAULT_THRESHOLDS = {
+    'cpu_temp': ((70.0, 77.0), (65.0, 72.0)),        # °C; the Pi 5 throttles at 80
+    'cpu_percent': ((85.0, 95.0), (70.0, 85.0)),     # Percent of all cores
+    'memory_percent': ((85.0, 92.0), (75.0, 85.0)),  # Percent of RAM in use
+}
+
+
+class ThermalScheduler:
+    """
+    Background policy engine capping runtime profiles by temperature and load
+
+    Attributes:
+        interval: Seconds between metric samples
+        recover_samples: Consecutive calm samples needed to step back up a level
+        level: Current throttle level index into THROTTLE_LEVELS
+    """
+
+    def __init__(self, mode_manager, read_metrics: Callable[[], Dict[str, float]],
+                 interval: float = 5.0, recover_samples: int = 3,
+                 thresholds: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the scheduler
+
+        Args:
+            mode_manager: ModeManager whose profile limits are adjusted
+            read_metrics: Callable returning cpu_temp, cpu_percent and
+                memory_percent, e.g. Pi5Hardware.get_load_metrics
+        """
+        self.logger = logging.getLogger(__name__)
+        self.mode_manager = mode_manager
+        self.read_metrics = read_metrics
+        self.interval = interval
+        self.recover_samples = recover_samples
+        self.thresholds = thresholds or DEFAULT_THRESHOLDS
+        self.level = 0
+        self.decisions = []  # Recent level changes, newest last
+        self._calm_samples = 0
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start sampling in a background thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self.logger.info("Thermal scheduler started")
+
+    def stop(self):
+        """Stop sampling and lift any profile limits"""
+        self._stop_event.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=self.interval + 1)
+        if self.level:
+            self._set_level(0, 'scheduler stopped', None)
+
+    def _run(self):
+        """Sampling loop"""
+        while not self._stop_event.is_set():
+            try:
+                self.evaluate(self.read_metrics())
+            except Exception as e:
+                self.logger.error(f"Thermal scheduler error: {e}")
+            self._stop_event.wait(self.interval)
+
+    def evaluate(self, metrics: Dict[str, float]) -> int:
+        """
+        Decide the throttle level for one sample of metrics
+
+        Returns:
+            int: The throttle level after this sample
+        """
+        # Escalate straight to the highest level any metric calls for
+        wanted, trigger = 0, None
+        for metric, (enter, _) in self.thresholds.items():
+            value = metrics.get(metric)
+            if value is None:
+                continue
+            for level, threshold in enumerate(enter, start=1):
+                if value >= threshold and level > wanted:
+                    wanted, trigger = level, (metric, value, threshold)
+
+        if wanted > self.level:
+            self._calm_samples = 0
+            metric, value, threshold = trigger
+            self._set_level(wanted, f"{metric} {value:.1f} >= {threshold:.1f}", metrics)
+            return self.level
+
+        if self.level == 0:
+            return self.level
+
+        # Step back one level only after every metric stayed below the exit
+        # threshold of the current level for recover_samples samples in a row
+        if self._metric_above_exit(metrics):
+            self._calm_samples = 0
+            return self.level
+
+        self._calm_samples += 1
+        if self._calm_samples >= self.recover_samples:
+            self._calm_samples = 0
+            readings = ', '.join(f"{metric} {metrics[metric]:.1f}"
+                                 for metric in self.thresholds if metrics.get(metric) is not None)
+            self._set_level(self.level - 1,
+                            f"{readings} below exit thresholds for {self.recover_samples} samples",
+                            metrics)
+        return self.level
+
+    def _metric_above_exit(self, metrics: Dict[str, float]) -> Optional[str]:
+        """Get the first metric still at or above the current level's exit threshold"""
+        for metric, (_, exit_thresholds) in self.thresholds.items():
+            value = metrics.get(metric)
+            if value is not None and value >= exit_thresholds[self.level - 1]:
+                return metric
+        return None
+
+    def _set_level(self, level: int, reason: str, metrics: Optional[Dict[str, float]]):
+        """Apply a throttle level's profile limits and log why"""
+        previous = self.level
+        name, limits = THROTTLE_LEVELS[level]
+        result = self.mode_manager.set_profile_limits(limits)
+        if result['status'] != 'success':
+            self.logger.error(f"Could not switch to {name} profile: {result['message']}")
+            return
+
+        self.level = level
+        decision = {
+            'from_level': THROTTLE_LEVELS[previous][0],
+            'to_level': name,
+            'reason': reason,
+            'metrics': dict(metrics or {}),
+            'timestamp': str(datetime.now())
+        }
+        self.decisions = (self.decisions + [decision])[-50:]
+        log = self.logger.warning if level > previous else self.logger.info
+        log(f"Thermal scheduler: {decision['from_level']} -> {name} ({reason})")
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get current throttle level, its limits and recent decisions"""
+        name, limits = THROTTLE_LEVELS[self.level]
+        return {
+            'level': name,
+            'profile_limits': dict(limits),
+            'running': bool(self._thread and self._thread.is_alive()),
+            'recent_decisions': self.decisions[-10:]
+        }
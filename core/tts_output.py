@@ -1,12 +1,32 @@
 """
 LYRA 3.0 TTS Output
 Handles text-to-speech and voice output
+
+With pyaudio available, text is split into sentences that are rendered to
+audio files one after another while a player thread plays the finished ones
+back to back on a single output stream, so the first sentence is heard as
+soon as it is rendered however long the answer is. Short sentences are kept
+in an on-disk phrase cache (and the fixed responses are rendered ahead of
+time with prewarm()), so repeated greetings and acknowledgements play
+straight from their audio file.
+
+Phrases wait in a SpeechQueue: critical alerts preempt whatever is being
+said, repeated phrases are coalesced, a newer status phrase replaces an older
+one on the same topic, and phrases that waited too long are skipped.
 """
 
 import logging
+import os
+import re
+import tempfile
 import threading
 import queue
 import time
+import wave
+from collections import deque
+from typing import Any, Callable, Iterable, List, Optional
+from .phrase_cache import PhraseCache
+from .speech_queue import PRIORITY_LEVELS, SpeechQueue
 try:
     import pyttsx3
     TTS_AVAILABLE = True
@@ -14,21 +34,97 @@ except ImportError:
     TTS_AVAILABLE = False
     print("Warning: pyttsx3 not available. TTS will be disabled.")
 
+try:
+    import pyaudio
+    PYAUDIO_AVAILABLE = True
+except ImportError:
+    PYAUDIO_AVAILABLE = False
+
+# Frames written per call when playing cached audio; stopping is checked
+# between writes, so this bounds how long barge-in waits for silence
+PLAYBACK_CHUNK = 1024
+
+# Phrases up to this many characters are kept in the phrase cache; longer
+# ones are knowledge answers that rarely repeat
+CACHEABLE_LENGTH = 120
+
+# Sentences longer than this are split at clause boundaries, so no single
+# chunk holds up the start of playback for long
+MAX_CHUNK_LENGTH = 200
+
+SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+# Status phrases where only the latest matters, by topic. A newer phrase on a
+# topic replaces one still waiting, so rapid button presses do not queue up a
+# commentary of states the device has already left.
+STATUS_TOPICS = [
+    (re.compile(r'^TRINETRA moving\b'), 'trinetra_move'),
+    (re.compile(r'^KRAIT-3 (?:takeoff|land|hover|return|emergency_land)\b'), 'krait3_flight'),
+    (re.compile(r'^(?:Switching|Switched) to \w+ mode'), 'mode'),
+    (re.compile(r'^Voice recognition (?:started|stopped|activated)'), 'voice'),
+]
+
+def split_sentences(text: str, max_length: int = MAX_CHUNK_LENGTH) -> List[str]:
+    """
+    Split text into sentence chunks for pipelined synthesis
+    
+    Sentences longer than max_length are cut at the last comma, semicolon or
+    colon (failing that, the last space) before the limit.
+    """
+    chunks = []
+    for sentence in SENTENCE_END.split(text.strip()):
+        while len(sentence) > max_length:
+            cut = max(sentence.rfind(separator, 0, max_length) for separator in (', ', '; ', ': '))
+            if cut <= 0:
+                cut = sentence.rfind(' ', 0, max_length)
+            if cut <= 0:
+                break
+            chunks.append(sentence[:cut + 1].strip())
+            sentence = sentence[cut + 1:].strip()
+        if sentence:
+            chunks.append(sentence)
+    return chunks
+
 class TTSOutput:
     """
     Handles text-to-speech and voice output for LYRA 3.0
     """
     
-    def __init__(self):
+    def __init__(self, phrase_cache: Optional[PhraseCache] = None,
+                 engine_factory: Optional[Callable[[], Any]] = None):
+        """
+        Initialize speech output
+        
+        Args:
+            phrase_cache: Cache of synthesized phrases; one is created when
+                pyaudio can play them
+            engine_factory: Callable creating the speech engine; pyttsx3.init
+                by default
+        """
         self.logger = logging.getLogger(__name__)
+        self.engine_factory = engine_factory
         self.voice_settings = {
             'rate': 150,  # Words per minute
             'volume': 0.9,  # Volume level (0.0 to 1.0)
             'voice': 'default'  # Voice type
         }
+        self.verbosity = 'full'  # 'full', or 'brief' to speak only the first sentence
         self.engine = None
+        self.voice_id = None  # Engine voice actually selected
+        # Cached phrases need pyaudio to play; without it every phrase is synthesized
+        self.phrase_cache = phrase_cache
+        self._audio = None
+        self._to_cache = deque()  # Phrases to synthesize into the cache while idle
         self.speaking = False
-        self.speech_queue = queue.Queue()
+        self.phrase_started = None  # time.monotonic() the current phrase began
+        self._idle = threading.Event()  # Set whenever nothing is being spoken
+        self._idle.set()
+        # Barge-in latencies (speech detected to output silent), in seconds
+        self.barge_in_latencies = deque(maxlen=50)
+        self.speech_queue = SpeechQueue()
+        self.preemptions = 0  # Utterances cut off by a critical alert
+        # Seconds from starting a phrase to its first audio being written
+        self.first_audio_latencies = deque(maxlen=50)
         self.worker_thread = None
         self.running = True
         self._init_tts_engine()
@@ -36,9 +132,9 @@ class TTSOutput:
     
     def _init_tts_engine(self):
         """Initialize TTS engine"""
-        if TTS_AVAILABLE:
+        if self.engine_factory or TTS_AVAILABLE:
             try:
-                self.engine = pyttsx3.init()
+                self.engine = (self.engine_factory or pyttsx3.init)()
                 self.engine.setProperty('rate', self.voice_settings['rate'])
                 self.engine.setProperty('volume', self.voice_settings['volume'])
                 
@@ -48,11 +144,15 @@ class TTSOutput:
                     # Try to find a female voice
                     for voice in voices:
                         if 'female' in voice.name.lower() or 'zira' in voice.name.lower():
-                            self.engine.setProperty('voice', voice.id)
+                            self.voice_id = voice.id
                             break
                     else:
                         # Use the first available voice
-                        self.engine.setProperty('voice', voices[0].id)
+                        self.voice_id = voices[0].id
+                    self.engine.setProperty('voice', self.voice_id)
+                
+                if self.phrase_cache is None and PYAUDIO_AVAILABLE:
+                    self.phrase_cache = PhraseCache()
                 
                 self.logger.info("TTS engine initialized successfully")
             except Exception as e:
@@ -70,81 +170,360 @@ class TTSOutput:
         """Worker thread that processes TTS queue"""
         while self.running:
             try:
-                # Get text from queue with timeout
-                text = self.speech_queue.get(timeout=1)
+                # Get text from queue with timeout; poll quickly while there
+                # are phrases to cache so they are done between requests
+                item = self.speech_queue.get(timeout=0.05 if self._to_cache else 1)
                 
-                if text is None:  # Shutdown signal
+                if item is None:  # Shutdown signal
                     break
+                text = item['text']
                     
-                if self.engine and TTS_AVAILABLE:
+                if self.engine:
                     try:
+                        self._idle.clear()
                         self.speaking = True
-                        self.engine.say(text)
-                        self.engine.runAndWait()
-                        self.speaking = False
+                        self.phrase_started = time.monotonic()
+                        self._say(text, item['stopped'])
                         self.logger.debug(f"TTS completed for: {text[:50]}...")
                     except Exception as e:
                         self.logger.error(f"TTS worker error: {e}")
-                        self.speaking = False
                         print(f"🎙️ LYRA: {text}")  # Fallback to console
+                    finally:
+                        self.speaking = False
+                        self.phrase_started = None
+                        self._idle.set()
                 else:
                     print(f"🎙️ LYRA: {text}")  # Console output fallback
                     
                 self.speech_queue.task_done()
                 
             except queue.Empty:
-                # No speech to process, continue
+                # No speech to process, cache a phrase if any are waiting
+                self._cache_next_phrase()
                 continue
             except Exception as e:
                 self.logger.error(f"TTS worker thread error: {e}")
                 time.sleep(0.1)
     
-    def speak(self, text: str, priority: str = 'normal'):
-        """Convert text to speech and play it"""
+    def _cache_settings(self) -> dict:
+        """Voice settings that identify a phrase's audio in the cache"""
+        return {'voice': self.voice_id, 'rate': self.voice_settings['rate'],
+                'volume': self.voice_settings['volume']}
+    
+    def _say(self, text: str, stopped: threading.Event):
+        """
+        Speak one phrase, pipelined sentence by sentence when audio can be played directly
+        
+        stopped is the phrase's own stop flag from the speech queue, so a stop
+        that arrives before the phrase gets going still silences it.
+        """
+        if stopped.is_set():
+            return
+        if not PYAUDIO_AVAILABLE:
+            self.engine.say(text)
+            self.engine.runAndWait()
+            return
+        
+        started = time.monotonic()
+        settings = self._cache_settings()
+        chunks = split_sentences(text)
+        if len(chunks) > 1 and self.phrase_cache and self.phrase_cache.contains(text, settings):
+            chunks = [text]  # Prewarmed as a whole
+        
+        ready = queue.Queue()
+        player = threading.Thread(target=self._play_chunks, args=(ready, started, stopped), daemon=True)
+        player.start()
+        try:
+            # Render the next chunk while the player works through the earlier ones
+            for chunk in chunks:
+                if stopped.is_set():
+                    break
+                ready.put(self._render_chunk(chunk, settings))
+        finally:
+            ready.put(None)
+            player.join()
+    
+    def _render_chunk(self, text: str, settings: dict):
+        """
+        Get a WAV file for one chunk: from the phrase cache, rendered into the
+        cache if it is short, or rendered to a temporary file
+        
+        Returns:
+            (path, temporary) where temporary files are deleted once played
+        """
+        if self.phrase_cache:
+            path = self.phrase_cache.get(text, settings)
+            if path is None and len(text) <= CACHEABLE_LENGTH:
+                path = self.phrase_cache.put(text, settings, self._synthesize_to_file)
+            if path:
+                return path, False
+        
+        handle, path = tempfile.mkstemp(prefix='lyra_tts_', suffix='.wav')
+        os.close(handle)
+        try:
+            self._synthesize_to_file(text, path)
+        except Exception:
+            os.remove(path)
+            raise
+        return path, True
+    
+    def _open_output(self, sample_width: int, channels: int, rate: int):
+        """Open a pyaudio output stream for audio in the given format"""
+        if self._audio is None:
+            self._audio = pyaudio.PyAudio()
+        return self._audio.open(format=self._audio.get_format_from_width(sample_width),
+                                channels=channels, rate=rate, output=True)
+    
+    def _play_chunks(self, ready: queue.Queue, started: float, stopped: threading.Event):
+        """
+        Player thread: play rendered chunks in order until None arrives
+        
+        Chunks share one output stream (reopened only if the format changes),
+        so consecutive sentences follow each other without a gap. Stopping is
+        checked between writes of PLAYBACK_CHUNK frames; later chunks are then
+        skipped but their temporary files still removed.
+        """
+        stream = None
+        stream_format = None
+        first_audio = True
+        try:
+            while True:
+                entry = ready.get()
+                if entry is None:
+                    break
+                path, temporary = entry
+                try:
+                    if stopped.is_set():
+                        continue
+                    with wave.open(path, 'rb') as wav:
+                        chunk_format = (wav.getsampwidth(), wav.getnchannels(), wav.getframerate())
+                        if chunk_format != stream_format:
+                            if stream is not None:
+                                stream.stop_stream()
+                                stream.close()
+                            stream = self._open_output(*chunk_format)
+                            stream_format = chunk_format
+                        data = wav.readframes(PLAYBACK_CHUNK)
+                        while data and not stopped.is_set():
+                            if first_audio:
+                                self.first_audio_latencies.append(time.monotonic() - started)
+                                first_audio = False
+                            stream.write(data)
+                            data = wav.readframes(PLAYBACK_CHUNK)
+                except (wave.Error, EOFError, OSError) as e:
+                    self.logger.warning(f"Could not play speech chunk {path}: {e}")
+                finally:
+                    if temporary:
+                        try:
+                            os.remove(path)
+                        except OSError:
+                            pass
+        finally:
+            if stream is not None:
+                stream.stop_stream()
+                stream.close()
+    
+    def _synthesize_to_file(self, text: str, path: str):
+        """Render a phrase to a WAV file with the speech engine"""
+        self.engine.save_to_file(text, path)
+        self.engine.runAndWait()
+    
+    def _cache_next_phrase(self):
+        """
+        Synthesize one waiting phrase into the cache
+        
+        Only one phrase per call, and only while nothing is queued to be
+        spoken, so caching never delays a real response by more than the
+        synthesis of a single short phrase.
+        """
+        if not (self.phrase_cache and self.engine):
+            self._to_cache.clear()
+            return
+        settings = self._cache_settings()
+        while self._to_cache and self.running and self.speech_queue.empty():
+            text = self._to_cache.popleft()
+            if not self.phrase_cache.contains(text, settings):
+                self.phrase_cache.put(text, settings, self._synthesize_to_file)
+                return
+    
+    def prewarm(self, phrases: Iterable[str]) -> int:
+        """
+        Synthesize phrases into the phrase cache ahead of time
+        
+        The phrases are rendered by the worker one at a time whenever nothing
+        is being spoken, so this returns immediately. Each phrase is also
+        cached as its first sentence, which is what brief verbosity speaks.
+        
+        Args:
+            phrases: Fixed responses likely to be spoken, e.g. greetings and
+                DecisionEngine.get_response_templates()
+        
+        Returns:
+            Number of phrases queued for caching
+        """
+        if not self.phrase_cache:
+            return 0
+        settings = self._cache_settings()
+        queued = 0
+        for phrase in phrases:
+            phrase = phrase.strip()
+            for text in dict.fromkeys([phrase, self._first_sentence(phrase)]):
+                if (text and len(text) <= CACHEABLE_LENGTH and text not in self._to_cache
+                        and not self.phrase_cache.contains(text, settings)):
+                    self._to_cache.append(text)
+                    queued += 1
+        self.logger.info(f"Prewarming phrase cache with {queued} phrases")
+        return queued
+    
+    def get_cache_stats(self) -> dict:
+        """Get phrase cache statistics, including phrases still waiting to be cached"""
+        if not self.phrase_cache:
+            return {'enabled': False}
+        return dict(self.phrase_cache.get_stats(), enabled=True, pending=len(self._to_cache))
+    
+    @staticmethod
+    def _status_topic(text: str) -> Optional[str]:
+        """Topic of a status phrase that newer phrases supersede, if it is one"""
+        for pattern, topic in STATUS_TOPICS:
+            if pattern.match(text):
+                return topic
+        return None
+    
+    def speak(self, text: str, priority: str = 'normal', topic: Optional[str] = None):
+        """
+        Convert text to speech and play it
+        
+        Args:
+            text: Phrase to speak
+            priority: 'critical' (preempts the phrase being spoken), 'high',
+                'normal' or 'low'; more urgent phrases are spoken first, and an
+                unknown priority is logged and treated as 'normal'
+            topic: Status topic whose older waiting phrases this replaces;
+                recognised from STATUS_TOPICS when not given
+        """
         if not text:
             return
         
+        if self.verbosity == 'brief':
+            text = self._first_sentence(text)
+        
         self.logger.info(f"Speaking: {text}")
         
         try:
-            # Add text to speech queue
-            if priority == 'high':
-                # For high priority, clear queue and add immediately
-                while not self.speech_queue.empty():
-                    try:
-                        self.speech_queue.get_nowait()
-                        self.speech_queue.task_done()
-                    except queue.Empty:
-                        break
+            if priority not in PRIORITY_LEVELS:
+                self.logger.warning(f"Unknown speech priority {priority!r}, speaking at normal priority")
+                priority = 'normal'
+            result = self.speech_queue.put(text, priority, topic or self._status_topic(text))
+            if result == 'coalesced':
+                self.logger.debug(f"Coalesced repeated speech: {text[:50]}")
             
-            self.speech_queue.put(text)
+            # Queued first, so the alert is what the worker picks up next
+            if priority == 'critical' and self.speech_queue.stop_current(below='critical'):
+                self.preemptions += 1
+                self.logger.info("Preempting speech for critical alert")
+                self._stop_engine()
             
         except Exception as e:
             self.logger.error(f"TTS queue error: {e}")
             print(f"🎙️ LYRA: {text}")  # Fallback to console
     
+    def apply_profile(self, profile: dict):
+        """Apply the mode's speech verbosity"""
+        verbosity = profile.get('tts_verbosity', self.verbosity)
+        if verbosity not in ('full', 'brief'):
+            raise ValueError(f"Unknown TTS verbosity: {verbosity}")
+        self.verbosity = verbosity
+    
+    @staticmethod
+    def _first_sentence(text: str) -> str:
+        """Cut text down to its first sentence"""
+        match = re.match(r'(.+?[.!?])(\s|$)', text.strip(), re.DOTALL)
+        return match.group(1) if match else text
+    
+    def is_speaking(self) -> bool:
+        """Check if speech is playing right now"""
+        return self.speaking
+    
     def stop_speaking(self):
         """Stop current speech"""
-        if self.engine and TTS_AVAILABLE:
+        # Clear the queue first so the worker cannot start the next phrase
+        self.speech_queue.clear()
+        self._stop_output()
+    
+    def _stop_output(self):
+        """Cut off the phrase being spoken, whether cached or synthesized"""
+        self.speech_queue.stop_current()
+        self._stop_engine()
+    
+    def _stop_engine(self):
+        """Stop the speech engine mid-phrase"""
+        if self.engine:
             try:
                 self.engine.stop()
             except:
                 pass
+    
+    def interrupt(self, onset: float = None) -> dict:
+        """
+        Barge-in: silence speech immediately because the user started talking
         
-        # Clear queue
-        while not self.speech_queue.empty():
-            try:
-                self.speech_queue.get_nowait()
-                self.speech_queue.task_done()
-            except queue.Empty:
-                break
+        Drops everything queued, stops the phrase being spoken and waits
+        (up to a second) for the output to actually go quiet.
+        
+        Args:
+            onset: time.monotonic() when the user's speech was detected;
+                defaults to now
+        
+        Returns:
+            Dict with whether speech was interrupted and, if so, the latency
+            from onset to silence in milliseconds
+        """
+        onset = time.monotonic() if onset is None else onset
+        was_speaking = self.speaking
+        self.stop_speaking()
+        if not was_speaking:
+            return {'interrupted': False}
+        
+        if not self._idle.wait(timeout=1.0):
+            self.logger.warning("Speech output did not stop within a second of barge-in")
+        latency = time.monotonic() - onset
+        self.barge_in_latencies.append(latency)
+        self.logger.info(f"Speech interrupted {latency * 1000:.0f} ms after the user started talking")
+        return {'interrupted': True, 'latency_ms': round(latency * 1000, 1)}
+    
+    def get_queue_stats(self) -> dict:
+        """
+        Get speech queue depth, age, how many phrases were dropped or
+        preempted, and the time from starting a phrase to its first audio
+        """
+        latencies = [latency * 1000 for latency in self.first_audio_latencies]
+        first_audio = {}
+        if latencies:
+            first_audio = {'first_audio_ms': round(latencies[-1], 1),
+                           'mean_first_audio_ms': round(sum(latencies) / len(latencies), 1)}
+        return dict(self.speech_queue.get_stats(), preempted=self.preemptions, **first_audio)
+    
+    def get_barge_in_stats(self) -> dict:
+        """Get barge-in count and onset-to-silence latency statistics in milliseconds"""
+        latencies = [latency * 1000 for latency in self.barge_in_latencies]
+        if not latencies:
+            return {'count': 0}
+        return {
+            'count': len(latencies),
+            'last_ms': round(latencies[-1], 1),
+            'mean_ms': round(sum(latencies) / len(latencies), 1),
+            'max_ms': round(max(latencies), 1)
+        }
     
     def shutdown(self):
         """Shutdown TTS system"""
         self.running = False
-        self.speech_queue.put(None)  # Signal worker to stop
+        self.speech_queue.close()  # Signal worker to stop
         if self.worker_thread:
             self.worker_thread.join(timeout=2)
+        if self._audio is not None:
+            self._audio.terminate()
+            self._audio = None
     
     def set_voice_settings(self, settings: dict):
         """Update voice settings"""
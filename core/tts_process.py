@@ -0,0 +1,339 @@
+"""
+LYRA 3.0 TTS Process
+Runs speech output in a separate worker process
+
+TTSOutput synthesizes and plays speech on a thread of the server process,
+where pyttsx3's runAndWait blocks inside the driver and competes for the GIL
+with the SocketIO handlers and vision post-processing. TTSProcess has the same
+API but runs a TTSOutput in a child process instead, fed over a
+multiprocessing queue:
+- Fire-and-forget calls (speak, stop_speaking, ...) are just queued
+- Calls whose answer matters (apply_profile, statistics) wait for a reply
+- The child publishes whether it is speaking through shared memory, so
+  is_speaking() (polled by barge-in detection) never waits on IPC
+- A watchdog restarts the child if it dies, stops responding, or the engine
+  hangs on a phrase, then restores the voice settings, profile and prewarmed
+  phrases
+- The child is spawned as a fresh interpreter rather than forked, since the
+  server already runs threads (telemetry, journal flushes, audio capture,
+  SocketIO) whose locks a forked child could inherit held
+"""
+
+import itertools
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from .speech_queue import PRIORITY_LEVELS
+from .tts_output import TTSOutput
+
+# A phrase taking longer than HANG_SECONDS plus HANG_SECONDS_PER_CHAR per
+# character (far slower than any speaking rate) means the engine is stuck
+HANG_SECONDS = 15.0
+HANG_SECONDS_PER_CHAR = 0.15
+
+# The child refreshes its heartbeat and speaking state this often, and is
+# restarted if the heartbeat is older than HEARTBEAT_TIMEOUT
+STATE_INTERVAL = 0.05
+HEARTBEAT_TIMEOUT = 10.0
+
+WATCHDOG_INTERVAL = 0.5
+REPLY_TIMEOUT = 2.0
+
+# TTSOutput methods the parent may invoke in the child
+PROCESS_COMMANDS = {'speak', 'stop_speaking', 'prewarm', 'apply_profile', 'set_voice_settings',
+                    'get_queue_stats', 'get_cache_stats'}
+
+
+def _publish_state(tts: TTSOutput, state: Dict[str, Any]):
+    """Copy the child's speaking state into shared memory for the parent"""
+    current = tts.speech_queue.current
+    state['speaking'].value = 1 if tts.is_speaking() else 0
+    state['phrase_started'].value = tts.phrase_started or 0.0
+    state['phrase_length'].value = len(current['text']) if current else 0
+    state['heartbeat'].value = time.monotonic()
+
+
+def _tts_process_main(commands, replies, state: Dict[str, Any],
+                      engine_factory: Optional[Callable[[], Any]] = None):
+    """
+    Child process: own a TTSOutput and run the parent's commands on it
+
+    Commands are (request_id, method, args) tuples; the result is sent back
+    as (request_id, result, error) when request_id is not None. None shuts
+    the process down.
+    """
+    logger = logging.getLogger(__name__)
+    tts = TTSOutput(engine_factory=engine_factory)
+    try:
+        while True:
+            _publish_state(tts, state)
+            try:
+                command = commands.get(timeout=STATE_INTERVAL)
+            except queue.Empty:
+                continue
+            if command is None:
+                break
+
+            request_id, method, args = command
+            result, error = None, None
+            try:
+                if method not in PROCESS_COMMANDS:
+                    raise ValueError(f"Unknown TTS command: {method}")
+                result = getattr(tts, method)(*args)
+            except Exception as e:
+                logger.error(f"TTS process command {method} failed: {e}")
+                error = e
+            if request_id is not None:
+                replies.put((request_id, result, error))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        tts.shutdown()
+
+
+class TTSProcess:
+    """
+    Drop-in replacement for TTSOutput that speaks from a worker process
+    """
+
+    def __init__(self, hang_seconds: float = HANG_SECONDS,
+                 hang_seconds_per_char: float = HANG_SECONDS_PER_CHAR,
+                 heartbeat_timeout: float = HEARTBEAT_TIMEOUT,
+                 engine_factory: Optional[Callable[[], Any]] = None):
+        """
+        Start the worker process and its watchdog
+
+        Args:
+            hang_seconds: Base time a phrase may take before the engine is
+                considered hung
+            hang_seconds_per_char: Extra time allowed per character
+            heartbeat_timeout: Seconds without a heartbeat before restarting
+            engine_factory: Creates the speech engine in the child; must be
+                picklable (a module-level function or class). pyttsx3 by default
+        """
+        self.logger = logging.getLogger(__name__)
+        self.engine_factory = engine_factory
+        self.hang_seconds = hang_seconds
+        self.hang_seconds_per_char = hang_seconds_per_char
+        self.heartbeat_timeout = heartbeat_timeout
+        self.voice_settings = {
+            'rate': 150,
+            'volume': 0.9,
+            'voice': 'default'
+        }
+        self.verbosity = 'full'
+        self.barge_in_latencies = deque(maxlen=50)
+        self.restarts = 0
+        self.running = True
+        self.process = None
+        # Never fork: see the module docstring
+        self._context = multiprocessing.get_context('spawn')
+        self._request_ids = itertools.count(1)
+        self._call_lock = threading.Lock()
+        self._restart_lock = threading.Lock()
+        # Replayed into a restarted child
+        self._profile = None
+        self._voice_changes: Dict[str, Any] = {}
+        self._prewarmed = []
+        self._start_process()
+        self.watchdog_thread = threading.Thread(target=self._watchdog, daemon=True)
+        self.watchdog_thread.start()
+
+    def _start_process(self):
+        """Start a child process with fresh queues and shared state"""
+        self._commands = self._context.Queue()
+        self._replies = self._context.Queue()
+        self._state = {
+            'speaking': self._context.Value('b', 0, lock=False),
+            'phrase_started': self._context.Value('d', 0.0, lock=False),
+            'phrase_length': self._context.Value('i', 0, lock=False),
+            # Counts from now, so a slow engine start is not taken for a hang
+            'heartbeat': self._context.Value('d', time.monotonic(), lock=False)
+        }
+        self.process = self._context.Process(target=_tts_process_main,
+                                             args=(self._commands, self._replies, self._state,
+                                                   self.engine_factory),
+                                             name='lyra-tts', daemon=True)
+        self.process.start()
+        self.logger.info(f"TTS worker process started (pid {self.process.pid})")
+
+    def _send(self, method: str, *args):
+        """Queue a command for the child without waiting for it"""
+        self._commands.put((None, method, args))
+
+    def _call(self, method: str, *args, default: Any = None, timeout: float = REPLY_TIMEOUT) -> Any:
+        """
+        Run a command in the child and wait for its result
+
+        Returns:
+            The result, or default if the child did not answer in time
+
+        Raises:
+            The exception the command raised in the child
+        """
+        with self._call_lock:
+            request_id = next(self._request_ids)
+            replies = self._replies
+            self._commands.put((request_id, method, args))
+            deadline = time.monotonic() + timeout
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.logger.warning(f"TTS process did not answer {method} within {timeout:.1f} s")
+                    return default
+                try:
+                    reply_id, result, error = replies.get(timeout=remaining)
+                except queue.Empty:
+                    continue
+                if reply_id != request_id:
+                    continue  # Answer to a call that already timed out
+                if error is not None:
+                    raise error
+                return result
+
+    def _check_health(self) -> Optional[str]:
+        """Reason the child needs restarting, or None if it is healthy"""
+        if not self.process.is_alive():
+            return f"exited with code {self.process.exitcode}"
+        now = time.monotonic()
+        if now - self._state['heartbeat'].value > self.heartbeat_timeout:
+            return "stopped responding"
+        started = self._state['phrase_started'].value
+        if started:
+            limit = self.hang_seconds + self.hang_seconds_per_char * self._state['phrase_length'].value
+            if now - started > limit:
+                return f"engine hung for {now - started:.1f} s on one phrase"
+        return None
+
+    def _watchdog(self):
+        """Restart the child whenever it is found unhealthy"""
+        while self.running:
+            time.sleep(WATCHDOG_INTERVAL)
+            reason = self._check_health() if self.running else None
+            if reason and self.running:
+                self._restart(reason)
+
+    def _restart(self, reason: str):
+        """Replace the child process and restore its settings"""
+        with self._restart_lock:
+            self.logger.warning(f"TTS worker process {reason}; restarting it")
+            if self.process.is_alive():
+                self.process.terminate()
+                self.process.join(timeout=1)
+                if self.process.is_alive():
+                    self.process.kill()
+                    self.process.join(timeout=1)
+            self._start_process()
+            self.restarts += 1
+            # Whatever was queued in the old process is lost; it would be stale by now
+            if self._voice_changes:
+                self._send('set_voice_settings', dict(self._voice_changes))
+            if self._profile is not None:
+                self._send('apply_profile', dict(self._profile))
+            if self._prewarmed:
+                self._send('prewarm', list(self._prewarmed))
+
+    def speak(self, text: str, priority: str = 'normal', topic: Optional[str] = None):
+        """Queue text to be spoken by the worker process (see TTSOutput.speak)"""
+        if not text:
+            return
+        if priority not in PRIORITY_LEVELS:
+            self.logger.warning(f"Unknown speech priority {priority!r}, speaking at normal priority")
+            priority = 'normal'
+        self.logger.info(f"Speaking: {text}")
+        self._send('speak', text, priority, topic)
+
+    def apply_profile(self, profile: dict):
+        """Apply the mode's speech verbosity, raising if the worker rejects it"""
+        self._call('apply_profile', dict(profile))
+        self.verbosity = profile.get('tts_verbosity', self.verbosity)
+        self._profile = dict(profile)
+
+    def prewarm(self, phrases: Iterable[str]) -> int:
+        """Have the worker synthesize phrases into the phrase cache while idle"""
+        phrases = list(phrases)
+        self._prewarmed = phrases
+        return self._call('prewarm', phrases, default=0)
+
+    def is_speaking(self) -> bool:
+        """Check if speech is playing right now"""
+        return bool(self._state['speaking'].value)
+
+    def stop_speaking(self):
+        """Stop current speech and drop everything queued"""
+        self._send('stop_speaking')
+
+    def interrupt(self, onset: float = None) -> dict:
+        """
+        Barge-in: silence speech immediately because the user started talking
+
+        Same contract as TTSOutput.interrupt(); the latency includes the hop
+        to the worker process.
+        """
+        onset = time.monotonic() if onset is None else onset
+        was_speaking = self.is_speaking()
+        self.stop_speaking()
+        if not was_speaking:
+            return {'interrupted': False}
+
+        deadline = time.monotonic() + 1.0
+        while self.is_speaking() and time.monotonic() < deadline:
+            time.sleep(0.005)
+        if self.is_speaking():
+            self.logger.warning("Speech output did not stop within a second of barge-in")
+        latency = time.monotonic() - onset
+        self.barge_in_latencies.append(latency)
+        self.logger.info(f"Speech interrupted {latency * 1000:.0f} ms after the user started talking")
+        return {'interrupted': True, 'latency_ms': round(latency * 1000, 1)}
+
+    def get_barge_in_stats(self) -> dict:
+        """Get barge-in count and onset-to-silence latency statistics in milliseconds"""
+        latencies = [latency * 1000 for latency in self.barge_in_latencies]
+        if not latencies:
+            return {'count': 0}
+        return {
+            'count': len(latencies),
+            'last_ms': round(latencies[-1], 1),
+            'mean_ms': round(sum(latencies) / len(latencies), 1),
+            'max_ms': round(max(latencies), 1)
+        }
+
+    def get_queue_stats(self) -> dict:
+        """Get the worker's speech queue statistics and how often it was restarted"""
+        return dict(self._call('get_queue_stats', default={}), restarts=self.restarts,
+                    pid=self.process.pid)
+
+    def get_cache_stats(self) -> dict:
+        """Get the worker's phrase cache statistics"""
+        return self._call('get_cache_stats', default={'enabled': False})
+
+    def set_voice_settings(self, settings: dict):
+        """Update voice settings"""
+        self.voice_settings.update(settings)
+        self._voice_changes.update(settings)
+        self._send('set_voice_settings', dict(settings))
+        self.logger.debug(f"Voice settings updated: {self.voice_settings}")
+
+    def get_voice_settings(self) -> dict:
+        """Get current voice settings"""
+        return self.voice_settings.copy()
+
+    def shutdown(self):
+        """Stop the watchdog and the worker process"""
+        self.running = False
+        with self._restart_lock:
+            try:
+                self._commands.put(None)
+            except (OSError, ValueError):
+                pass
+            self.process.join(timeout=3)
+            if self.process.is_alive():
+                self.process.terminate()
+                self.process.join(timeout=1)
+        if self.watchdog_thread:
+            self.watchdog_thread.join(timeout=2)
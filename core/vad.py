@@ -0,0 +1,255 @@
+"""
+LYRA 3.0 Voice Activity Detection
+Tells speech apart from silence and noise in raw microphone audio
+
+An energy threshold alone turns every door slam, fan or keyboard clatter into
+a "phrase" for speech recognition. This detector looks at short fixed-size
+frames and only calls a frame speech when it is
+- loud enough (RMS energy above the threshold),
+- tonal rather than noise-like (low spectral flatness), and
+- not dominated by hiss (zero-crossing rate below a limit).
+A frame only starts speech if the frame before it qualified too, and speech
+is held for a few frames after the last qualifying one (hangover) so the
+pauses between words do not split an utterance. All features are computed
+for every frame of a chunk at once with NumPy.
+
+The energy threshold can follow the background noise: a NoiseFloorEstimator
+tracks the level of non-speech frames as a fan, engine or rotor spins up or
+down and keeps the threshold a fixed margin above it.
+"""
+
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Length of one analysis frame, in milliseconds
+FRAME_MS = 20
+
+
+def frame_features(samples: np.ndarray, frame_length: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Compute per-frame features of float samples in 16-bit units
+
+    Trailing samples that do not fill a whole frame are ignored.
+
+    Returns:
+        Tuple of arrays (rms energy, zero-crossing rate, spectral flatness),
+        one value per frame
+    """
+    count = len(samples) // frame_length
+    if count == 0:
+        empty = np.zeros(0)
+        return empty, empty, empty
+    frames = samples[:count * frame_length].reshape(count, frame_length)
+    energy = np.sqrt(np.mean(frames ** 2, axis=1))
+    signs = np.signbit(frames)
+    zcr = np.mean(signs[:, 1:] != signs[:, :-1], axis=1)
+    power = np.abs(np.fft.rfft(frames * np.hanning(frame_length), axis=1)) ** 2 + 1e-10
+    flatness = np.exp(np.mean(np.log(power), axis=1)) / np.mean(power, axis=1)
+    return energy, zcr, flatness
+
+
+class NoiseFloorEstimator:
+    """
+    Running estimate of the background noise level
+
+    The floor follows the median energy of each chunk's non-speech frames,
+    falling quickly when it gets quieter and rising slowly when it gets
+    louder, so a burst of noise barely moves it but a new steady noise is
+    absorbed within a few seconds. The speech threshold is the floor times
+    margin, kept within [min_threshold, max_threshold], unless a fixed
+    override is set.
+
+    Attributes:
+        floor: Estimated noise RMS in 16-bit sample units
+        margin: Threshold as a multiple of the floor
+        override: Fixed threshold replacing the adaptive one, or None
+    """
+
+    def __init__(self, margin: float = 3.0, rise_time: float = 4.0, fall_time: float = 0.5,
+                 min_threshold: float = 80.0, max_threshold: float = 6000.0, initial_floor: float = 100.0):
+        self.floor = initial_floor
+        self.margin = margin
+        self.rise_time = rise_time
+        self.fall_time = fall_time
+        self.min_threshold = min_threshold
+        self.max_threshold = max_threshold
+        self.override: Optional[float] = None
+        self.updates = 0
+
+    @property
+    def threshold(self) -> float:
+        """Energy a frame must exceed to count as speech"""
+        if self.override is not None:
+            return self.override
+        return min(max(self.floor * self.margin, self.min_threshold), self.max_threshold)
+
+    def calibrate(self, threshold: float):
+        """Set the floor from a threshold measured once, e.g. by adjust_for_ambient_noise"""
+        self.floor = threshold / self.margin
+
+    def update(self, energies: np.ndarray, seconds: float):
+        """
+        Move the floor towards the level of some non-speech frames
+
+        Args:
+            energies: RMS of the frames
+            seconds: Audio duration the frames cover
+        """
+        if len(energies) == 0:
+            return
+        level = float(np.median(energies))
+        time_constant = self.rise_time if level > self.floor else self.fall_time
+        self.floor += (1.0 - math.exp(-seconds / time_constant)) * (level - self.floor)
+        self.updates += 1
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Current floor and threshold"""
+        return {
+            'noise_floor': round(self.floor, 1),
+            'energy_threshold': round(self.threshold, 1),
+            'adaptive_threshold': self.override is None
+        }
+
+
+class VoiceActivityDetector:
+    """
+    Frame-based speech detector with hangover smoothing
+
+    is_speech() is for streaming use and keeps its state between chunks;
+    speech_mask() and trim() look at one complete piece of audio on its own.
+
+    Attributes:
+        energy_threshold: RMS in 16-bit sample units a speech frame must exceed
+        max_flatness: Spectral flatness above which a frame counts as noise
+            (white noise is about 0.56, voiced speech well below 0.3)
+        max_zcr: Zero-crossing rate (per sample) above which a frame counts as hiss
+        hangover: Frames that stay speech after the last detected speech frame
+        noise_floor: Optional NoiseFloorEstimator; when set, streaming
+            non-speech audio keeps it updated and its threshold replaces
+            energy_threshold
+        max_speech_seconds: Continuous "speech" longer than this is treated as
+            noise for the estimator, so a steady tonal noise such as a rotor
+            hum cannot hold the threshold below itself forever
+    """
+
+    def __init__(self, sample_rate: int, energy_threshold: float = 300.0, max_flatness: float = 0.35,
+                 max_zcr: float = 0.3, hangover: int = 10, frame_ms: int = FRAME_MS,
+                 noise_floor: Optional[NoiseFloorEstimator] = None, max_speech_seconds: float = 15.0):
+        self.sample_rate = sample_rate
+        self.frame_length = max(int(sample_rate * frame_ms / 1000), 16)
+        self.energy_threshold = energy_threshold
+        self.noise_floor = noise_floor
+        self.max_speech_seconds = max_speech_seconds
+        self._speech_run = 0.0     # Seconds of uninterrupted speech so far
+        self.max_flatness = max_flatness
+        self.max_zcr = max_zcr
+        self.hangover = hangover
+        self._remainder = np.zeros(0, dtype=np.float32)
+        self._previous_raw = False
+        self._gap = hangover + 1   # Frames since the last speech frame
+        self.speaking = False
+        self.stats = {'frames': 0, 'speech_frames': 0}
+
+    @property
+    def threshold(self) -> float:
+        """Energy threshold in effect"""
+        return self.noise_floor.threshold if self.noise_floor else self.energy_threshold
+
+    def _raw_decisions(self, samples: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Per-frame speech decision before smoothing, and the frame energies"""
+        energy, zcr, flatness = frame_features(samples, self.frame_length)
+        return (energy >= self.threshold) & (flatness <= self.max_flatness) & (zcr <= self.max_zcr), energy
+
+    def _smooth(self, raw: np.ndarray, previous_raw: bool, gap: int) -> Tuple[np.ndarray, bool, int]:
+        """
+        Apply onset confirmation and hangover to raw frame decisions
+
+        Returns:
+            Tuple of (smoothed decisions, last raw decision, frames since the
+            last confirmed speech frame) to carry into the next call
+        """
+        if len(raw) == 0:
+            return raw, previous_raw, gap
+        # Speech is only confirmed by two qualifying frames in a row
+        confirmed = raw & np.concatenate(([previous_raw], raw[:-1]))
+        index = np.arange(len(raw))
+        last = np.maximum.accumulate(np.where(confirmed, index, -1 - gap))
+        smoothed = index - last <= self.hangover
+        return smoothed, bool(raw[-1]), int(len(raw) - 1 - last[-1])
+
+    def is_speech(self, pcm: bytes) -> bool:
+        """
+        Feed one chunk of streaming 16-bit PCM
+
+        Returns:
+            bool: Whether speech is active at the end of this chunk
+        """
+        samples = np.concatenate((self._remainder, np.frombuffer(pcm, dtype='<i2').astype(np.float32)))
+        whole = len(samples) - len(samples) % self.frame_length
+        self._remainder = samples[whole:]
+        raw, energy = self._raw_decisions(samples[:whole])
+        smoothed, self._previous_raw, self._gap = self._smooth(raw, self._previous_raw, self._gap)
+        if len(smoothed):
+            self.speaking = bool(smoothed[-1])
+            self.stats['frames'] += len(smoothed)
+            self.stats['speech_frames'] += int(smoothed.sum())
+            if self.noise_floor:
+                self._update_noise_floor(smoothed | raw, energy)
+        return self.speaking
+
+    def _update_noise_floor(self, speech: np.ndarray, energy: np.ndarray):
+        """Feed the chunk's non-speech frames (or all of them, after too long a "speech" run) to the estimator"""
+        frame_seconds = self.frame_length / self.sample_rate
+        self._speech_run = self._speech_run + len(speech) * frame_seconds if speech.all() else 0.0
+        noise = energy if self._speech_run > self.max_speech_seconds else energy[~speech]
+        self.noise_floor.update(noise, len(noise) * frame_seconds)
+
+    def reset(self):
+        """Forget streaming state"""
+        self._remainder = np.zeros(0, dtype=np.float32)
+        self._previous_raw = False
+        self._gap = self.hangover + 1
+        self._speech_run = 0.0
+        self.speaking = False
+
+    def speech_mask(self, pcm: bytes) -> np.ndarray:
+        """Smoothed speech decision for every whole frame of a piece of audio"""
+        samples = np.frombuffer(pcm, dtype='<i2').astype(np.float32)
+        smoothed, _, _ = self._smooth(self._raw_decisions(samples)[0], False, self.hangover + 1)
+        return smoothed
+
+    def segments(self, pcm: bytes) -> List[Tuple[int, int]]:
+        """
+        Find the speech segments in a piece of audio
+
+        Returns:
+            List of (start, end) sample offsets
+        """
+        mask = self.speech_mask(pcm).astype(np.int8)
+        edges = np.diff(np.concatenate(([0], mask, [0])))
+        starts = np.nonzero(edges == 1)[0]
+        ends = np.nonzero(edges == -1)[0]
+        # Confirmation costs the first frame of each segment; give it back
+        return [(max(start - 1, 0) * self.frame_length, end * self.frame_length)
+                for start, end in zip(starts, ends)]
+
+    def trim(self, pcm: bytes, margin: float = 0.1) -> bytes:
+        """
+        Cut leading and trailing non-speech from a piece of audio
+
+        Args:
+            pcm: 16-bit mono PCM
+            margin: Seconds of audio kept on either side of the speech
+
+        Returns:
+            bytes: The trimmed audio, or empty if it contains no speech
+        """
+        found = self.segments(pcm)
+        if not found:
+            return b''
+        pad = int(margin * self.sample_rate)
+        start = max(found[0][0] - pad, 0)
+        end = min(found[-1][1] + pad, len(pcm) // 2)
+        return pcm[start * 2:end * 2]
@@ -4,8 +4,12 @@ Handles voice recognition and processing
 """
 
 import logging
+import queue
 import threading
 import time
+
+import numpy as np
+from typing import Optional
 try:
     import speech_recognition as sr
     import pyaudio
@@ -14,22 +18,89 @@ except ImportError:
     SPEECH_AVAILABLE = False
     print("Warning: speech_recognition or pyaudio not available. Voice input will be disabled.")
 
+from .audio_buffer import AudioRingBuffer, UtteranceSegmenter
+from .batch_transcribe import BatchTranscriber
+from .speech_backends import SpeechBackendError, select_backend
+from .vad import NoiseFloorEstimator, VoiceActivityDetector
+from .wake_word import WakeWordSpotter
+
+# Longest phrase captured in one listening window, in seconds
+PHRASE_TIME_LIMIT = 5
+# Samples read from the microphone at a time
+CAPTURE_CHUNK = 1024
+# Audio the ring buffer holds before unread audio is overwritten, in seconds
+RING_SECONDS = 10
+# Utterances waiting for recognition before the oldest is dropped
+UTTERANCE_QUEUE_SIZE = 8
+# How long a spotted wake word waits for the utterance it belongs to, in seconds
+WAKE_WORD_HOLD = 2.0
+# Barge-in: how much louder than the speaker's echo the microphone must get
+# (2.0 = 6 dB), for how many chunks in a row, and how long after playback
+# starts before the echo level is known well enough to judge
+BARGE_IN_ECHO_RATIO = 2.0
+BARGE_IN_CHUNKS = 2
+BARGE_IN_GRACE = 0.3
+
 class VoiceInput:
     """
     Handles voice recognition and audio input for LYRA 3.0
     """
     
-    def __init__(self):
+    def __init__(self, stt_backend: Optional[str] = None, wake_word_dir: str = 'models/wake_word'):
+        """
+        Initialize voice input
+        
+        Args:
+            stt_backend: Speech-to-text backend name ('vosk', 'whisper' or
+                'google'); by default the first available, offline engines first
+            wake_word_dir: Directory of WAV recordings of the wake word; when
+                it has any, the wake word is spotted in raw audio instead of
+                by transcribing every phrase
+        """
         self.logger = logging.getLogger(__name__)
         self.active = False
         self.listening = False
         self.continuous_listening = False
         self.recognizer = None
         self.microphone = None
-        self.listen_thread = None
+        self.threads = []
+        self.ring = None
+        self.segmenter = None
+        self.vad = None
+        self.utterances = None
+        self.audio_stats = {'utterances': 0, 'dropped_utterances': 0,
+                            'skipped_utterances': 0, 'max_queue_depth': 0,
+                            'grammar_decodes': 0, 'open_vocabulary_retries': 0,
+                            'barge_ins': 0, 'superseded_utterances': 0}
+        self.command_grammar = None
+        self._grammar_words = None
+        # Barge-in: callables telling whether speech output is playing and
+        # interrupting it; see set_barge_in()
+        self._is_playing = None
+        self._interrupt_playback = None
+        self._playback_started = None
+        self._echo_level = 0.0
+        self._loud_chunks = 0
+        self._barge_in_utterance = False
+        # Streaming recognizer of the utterance in progress, if it is decoded live
+        self._live_stream = None
         self.on_speech_callback = None
+        self.on_partial_callback = None
         self.wake_words = ['hi lyra', 'hey lyra', 'lyra', 'hello lyra', 'hi lira', 'hey lira', 'lira']
         self.command_mode = False
+        # Fraction of time spent listening; the rest of each cycle the mic idles
+        self.listen_duty_cycle = 1.0
+        self.backend = select_backend([stt_backend] if stt_backend else None)
+        if self.backend:
+            self.logger.info(f"Speech recognition backend: {self.backend.name}")
+        else:
+            self.logger.warning("No speech recognition backend available")
+        # Background noise level, kept up to date from non-speech audio while listening
+        self.noise_floor = NoiseFloorEstimator()
+        self.wake_word_spotter = WakeWordSpotter()
+        if not self.wake_word_spotter.load_templates(wake_word_dir):
+            self.wake_word_spotter = None
+            self.logger.info("No wake word samples found; spotting wake words in transcripts")
         self._init_speech_recognition()
     
     def _init_speech_recognition(self):
@@ -42,6 +113,7 @@ class VoiceInput:
                 # Adjust for ambient noise
                 with self.microphone as source:
                     self.recognizer.adjust_for_ambient_noise(source)
+                self.noise_floor.calibrate(self.recognizer.energy_threshold)
                     
                 self.logger.info("Speech recognition initialized successfully")
             except Exception as e:
@@ -51,24 +123,193 @@ class VoiceInput:
         else:
             self.logger.warning("Speech recognition not available")
     
+    def apply_profile(self, profile):
+        """
+        Apply the mode's listening duty cycle and speech energy threshold
+        
+        A profile's noise_margin sets how far above the noise floor speech
+        must be; a numeric energy_threshold replaces the adaptive threshold
+        with a fixed one, and None restores adaptation.
+        """
+        duty_cycle = float(profile.get('listen_duty_cycle', self.listen_duty_cycle))
+        if not 0.0 < duty_cycle <= 1.0:
+            raise ValueError(f"Listening duty cycle must be in (0, 1], got {duty_cycle}")
+        margin = float(profile.get('noise_margin', self.noise_floor.margin))
+        if margin < 1.0:
+            raise ValueError(f"Noise margin must be at least 1, got {margin}")
+        override = profile.get('energy_threshold', self.noise_floor.override)
+        if override is not None and float(override) <= 0:
+            raise ValueError(f"Energy threshold must be positive, got {override}")
+        
+        self.listen_duty_cycle = duty_cycle
+        self.noise_floor.margin = margin
+        self.noise_floor.override = float(override) if override is not None else None
+        threshold = f"fixed at {override}" if override is not None else f"{margin}x the noise floor"
+        self.logger.info(f"Listening duty cycle set to {duty_cycle:.0%}, energy threshold {threshold}")
+    
+    def _idle_for_duty_cycle(self, listened):
+        """Pause after a listening window so listening takes up the duty cycle"""
+        duty_cycle = self.listen_duty_cycle
+        if duty_cycle < 1.0 and self.listening:
+            time.sleep(min(listened * (1.0 - duty_cycle) / duty_cycle, 5.0))
+    
     def set_speech_callback(self, callback):
         """Set callback function for when speech is recognized"""
         self.on_speech_callback = callback
     
+    def set_partial_callback(self, callback):
+        """Set callback function for partial hypotheses while the user is still speaking"""
+        self.on_partial_callback = callback
+    
+    def set_barge_in(self, is_playing, interrupt):
+        """
+        Let the user talk over speech output
+        
+        Args:
+            is_playing: Callable returning True while speech output is playing
+            interrupt: Callable taking the monotonic time speech was detected;
+                it should silence the output and drop anything queued
+        
+        While output plays, the microphone hears it too. Speech that rises
+        clearly above that echo interrupts the output, and the utterance it
+        starts is treated as a command, wake word or not.
+        """
+        self._is_playing = is_playing
+        self._interrupt_playback = interrupt
+    
+    def set_command_grammar(self, grammar):
+        """
+        Set the CommandGrammar used to decode command-mode utterances
+        
+        Only backends that support grammars use it; None decodes everything
+        with the open vocabulary.
+        """
+        self.command_grammar = grammar
+        self._grammar_words = grammar.recognizer_grammar() if grammar else None
+        if grammar and self.backend and self.backend.supports_grammar:
+            self.logger.info(f"Commands decode against a {len(grammar.words)}-word grammar")
+    
+    def _handle_partial(self, text):
+        """Forward a partial hypothesis to the partial callback"""
+        if self.on_partial_callback:
+            try:
+                self.on_partial_callback(text)
+            except Exception as e:
+                self.logger.error(f"Partial transcript callback error: {e}")
+    
+    def _wants_live_stream(self, spotted):
+        """
+        Whether the utterance in progress should be recognized as it is spoken
+        
+        Only streaming backends gain from it, and utterances the wake word
+        spotter would have skipped are not decoded at all.
+        """
+        if not self.backend or not self.backend.streaming:
+            return False
+        return not (self.wake_word_spotter and self.continuous_listening and not self.command_mode
+                    and not spotted and not self._barge_in_utterance)
+    
+    def _open_live_stream(self):
+        """Start a streaming recognizer on the utterance in progress, fed the audio so far"""
+        try:
+            self._live_stream = self.backend.open_stream(self.segmenter.sample_rate, self._handle_partial)
+            self._live_stream.feed(self.segmenter.current_audio)
+        except Exception as e:
+            # The utterance is still transcribed once it is complete
+            self.logger.error(f"Could not start live recognition: {e}")
+            self._live_stream = None
+    
+    def _feed_live_stream(self, pcm):
+        """Feed one chunk of the utterance in progress to its streaming recognizer"""
+        if self._live_stream is None:
+            return
+        try:
+            self._live_stream.feed(pcm)
+        except Exception as e:
+            self.logger.error(f"Live recognition error: {e}")
+            self._live_stream = None
+    
+    def _finish_live_stream(self):
+        """
+        Finalize the streaming recognizer of the utterance that just ended
+        
+        Returns:
+            The transcript, or None if the utterance was not decoded live
+        """
+        stream, self._live_stream = self._live_stream, None
+        if stream is None:
+            return None
+        try:
+            return stream.finish()
+        except Exception as e:
+            self.logger.error(f"Live recognition error: {e}")
+            return None
+    
+    def _decode(self, pcm, sample_rate, grammar=None):
+        """Run the backend over one complete utterance"""
+        if grammar:
+            return self.backend.transcribe(pcm, sample_rate, grammar)
+        return self.backend.transcribe(pcm, sample_rate)
+    
+    def _transcribe_utterance(self, pcm, sample_rate, command=False, streamed=None):
+        """
+        Transcribe one segmented utterance
+        
+        A command utterance is decoded against the command grammar when the
+        backend supports one. If that transcript looks like a knowledge
+        question or mostly fell outside the grammar, the open-vocabulary
+        transcript is used instead. That is the one the live recognizer
+        already produced while the utterance was spoken (streamed), if any;
+        otherwise the utterance is decoded again.
+        """
+        if command and self._grammar_words and self.backend.supports_grammar:
+            text = self._decode(pcm, sample_rate, self._grammar_words)
+            if not self.command_grammar.needs_open_vocabulary(text):
+                self.audio_stats['grammar_decodes'] += 1
+                return self.command_grammar.clean(text)
+            self.audio_stats['open_vocabulary_retries'] += 1
+        if streamed is not None:
+            return streamed
+        return self._decode(pcm, sample_rate)
+    
     def start_listening(self):
-        """Start voice recognition and processing"""
-        if not SPEECH_AVAILABLE or not self.recognizer:
+        """
+        Start voice recognition and processing
+        
+        Three threads share the work so that nothing said is lost while a
+        phrase is being transcribed: the capture thread only copies microphone
+        audio into a ring buffer, the segmenter cuts the buffered audio into
+        utterances (and runs the wake word spotter), and the recognition
+        worker transcribes the utterances from a bounded queue.
+        """
+        if not SPEECH_AVAILABLE or not self.recognizer or not self.backend:
             self.logger.warning("Speech recognition not available")
             return
-            
+        if self.is_listening():
+            return
+        
+        sample_rate = self.microphone.SAMPLE_RATE
+        self.ring = AudioRingBuffer(int(RING_SECONDS * sample_rate))
+        # Only real speech is segmented and sent on, trimmed of silence
+        self.vad = VoiceActivityDetector(sample_rate, noise_floor=self.noise_floor)
+        self.segmenter = UtteranceSegmenter(sample_rate,
+                                            pause=self.recognizer.pause_threshold,
+                                            max_seconds=PHRASE_TIME_LIMIT,
+                                            vad=self.vad)
+        self.utterances = queue.Queue(maxsize=UTTERANCE_QUEUE_SIZE)
+        
         self.active = True
         self.listening = True
         self.logger.info("Voice recognition started")
         
-        # Start listening in a separate thread
-        self.listen_thread = threading.Thread(target=self._listen_continuously)
-        self.listen_thread.daemon = True
-        self.listen_thread.start()
+        self.threads = []
+        for target, name in ((self._capture_loop, 'voice-capture'),
+                             (self._segment_loop, 'voice-segmenter'),
+                             (self._recognition_worker, 'voice-recognition')):
+            thread = threading.Thread(target=target, name=name)
+            thread.daemon = True
+            thread.start()
+            self.threads.append(thread)
         
     def stop_listening(self):
         """Stop voice recognition"""
@@ -76,61 +317,272 @@ class VoiceInput:
         self.listening = False
         self.logger.info("Voice recognition stopped")
         
-        if self.listen_thread and self.listen_thread.is_alive():
-            self.listen_thread.join(timeout=2)
+        for thread in self.threads:
+            if thread.is_alive():
+                thread.join(timeout=2)
+        self.threads = []
     
-    def _listen_continuously(self):
-        """Continuously listen for speech with wake word detection"""
+    def _capture_loop(self):
+        """
+        Copy microphone audio into the ring buffer
+        
+        This thread never waits on recognition, so the microphone is read
+        at its own pace. Below a full listening duty cycle the microphone is
+        closed between listening windows, but never in the middle of an
+        utterance or while a wake word is waiting for its command.
+        """
         while self.listening and self.active:
+            window_started = time.monotonic()
             try:
                 with self.microphone as source:
-                    # Listen for audio with timeout
-                    audio = self.recognizer.listen(source, timeout=1, phrase_time_limit=5)
-                
-                # Try to recognize speech
+                    while self.listening and self.active:
+                        self.ring.write(source.stream.read(CAPTURE_CHUNK))
+                        if (self.listen_duty_cycle < 1.0 and not self.command_mode
+                                and not self.segmenter.in_utterance
+                                and time.monotonic() - window_started >= PHRASE_TIME_LIMIT):
+                            break
+            except Exception as e:
+                self.logger.error(f"Audio capture error: {e}")
+                time.sleep(1)
+                continue
+            
+            if not self.command_mode:
+                self._idle_for_duty_cycle(time.monotonic() - window_started)
+    
+    def _segment_loop(self):
+        """
+        Cut buffered audio into utterances and queue them for recognition
+        
+        The wake word spotter sees every chunk; an utterance is marked as
+        spotted when the wake word was heard during it or shortly before.
+        With a streaming backend, each chunk of an utterance that will be
+        recognized is also fed to a live recognizer, so partial hypotheses
+        arrive while the user is still speaking and the transcript is ready
+        as soon as the utterance ends.
+        """
+        sample_rate = self.segmenter.sample_rate
+        spotted_at = None
+        while self.listening and self.active:
+            pcm = self.ring.read(max_samples=CAPTURE_CHUNK, timeout=0.5)
+            if not pcm:
+                continue
+            now = time.monotonic()
+            if (self.wake_word_spotter and self.continuous_listening and not self.command_mode
+                    and self.wake_word_spotter.process(pcm, sample_rate)):
+                spotted_at = now
+            
+            utterances = self.segmenter.process(pcm)
+            self._feed_live_stream(pcm)
+            for utterance in utterances:
+                self._enqueue_utterance(utterance, spotted_at is not None, self._barge_in_utterance,
+                                        self._finish_live_stream())
+                spotted_at = None
+                self._barge_in_utterance = False
+            if not self.segmenter.in_utterance:
+                # An utterance that ended too short or was trimmed to nothing
+                # is dropped with its live recognizer, and a later utterance
+                # must not inherit its barge-in command status
+                self._live_stream = None
+                self._barge_in_utterance = False
+            elif self._live_stream is None and self._wants_live_stream(spotted_at is not None):
+                self._open_live_stream()
+            if (spotted_at is not None and not self.segmenter.in_utterance
+                    and now - spotted_at > WAKE_WORD_HOLD):
+                spotted_at = None
+            
+            self._check_barge_in(pcm, now)
+    
+    def _check_barge_in(self, pcm, now):
+        """Interrupt speech output if the user just started talking over it"""
+        if not self._detect_barge_in(pcm, now):
+            return False
+        # The utterance so far is the speaker's echo; the user's starts here
+        self.segmenter.restart()
+        self._barge_in_utterance = True
+        # The next chunk starts a live recognizer on the restarted utterance
+        self._live_stream = None
+        self.audio_stats['barge_ins'] += 1
+        self.logger.info("Barge-in: user spoke over speech output")
+        # Waiting for the output to go quiet must not hold up segmentation
+        threading.Thread(target=self._interrupt_playback, args=(now,), daemon=True).start()
+        return True
+    
+    def _detect_barge_in(self, pcm, now):
+        """
+        Check whether the user started talking over speech output
+        
+        While output plays, the chunk level is tracked as the echo level.
+        Speech that stays BARGE_IN_ECHO_RATIO above it for BARGE_IN_CHUNKS
+        chunks is a barge-in; the first BARGE_IN_GRACE seconds of playback
+        only measure the echo.
+        """
+        if not self._is_playing or not self._is_playing() or self._barge_in_utterance:
+            self._playback_started = None
+            self._loud_chunks = 0
+            return False
+        level = float(np.sqrt(np.mean(np.frombuffer(pcm, dtype='<i2').astype(np.float32) ** 2)))
+        if self._playback_started is None:
+            self._playback_started = now
+            self._echo_level = level
+            return False
+        
+        if (now - self._playback_started >= BARGE_IN_GRACE and self.segmenter.in_utterance
+                and level >= max(self._echo_level, 1.0) * BARGE_IN_ECHO_RATIO):
+            self._loud_chunks += 1
+            if self._loud_chunks >= BARGE_IN_CHUNKS:
+                self._loud_chunks = 0
+                return True
+        else:
+            self._loud_chunks = 0
+            self._echo_level += 0.2 * (level - self._echo_level)
+        return False
+    
+    def _enqueue_utterance(self, pcm, spotted, barge_in=False, streamed=None):
+        """
+        Queue an utterance for recognition, dropping the oldest if the worker is far behind
+        
+        A barge-in utterance goes to the front: whatever was still waiting
+        was captured while speech output played and is superseded by it.
+        streamed is the live recognizer's transcript, if it had one.
+        """
+        if barge_in:
+            while True:
                 try:
-                    text = self.recognizer.recognize_google(audio)
-                    self.logger.info(f"Recognized speech: {text}")
-                    
-                    # Check for wake words or if already in command mode
-                    if self._contains_wake_word(text.lower()):
-                        self.logger.info(f"Wake word detected in: {text}")
-                        self.command_mode = True
-                        # Remove wake word from command
-                        command = self._remove_wake_words(text.lower()).strip()
-                        if command:  # If there's a command after wake word
-                            self.logger.info(f"Processing command: {command}")
-                            if self.on_speech_callback:
-                                self.on_speech_callback(command)
-                        else:
-                            # Just wake word, send greeting
-                            self.logger.info("Wake word detected, sending greeting")
-                            if self.on_speech_callback:
-                                self.on_speech_callback("wake_word_greeting")
-                    elif self.command_mode:
-                        # Already in command mode, process the command
-                        self.logger.info(f"Command mode active, processing: {text}")
-                        if self.on_speech_callback:
-                            self.on_speech_callback(text)
-                        # Exit command mode after processing
-                        self.command_mode = False
-                    elif not self.continuous_listening:
-                        # If not in continuous mode, process all speech
-                        if self.on_speech_callback:
-                            self.on_speech_callback(text)
-                    
-                except sr.UnknownValueError:
-                    # Speech was unintelligible
+                    self.utterances.get_nowait()
+                    self.audio_stats['superseded_utterances'] += 1
+                except queue.Empty:
+                    break
+        while True:
+            try:
+                self.utterances.put_nowait((pcm, spotted, barge_in, streamed))
+                break
+            except queue.Full:
+                try:
+                    self.utterances.get_nowait()
+                    self.audio_stats['dropped_utterances'] += 1
+                    self.logger.warning("Recognition is falling behind, dropped the oldest utterance")
+                except queue.Empty:
                     pass
-                except sr.RequestError as e:
-                    self.logger.error(f"Speech recognition error: {e}")
-                    
-            except sr.WaitTimeoutError:
-                # No speech detected, continue listening
-                pass
+        self.audio_stats['utterances'] += 1
+        self.audio_stats['max_queue_depth'] = max(self.audio_stats['max_queue_depth'],
+                                                  self.utterances.qsize())
+    
+    def _recognition_worker(self):
+        """Transcribe queued utterances one at a time, in the order they were spoken"""
+        sample_rate = self.segmenter.sample_rate
+        while self.listening and self.active:
+            try:
+                pcm, spotted, barge_in, streamed = self.utterances.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            
+            if (self.wake_word_spotter and self.continuous_listening and not self.command_mode
+                    and not spotted and not barge_in):
+                # Full recognition only runs for utterances with the wake word
+                self.audio_stats['skipped_utterances'] += 1
+                continue
+            
+            try:
+                command = spotted or barge_in or self.command_mode
+                text = self._transcribe_utterance(pcm, sample_rate, command=command, streamed=streamed)
+                self._handle_transcript(text, spotted, barge_in)
+            except SpeechBackendError as e:
+                self.logger.error(f"Speech recognition error: {e}")
             except Exception as e:
-                self.logger.error(f"Listening error: {e}")
-                time.sleep(1)
+                self.logger.error(f"Recognition error: {e}")
+    
+    def _handle_transcript(self, text, spotted, barge_in=False):
+        """
+        Act on the transcript of one utterance
+        
+        Args:
+            text: Recognized text, possibly empty
+            spotted: Whether the wake word spotter heard the wake word in it
+            barge_in: Whether it interrupted speech output; it is then a
+                command even without the wake word
+        """
+        if barge_in and not spotted:
+            command = self._remove_wake_words(text.lower()).strip()
+            if command:
+                self.logger.info(f"Processing barge-in command: {command}")
+                self.command_mode = False
+                if self.on_speech_callback:
+                    self.on_speech_callback(command)
+        elif spotted:
+            command = self._remove_wake_words(text.lower()).strip()
+            if command:
+                self.logger.info(f"Processing command: {command}")
+                if self.on_speech_callback:
+                    self.on_speech_callback(command)
+            else:
+                # Wake word alone; the next phrase is the command
+                self.logger.info("Wake word detected, sending greeting")
+                self.command_mode = True
+                if self.on_speech_callback:
+                    self.on_speech_callback("wake_word_greeting")
+        elif text:
+            self.logger.info(f"Recognized speech: {text}")
+            
+            # Check for wake words or if already in command mode
+            if self._contains_wake_word(text.lower()):
+                self.logger.info(f"Wake word detected in: {text}")
+                self.command_mode = True
+                # Remove wake word from command
+                command = self._remove_wake_words(text.lower()).strip()
+                if command:  # If there's a command after wake word
+                    self.logger.info(f"Processing command: {command}")
+                    if self.on_speech_callback:
+                        self.on_speech_callback(command)
+                else:
+                    # Just wake word, send greeting
+                    self.logger.info("Wake word detected, sending greeting")
+                    if self.on_speech_callback:
+                        self.on_speech_callback("wake_word_greeting")
+            elif self.command_mode:
+                # Already in command mode, process the command
+                self.logger.info(f"Command mode active, processing: {text}")
+                if self.on_speech_callback:
+                    self.on_speech_callback(text)
+                # Exit command mode after processing
+                self.command_mode = False
+            elif not self.continuous_listening:
+                # If not in continuous mode, process all speech
+                if self.on_speech_callback:
+                    self.on_speech_callback(text)
+    
+    def get_noise_metrics(self):
+        """
+        Get the background noise floor and the speech energy threshold
+        
+        Returns:
+            Dict with noise_floor and energy_threshold (RMS in 16-bit sample
+            units) and whether the threshold is adaptive or fixed by the mode
+        """
+        return self.noise_floor.get_metrics()
+    
+    def get_audio_stats(self):
+        """
+        Get capture and recognition pipeline counters
+        
+        Returns:
+            Dict with ring buffer overruns and dropped audio, the recognition
+            queue depth, how many utterances were queued, dropped or skipped,
+            the share of audio the VAD judged to be speech, how much silence
+            it trimmed from utterances, and the noise floor and threshold
+        """
+        stats = dict(self.audio_stats)
+        stats.update(self.noise_floor.get_metrics())
+        stats['queue_depth'] = self.utterances.qsize() if self.utterances else 0
+        if self.ring:
+            stats['overruns'] = self.ring.overruns
+            stats['dropped_samples'] = self.ring.dropped_samples
+            stats['dropped_seconds'] = round(self.ring.dropped_samples / self.segmenter.sample_rate, 2)
+            stats['buffered_samples'] = self.ring.pending
+        if self.vad:
+            frames = self.vad.stats['frames']
+            stats['speech_ratio'] = round(self.vad.stats['speech_frames'] / frames, 3) if frames else 0.0
+            stats['trimmed_seconds'] = round(self.segmenter.trimmed_samples / self.segmenter.sample_rate, 2)
+        return stats
     
     def _contains_wake_word(self, text):
         """Check if text contains wake words"""
@@ -161,21 +613,37 @@ class VoiceInput:
             self.logger.warning("Voice recognition is not active")
             return ''
         
-        if not SPEECH_AVAILABLE or not self.recognizer:
+        if not SPEECH_AVAILABLE or not self.backend:
             return ''
             
         try:
-            # Convert audio data to text using Google Speech Recognition
-            text = self.recognizer.recognize_google(audio_data)
+            # Convert audio data to text using the configured backend
+            text = self.backend.transcribe(audio_data.get_raw_data(convert_width=2), audio_data.sample_rate)
             self.logger.debug(f"Processed audio data to text: {text}")
             return text
-        except sr.UnknownValueError:
-            self.logger.debug("Could not understand audio")
-            return ''
-        except sr.RequestError as e:
+        except SpeechBackendError as e:
             self.logger.error(f"Speech recognition service error: {e}")
             return ''
     
+    def transcribe_files(self, source, output, workers=None):
+        """
+        Transcribe recorded WAV files with this input's backend
+        
+        Unlike process_audio_data this works whether or not listening is
+        active, and runs the files on a process pool.
+        
+        Args:
+            source: Directory of WAV files or list of paths
+            output: Text stream receiving one JSON line per file and a summary
+            workers: Worker processes, by default one per CPU core
+        
+        Returns:
+            Dict: Summary with throughput and real-time factor, or an error dict
+        """
+        if not self.backend:
+            return {'status': 'error', 'message': 'No speech recognition backend available'}
+        return BatchTranscriber(self.backend.name, workers).run(source, output)
+    
     def is_listening(self):
         """Check if currently listening"""
         return self.listening and self.active
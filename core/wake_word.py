@@ -0,0 +1,253 @@
+"""
+LYRA 3.0 Wake Word Spotter
+Detects "LYRA" directly in raw microphone audio
+
+Finding the wake word by transcribing every phrase means every background
+conversation costs a full speech-to-text call. This spotter runs on raw audio
+frames instead and only lets full recognition run once the wake word is heard:
+- NumPy MFCC front-end (pre-emphasis, Hamming window, mel filterbank, DCT)
+- Template matching against a few enrolled recordings of the wake word with
+  a vectorized subsequence dynamic time warping (DTW)
+- An energy gate, so silence costs almost nothing
+- A detection threshold calibrated from the enrolled samples: between how far
+  apart they are from each other and how far they are from reversed copies
+"""
+
+import glob
+import logging
+import os
+import wave
+from typing import Optional
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+FRAME_LENGTH = 400       # 25 ms analysis frames at 16 kHz
+FRAME_STEP = 160         # 10 ms hop
+FFT_SIZE = 512
+MEL_BANDS = 26
+MFCC_COEFFICIENTS = 13
+
+
+def _mel_filterbank(sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """Triangular mel filters as a (MEL_BANDS, FFT_SIZE // 2 + 1) matrix"""
+    def to_mel(hz):
+        return 2595.0 * np.log10(1.0 + hz / 700.0)
+
+    def to_hz(mel):
+        return 700.0 * (10 ** (mel / 2595.0) - 1.0)
+
+    mel_points = np.linspace(to_mel(0), to_mel(sample_rate / 2), MEL_BANDS + 2)
+    bins = np.floor((FFT_SIZE + 1) * to_hz(mel_points) / sample_rate).astype(int)
+    filters = np.zeros((MEL_BANDS, FFT_SIZE // 2 + 1))
+    for band in range(1, MEL_BANDS + 1):
+        left, center, right = bins[band - 1], bins[band], bins[band + 1]
+        if center > left:
+            filters[band - 1, left:center] = (np.arange(left, center) - left) / (center - left)
+        if right > center:
+            filters[band - 1, center:right] = (right - np.arange(center, right)) / (right - center)
+    return filters
+
+
+def _dct_matrix() -> np.ndarray:
+    """Orthonormal DCT-II basis keeping the first MFCC_COEFFICIENTS rows"""
+    n = np.arange(MEL_BANDS)
+    basis = np.cos(np.pi / MEL_BANDS * (n + 0.5)[None, :] * np.arange(MFCC_COEFFICIENTS)[:, None])
+    basis *= np.sqrt(2.0 / MEL_BANDS)
+    basis[0] /= np.sqrt(2.0)
+    return basis
+
+
+_MEL_FILTERS = _mel_filterbank()
+_DCT = _dct_matrix()
+_WINDOW = np.hamming(FRAME_LENGTH)
+
+
+def mfcc(audio: np.ndarray) -> np.ndarray:
+    """
+    Compute MFCC features of 16 kHz float audio
+
+    Log mel energies are floored 35 dB below the loudest one so background
+    noise in quiet bands does not dominate the distance.
+    
+    Returns:
+        Array of shape (frames, MFCC_COEFFICIENTS), normalized to zero mean and
+        unit variance per coefficient so loudness and channel differences
+        between the microphone and the enrolled samples cancel out
+    """
+    if len(audio) < FRAME_LENGTH:
+        return np.zeros((0, MFCC_COEFFICIENTS))
+    emphasized = np.append(audio[0], audio[1:] - 0.97 * audio[:-1])
+    frame_count = 1 + (len(emphasized) - FRAME_LENGTH) // FRAME_STEP
+    indices = np.arange(FRAME_LENGTH)[None, :] + FRAME_STEP * np.arange(frame_count)[:, None]
+    frames = emphasized[indices] * _WINDOW
+    power = np.abs(np.fft.rfft(frames, FFT_SIZE)) ** 2 / FFT_SIZE
+    energies = np.log(power @ _MEL_FILTERS.T + 1e-10)
+    energies = np.maximum(energies, energies.max() - 8.0)
+    features = energies @ _DCT.T
+    return (features - features.mean(axis=0)) / (features.std(axis=0) + 1e-8)
+
+
+def dtw_distance(template: np.ndarray, features: np.ndarray) -> float:
+    """
+    Best match of a template anywhere inside a longer feature sequence
+
+    Subsequence DTW with steps that advance the template by one frame and the
+    input by zero, one or two, which allows half to double speed. Every step
+    consumes one template frame, so each row of the cost table is one
+    vectorized update and the result is normalized by the template length.
+    """
+    if len(features) == 0 or len(template) == 0:
+        return float('inf')
+    # Frame-to-frame Euclidean distances, shape (template frames, input frames)
+    cost = np.sqrt(((template[:, None, :] - features[None, :, :]) ** 2).sum(axis=2))
+    cost /= np.sqrt(template.shape[1])
+    total = cost[0].copy()  # The match may start at any input frame
+    for row in cost[1:]:
+        stay = total
+        one = np.concatenate(([np.inf], total[:-1]))
+        two = np.concatenate(([np.inf, np.inf], total[:-2]))
+        total = row + np.minimum(np.minimum(stay, one), two)
+    return float(total.min() / len(template))
+
+
+def pcm_to_audio(pcm: bytes, sample_rate: int) -> np.ndarray:
+    """Convert 16-bit mono PCM to 16 kHz float audio"""
+    audio = np.frombuffer(pcm, dtype='<i2').astype(np.float32) / 32768.0
+    if sample_rate != SAMPLE_RATE and len(audio):
+        target = np.arange(int(len(audio) * SAMPLE_RATE / sample_rate)) * sample_rate / SAMPLE_RATE
+        audio = np.interp(target, np.arange(len(audio)), audio).astype(np.float32)
+    return audio
+
+
+class WakeWordSpotter:
+    """
+    Streaming keyword spotter driven by enrolled wake word recordings
+
+    Feed microphone chunks to process(); it returns True once when the wake
+    word has just been spoken. Detection is only attempted every check_interval
+    seconds of audio and only when the recent audio is louder than min_rms.
+
+    Attributes:
+        threshold: DTW distance below which a match counts as a detection
+        min_rms: RMS level (of full scale 1.0) below which audio is treated as silence
+    """
+
+    def __init__(self, threshold: Optional[float] = None, min_rms: float = 0.01,
+                 check_interval: float = 0.1, refractory: float = 1.5):
+        """Initialize a spotter without templates"""
+        self.logger = logging.getLogger(__name__)
+        self.templates = []
+        self.fixed_threshold = threshold
+        self.threshold = threshold if threshold is not None else 0.4
+        self.min_rms = min_rms
+        self.check_interval = check_interval
+        self.refractory = refractory
+        self._buffer = np.zeros(0, dtype=np.float32)
+        self._since_check = 0
+        self._cooldown = 0
+        self.stats = {'checks': 0, 'gated': 0, 'detections': 0}
+
+    @property
+    def ready(self) -> bool:
+        """Whether at least one template is enrolled"""
+        return bool(self.templates)
+
+    def enroll(self, pcm: bytes, sample_rate: int = SAMPLE_RATE):
+        """Add one recording of the wake word as a template"""
+        audio = self._trim_silence(pcm_to_audio(pcm, sample_rate))
+        features = mfcc(audio)
+        if len(features) < 10:
+            raise ValueError("Wake word sample is too short or silent")
+        self.templates.append(features)
+        self._calibrate()
+
+    def load_templates(self, directory: str = 'models/wake_word') -> int:
+        """Enroll every 16-bit mono WAV recording in a directory"""
+        loaded = 0
+        for path in sorted(glob.glob(os.path.join(directory, '*.wav'))):
+            try:
+                with wave.open(path, 'rb') as wav:
+                    if wav.getsampwidth() != 2 or wav.getnchannels() != 1:
+                        raise ValueError("expected 16-bit mono audio")
+                    self.enroll(wav.readframes(wav.getnframes()), wav.getframerate())
+                    loaded += 1
+            except Exception as e:
+                self.logger.warning(f"Skipping wake word sample {path}: {e}")
+        if loaded:
+            self.logger.info(f"Loaded {loaded} wake word templates, threshold {self.threshold:.2f}")
+        return loaded
+
+    def _trim_silence(self, audio: np.ndarray) -> np.ndarray:
+        """Cut leading and trailing 10 ms blocks quieter than the energy gate"""
+        blocks = len(audio) // FRAME_STEP
+        if blocks == 0:
+            return audio
+        rms = np.sqrt((audio[:blocks * FRAME_STEP].reshape(blocks, FRAME_STEP) ** 2).mean(axis=1))
+        voiced = np.nonzero(rms >= self.min_rms)[0]
+        if len(voiced) == 0:
+            return audio[:0]
+        return audio[voiced[0] * FRAME_STEP:(voiced[-1] + 1) * FRAME_STEP]
+
+    def _calibrate(self):
+        """
+        Set the threshold from the enrolled samples
+        
+        Genuine distances are between different recordings of the wake word;
+        impostor distances are against time-reversed recordings, which share
+        the voice and spectrum but not the word. The threshold sits 40% of the
+        way from the worst genuine match to the best impostor match, leaving
+        room for the extra variation of live audio.
+        """
+        if self.fixed_threshold is not None:
+            return
+        genuine = max((dtw_distance(a, b) for a in self.templates for b in self.templates
+                       if a is not b), default=0.0)
+        impostor = min(dtw_distance(a, b[::-1]) for a in self.templates for b in self.templates)
+        self.threshold = genuine + 0.4 * max(impostor - genuine, 0.0)
+
+    def _window_samples(self) -> int:
+        """Audio kept for matching: the longest template plus half again"""
+        longest = max(len(template) for template in self.templates)
+        return int(longest * FRAME_STEP * 1.5) + FRAME_LENGTH
+
+    def reset(self):
+        """Forget buffered audio, e.g. after recognition used the microphone"""
+        self._buffer = np.zeros(0, dtype=np.float32)
+        self._since_check = 0
+
+    def process(self, pcm: bytes, sample_rate: int = SAMPLE_RATE) -> bool:
+        """
+        Feed one chunk of microphone audio
+
+        Returns:
+            bool: True if the wake word ends in or just before this chunk
+        """
+        if not self.templates:
+            return False
+        audio = pcm_to_audio(pcm, sample_rate)
+        self._buffer = np.concatenate((self._buffer, audio))[-self._window_samples():]
+        self._since_check += len(audio)
+        if self._cooldown > 0:
+            self._cooldown -= len(audio)
+            return False
+        if self._since_check < self.check_interval * SAMPLE_RATE:
+            return False
+        self._since_check = 0
+
+        # Only run the matcher when someone is actually speaking
+        recent = self._buffer[-SAMPLE_RATE // 2:]
+        if np.sqrt(np.mean(recent ** 2)) < self.min_rms:
+            self.stats['gated'] += 1
+            return False
+
+        self.stats['checks'] += 1
+        features = mfcc(self._buffer)
+        distance = min(dtw_distance(template, features) for template in self.templates)
+        if distance <= self.threshold:
+            self.stats['detections'] += 1
+            self.logger.info(f"Wake word spotted (distance {distance:.2f})")
+            self._cooldown = int(self.refractory * SAMPLE_RATE)
+            self.reset()
+            return True
+        return False
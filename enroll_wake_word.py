@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Record wake word samples for LYRA's on-device wake word spotter
+
+Say "LYRA" once per prompt. The recordings are saved as 16 kHz mono WAV files
+in models/wake_word, where VoiceInput loads them as spotter templates.
+"""
+
+import argparse
+import os
+import sys
+import wave
+
+# Add core modules to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'core'))
+
+import speech_recognition as sr
+
+from core.wake_word import SAMPLE_RATE, WakeWordSpotter
+
+def main():
+    parser = argparse.ArgumentParser(description='Record wake word samples for LYRA')
+    parser.add_argument('--samples', type=int, default=5, help='Number of recordings to make')
+    parser.add_argument('--output', default='models/wake_word', help='Directory for the WAV files')
+    args = parser.parse_args()
+
+    os.makedirs(args.output, exist_ok=True)
+    recognizer = sr.Recognizer()
+    spotter = WakeWordSpotter()
+
+    with sr.Microphone(sample_rate=SAMPLE_RATE) as source:
+        print("🔧 Measuring background noise, stay quiet...")
+        recognizer.adjust_for_ambient_noise(source)
+        for index in range(args.samples):
+            input(f"🎤 Sample {index + 1}/{args.samples}: press Enter, then say 'LYRA'")
+            audio = recognizer.listen(source, timeout=5, phrase_time_limit=2)
+            pcm = audio.get_raw_data(convert_rate=SAMPLE_RATE, convert_width=2)
+            try:
+                spotter.enroll(pcm)
+            except ValueError as e:
+                print(f"   ❌ {e}, skipped")
+                continue
+            path = os.path.join(args.output, f'lyra_{index + 1:02d}.wav')
+            with wave.open(path, 'wb') as wav:
+                wav.setnchannels(1)
+                wav.setsampwidth(2)
+                wav.setframerate(SAMPLE_RATE)
+                wav.writeframes(pcm)
+            print(f"   ✅ Saved {path}")
+
+    print(f"📊 {len(spotter.templates)} templates, detection threshold {spotter.threshold:.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,25 @@ document.addEventListener('DOMContentLoaded', (event) => {
         handleResponse(data);
     });
 
+    // Pushed context changes (only the fields that changed)
+    socket.on('context_update', (event) => {
+        handleContextUpdate(event);
+    });
+
+    // Context summary and session totals, sent as pre-serialized JSON bytes
+    socket.on('session_info', (payload) => {
+        const info = JSON.parse(new TextDecoder().decode(payload));
+        console.log('Session info:', info);
+    });
+
+    // What the recognizer has heard so far while the user is speaking
+    socket.on('partial_transcript', (data) => {
+        document.getElementById('voice-status').textContent = `Hearing: ${data.text}`;
+    });
+
+    // Latest host status, kept current by pushed deltas
+    const systemStatus = {};
+
     // Test WebSocket connection
     socket.emit('test', { msg: 'Ping from main.js' });
     socket.on('test_reply', (data) => {
@@ -226,7 +245,8 @@ document.addEventListener('DOMContentLoaded', (event) => {
         } else if (data.type === 'command_result') {
             showCommandResponse(data.data);
         } else if (data.type === 'system_status') {
-            updateSystemStatus(data.data);
+            Object.assign(systemStatus, data.data);
+            updateSystemStatus(systemStatus);
         } else if (data.type === 'trinetra_response') {
             handleTrinetraResponse(data.data);
         } else if (data.type === 'krait3_response') {
@@ -236,6 +256,23 @@ document.addEventListener('DOMContentLoaded', (event) => {
         }
     }
 
+    // Apply a context change event pushed by the backend
+    function handleContextUpdate(event) {
+        const data = event.data;
+        if (event.type === 'system_state_changed' && data.component === 'host') {
+            Object.assign(systemStatus, data.changes);
+            updateSystemStatus(systemStatus);
+        } else if (event.type === 'mode_changed') {
+            switchMode(data.mode);
+        } else if (event.type === 'device_state_changed') {
+            if ('connected' in data.changes) {
+                updateDeviceStatus(data.device, data.changes.connected);
+            }
+        } else if (event.type === 'conversation_entry_added' && data.entry.source === 'voice') {
+            addLogEntry('VOICE', data.entry.command);
+        }
+    }
+
     // Update voice recognition status
     function updateVoiceStatus(status) {
         const voiceStatus = document.getElementById('voice-status');
@@ -364,14 +401,10 @@ document.addEventListener('DOMContentLoaded', (event) => {
         addLogEntry('SYSTEM', 'Logs exported successfully');
     }
 
-    // Request system status on load
+    // Request a full system status once on load; after that the backend
+    // pushes changes as context_update events, so there is no polling
     setTimeout(() => {
         socket.emit('command', { type: 'system_status' });
         addLogEntry('SYSTEM', 'LYRA 3.0 system initialized');
     }, 1000);
-
-    // Periodic status updates
-    setInterval(() => {
-        socket.emit('command', { type: 'system_status' });
-    }, 30000); // Every 30 seconds
 });
@@ -491,7 +491,7 @@ class LyraPi5App:
     def control_krait3(self, action):
         """Control KRAIT-3 UAV"""
         self.status_display.append(f"🚁 KRAIT-3: {action}")
-        self.tts_output.speak(f"KRAIT-3 {action}")
+        self.tts_output.speak(f"KRAIT-3 {action}", 'critical' if action == 'emergency_land' else 'normal')
     
     def capture_image(self):
         """Capture image from camera"""
@@ -10,7 +10,7 @@ import logging
 import asyncio
 import signal
 import platform
-from flask import Flask, render_template, send_from_directory
+from flask import Flask, render_template, send_from_directory, request
 from flask_socketio import SocketIO, emit
 import threading
 import json
@@ -23,7 +23,13 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'system'))
 from core.decision_engine import DecisionEngine
 from core.context_manager import ContextManager
 from core.voice_input import VoiceInput
+from core.command_grammar import build_command_grammar
 from core.tts_output import TTSOutput
+from core.tts_process import TTSProcess
+from core.session_registry import SessionRegistry
+from core.mode_manager import ModeManager
+from core.thermal_scheduler import ThermalScheduler
+from core.telemetry import get_sampler
 
 # Pi5-specific imports
 try:
@@ -86,10 +92,27 @@ socketio = SocketIO(
 # Global LYRA components
 lyra_engine = None
 context_mgr = None
+session_registry = None
+mode_manager = None
+thermal_scheduler = None
 voice_input = None
 tts_output = None
 pi5_hardware = None
 shutdown_event = threading.Event()
+# Keeps ModeManager and the context in the same order when modes change concurrently
+mode_change_lock = threading.Lock()
+
+# Seconds between host status samples; clients only receive changed fields.
+# The active mode's runtime profile replaces the default
+STATUS_PUSH_INTERVAL = 5
+status_interval = STATUS_PUSH_INTERVAL
+
+# Synthesize and play speech in a worker process instead of a server thread,
+# so talking never stalls the SocketIO handlers
+TTS_WORKER_PROCESS = True
+
+# Fixed spoken message; prewarmed into the TTS phrase cache at startup
+WELCOME_MESSAGE = "Welcome Commander. LYRA 3.0 Raspberry Pi edition is now online."
 
 def setup_logging():
     """Setup optimized logging for Pi5"""
@@ -131,7 +154,7 @@ def detect_platform():
 
 def initialize_lyra_components():
     """Initialize all LYRA core components with Pi5 optimizations"""
-    global lyra_engine, context_mgr, voice_input, tts_output, pi5_hardware
+    global lyra_engine, context_mgr, session_registry, mode_manager, thermal_scheduler, voice_input, tts_output, pi5_hardware
     
     is_pi, platform_info = detect_platform()
     logging.info(f"Platform detected: {platform_info}")
@@ -140,9 +163,14 @@ def initialize_lyra_components():
     
     # Initialize core components
     context_mgr = ContextManager()
+    session_registry = SessionRegistry(context_mgr)
     lyra_engine = DecisionEngine(context_mgr)
+    tts_output = TTSProcess() if TTS_WORKER_PROCESS else TTSOutput()
     voice_input = VoiceInput()
-    tts_output = TTSOutput()
+    voice_input.set_command_grammar(build_command_grammar(lyra_engine, voice_input.wake_words))
+    voice_input.set_barge_in(tts_output.is_speaking, interrupt_speech_output)
+    voice_input.set_partial_callback(push_partial_transcript)
+    tts_output.prewarm(lyra_engine.get_response_templates() + [WELCOME_MESSAGE])
     
     # Initialize Pi5 hardware if available
     if PI5_HARDWARE_AVAILABLE and is_pi:
@@ -160,6 +188,23 @@ def initialize_lyra_components():
     else:
         logging.info("Pi5 hardware integration not available")
     
+    # Push context changes to connected clients instead of having them poll
+    context_mgr.subscribe(push_context_event)
+    
+    # Apply each mode's runtime profile to the subsystems that act on it
+    mode_manager = ModeManager()
+    if pi5_hardware and hasattr(pi5_hardware, 'apply_profile'):
+        mode_manager.register_profile_target('pi5_hardware', pi5_hardware.apply_profile)
+    mode_manager.register_profile_target('voice_input', voice_input.apply_profile)
+    mode_manager.register_profile_target('tts_output', tts_output.apply_profile)
+    mode_manager.register_profile_target('status', apply_runtime_profile)
+    
+    # Step profiles down before the Pi5 throttles under heat or load
+    if pi5_hardware and hasattr(pi5_hardware, 'get_load_metrics'):
+        thermal_scheduler = ThermalScheduler(mode_manager, pi5_hardware.get_load_metrics)
+        thermal_scheduler.start()
+    socketio.start_background_task(status_broadcaster)
+    
     logging.info("LYRA 3.0 Pi5 initialization complete")
 
 def signal_handler(signum, frame):
@@ -167,6 +212,9 @@ def signal_handler(signum, frame):
     logging.info(f"Received signal {signum}, initiating graceful shutdown...")
     shutdown_event.set()
     
+    if thermal_scheduler:
+        thermal_scheduler.stop()
+    
     # Cleanup hardware resources
     if pi5_hardware:
         pi5_hardware.cleanup()
@@ -194,10 +242,16 @@ def health_check():
         'pi5_hardware': PI5_HARDWARE_AVAILABLE and pi5_hardware is not None
     }
 
+@app.route('/api/context')
+def context_summary():
+    """Serve the cached, pre-serialized context summary"""
+    return app.response_class(context_mgr.get_context_summary_json(), mimetype='application/json')
+
 @socketio.on('connect')
 def handle_connect():
     """Handle client connection with Pi5 info"""
     logging.info("Client connected to LYRA 3.0 Pi5")
+    client_session()
     is_pi, platform_info = detect_platform()
     
     emit('status', {
@@ -211,6 +265,9 @@ def handle_connect():
 def handle_disconnect():
     """Handle client disconnection"""
     logging.info("Client disconnected from LYRA 3.0 Pi5")
+    # Login-keyed sessions outlive the socket until they go idle
+    if client_session_key() == request.sid:
+        session_registry.close(request.sid)
 
 @socketio.on('test')
 def handle_test(data):
@@ -238,12 +295,17 @@ def handle_command(data):
         elif command_type == 'text_command':
             text = command_data.get('text', '')
             response = lyra_engine.process_command(text)
+            record_command(text, response, 'text', client_session())
             emit('response', {'type': 'command_result', 'data': response})
             
         elif command_type == 'system_status':
             status = get_pi5_system_status()
             emit('response', {'type': 'system_status', 'data': status})
             
+        elif command_type == 'session_info':
+            # Sent as binary JSON: the shared summary is spliced in pre-serialized
+            emit('session_info', client_session().get_summary_json(sessions=session_registry.get_stats()))
+            
         elif command_type == 'gpio_control' and pi5_hardware:
             pin = command_data.get('pin')
             action = command_data.get('action')
@@ -284,10 +346,17 @@ def handle_command(data):
             stats = pi5_hardware.get_detection_stats()
             emit('response', {'type': 'detection_stats', 'data': stats})
             
+        elif command_type == 'thermal_status' and thermal_scheduler:
+            emit('response', {'type': 'thermal_status', 'data': thermal_scheduler.get_status()})
+            
         elif command_type == 'hardware_info' and pi5_hardware:
             info = pi5_hardware.get_hardware_info()
             emit('response', {'type': 'hardware_info', 'data': info})
             
+        elif command_type == 'metrics_query':
+            response = handle_metrics_query(command_data)
+            emit('response', {'type': 'metrics_data', 'data': response})
+            
         elif command_type == 'trinetra_command':
             response = handle_trinetra_command(command_data)
             emit('response', {'type': 'trinetra_response', 'data': response})
@@ -303,31 +372,108 @@ def handle_command(data):
         logging.error(f"Error handling command: {e}")
         emit('response', {'type': 'error', 'data': {'message': str(e)}})
 
+def client_session_key():
+    """Key the caller's session by login name if given, else by socket sid"""
+    return request.args.get('login') or request.sid
+
+def client_session():
+    """Get the calling client's session"""
+    return session_registry.get(client_session_key())
+
+def apply_runtime_profile(profile):
+    """Apply the mode's status sampling interval and log level"""
+    global status_interval
+    level = logging.getLevelName(profile.get('log_level', 'INFO'))
+    if not isinstance(level, int):
+        raise ValueError(f"Unknown log level: {profile.get('log_level')}")
+    status_interval = max(1, profile.get('status_interval', STATUS_PUSH_INTERVAL))
+    logging.getLogger().setLevel(level)
+
+def change_mode(mode):
+    """
+    Switch every subsystem to the mode's runtime profile, then commit the mode
+
+    The context (and so the journal and every GUI) only takes the new mode
+    once ModeManager has applied its profile; if that is rolled back the
+    context keeps the previous mode and the error is returned.
+    """
+    with mode_change_lock:
+        result = mode_manager.set_mode(mode)
+        if result['status'] == 'success':
+            context_mgr.set_mode(mode)
+    if result['status'] != 'success':
+        logging.error(result['message'])
+    return result
+
+def interrupt_speech_output(onset):
+    """Barge-in: silence LYRA as soon as the operator talks over it, and record how fast"""
+    result = tts_output.interrupt(onset)
+    if result.get('interrupted'):
+        context_mgr.metrics.record('voice.barge_in_latency_ms', result['latency_ms'])
+
+def push_partial_transcript(text):
+    """Show what the recognizer has heard so far while the user is still speaking"""
+    try:
+        socketio.emit('partial_transcript', {'text': text})
+    except Exception as e:
+        logging.debug(f"Could not push partial transcript: {e}")
+
+def push_context_event(event):
+    """Forward a context change event to all connected clients"""
+    try:
+        socketio.emit('context_update', event)
+    except Exception as e:
+        logging.debug(f"Could not push context update: {e}")
+
+def status_broadcaster():
+    """Sample Pi5 status and publish it through the context manager"""
+    while not shutdown_event.is_set():
+        try:
+            status = get_pi5_system_status()
+            status.pop('timestamp', None)
+            # Round readings so sensor noise does not count as a change
+            status = {key: round(value, 1) if isinstance(value, float) else value
+                      for key, value in status.items()}
+            context_mgr.update_system_state('host', status)
+            # Recorded as metrics only; the floor moves too often to publish as state
+            context_mgr.metrics.record_many('voice', voice_input.get_noise_metrics())
+            session_registry.evict_idle()
+        except Exception as e:
+            logging.error(f"Status broadcaster error: {e}")
+        socketio.sleep(status_interval)
+
+def record_command(text, response, source, session=None):
+    """Apply a processed command's effects to the shared or the client's context"""
+    if response.get('action') == 'change_mode':
+        result = change_mode(response.get('data', {}).get('mode'))
+        if result['status'] != 'success':
+            # Report the failure instead of the announced switch
+            response.update(status='error', message=result['message'])
+    entry = {
+        'command': text,
+        'response': response.get('message', ''),
+        'source': source
+    }
+    if session is not None:
+        session.add_conversation_entry(entry)
+    else:
+        context_mgr.add_conversation_entry(entry)
+
 def get_pi5_system_status():
     """Get Pi5-optimized system status"""
     if pi5_hardware:
         return pi5_hardware.get_system_status()
     else:
-        # Fallback system status
-        try:
-            import psutil
-            return {
-                'cpu_percent': psutil.cpu_percent(),
-                'memory_percent': psutil.virtual_memory().percent,
-                'disk_percent': psutil.disk_usage('/').percent,
-                'temperature': get_cpu_temperature(),
-                'timestamp': str(datetime.now()),
-                'note': 'Basic monitoring (Pi5 hardware not available)'
-            }
-        except ImportError:
-            return {
-                'cpu_percent': 0,
-                'memory_percent': 0,
-                'disk_percent': 0,
-                'temperature': get_cpu_temperature(),
-                'timestamp': str(datetime.now()),
-                'note': 'Limited monitoring available'
-            }
+        # Fallback system status from the shared telemetry sampler
+        snapshot = get_sampler().snapshot()
+        return {
+            'cpu_percent': snapshot.get('cpu_percent', 0),
+            'memory_percent': snapshot.get('memory_percent', 0),
+            'disk_percent': snapshot.get('disk_percent', 0),
+            'temperature': get_cpu_temperature(),
+            'timestamp': str(datetime.now()),
+            'note': 'Basic monitoring (Pi5 hardware not available)'
+        }
 
 def get_cpu_temperature():
     """Get CPU temperature (Pi-optimized)"""
@@ -340,6 +486,14 @@ def get_cpu_temperature():
         pass
     return 0
 
+def handle_metrics_query(query):
+    """Answer a metrics history query, or list metrics when none is named"""
+    metric = query.get('metric')
+    if not metric:
+        return {'status': 'success', 'metrics': context_mgr.metrics.list_metrics()}
+    return context_mgr.query_metrics(metric, query.get('start'), query.get('end'),
+                                     query.get('resolution'))
+
 def handle_trinetra_command(command_data):
     """Handle TRINETRA ground bot commands with Pi5 GPIO integration"""
     action = command_data.get('action')
@@ -410,7 +564,7 @@ def main():
     initialize_lyra_components()
     
     # Welcome message
-    tts_output.speak("Welcome Commander. LYRA 3.0 Raspberry Pi edition is now online.")
+    tts_output.speak(WELCOME_MESSAGE)
     
     if pi5_hardware:
         logging.info("🍓 Pi5 hardware features available:")
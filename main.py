@@ -8,7 +8,7 @@ import os
 import sys
 import logging
 import asyncio
-from flask import Flask, render_template
+from flask import Flask, render_template, request
 from flask_socketio import SocketIO, emit
 import threading
 import json
@@ -21,7 +21,12 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'system'))
 from core.decision_engine import DecisionEngine
 from core.context_manager import ContextManager
 from core.voice_input import VoiceInput
+from core.command_grammar import build_command_grammar
 from core.tts_output import TTSOutput
+from core.tts_process import TTSProcess
+from core.session_registry import SessionRegistry
+from core.mode_manager import ModeManager
+from core.telemetry import get_sampler
 
 # Initialize Flask app for WebSocket communication with Electron
 app = Flask(__name__)
@@ -31,8 +36,32 @@ socketio = SocketIO(app, cors_allowed_origins="*")
 # Global LYRA components
 lyra_engine = None
 context_mgr = None
+session_registry = None
+mode_manager = None
 voice_input = None
 tts_output = None
+telemetry = None
+# Keeps ModeManager and the context in the same order when modes change concurrently
+mode_change_lock = threading.Lock()
+
+# Seconds between host status samples; clients only receive changed fields.
+# The active mode's runtime profile replaces the default
+STATUS_PUSH_INTERVAL = 5
+status_interval = STATUS_PUSH_INTERVAL
+
+# Seconds between host telemetry samples; status requests read the latest
+# sample, the temperature and connectivity checks run less often
+TELEMETRY_INTERVAL = 1.0
+TEMPERATURE_INTERVAL = 5.0
+CONNECTIVITY_INTERVAL = 30.0
+
+# Synthesize and play speech in a worker process instead of a server thread,
+# so talking never stalls the SocketIO handlers
+TTS_WORKER_PROCESS = True
+
+# Fixed spoken messages; prewarmed into the TTS phrase cache at startup
+WAKE_GREETING = 'Yes Commander, I am listening. How can I assist you?'
+WELCOME_MESSAGE = "Welcome Commander. LYRA 3.0 system is now online."
 
 def setup_logging():
     """Setup logging configuration"""
@@ -48,18 +77,38 @@ def setup_logging():
 
 def initialize_lyra_components():
     """Initialize all LYRA core components"""
-    global lyra_engine, context_mgr, voice_input, tts_output
+    global lyra_engine, context_mgr, session_registry, mode_manager, voice_input, tts_output, telemetry
     
     logging.info("Initializing LYRA 3.0 components...")
     
+    # One background sampler serves every status request
+    telemetry = get_sampler(TELEMETRY_INTERVAL)
+    telemetry.add_source('temperature', get_cpu_temperature, interval=TEMPERATURE_INTERVAL)
+    telemetry.add_source('network_connected', check_internet_connection, interval=CONNECTIVITY_INTERVAL)
+    
     # Initialize core components
     context_mgr = ContextManager()
+    session_registry = SessionRegistry(context_mgr)
     lyra_engine = DecisionEngine(context_mgr)
+    tts_output = TTSProcess() if TTS_WORKER_PROCESS else TTSOutput()
     voice_input = VoiceInput()
-    tts_output = TTSOutput()
+    voice_input.set_command_grammar(build_command_grammar(lyra_engine, voice_input.wake_words))
+    voice_input.set_barge_in(tts_output.is_speaking, interrupt_speech_output)
+    tts_output.prewarm(lyra_engine.get_response_templates() + [WAKE_GREETING, WELCOME_MESSAGE])
+    
+    # Push context changes to connected clients instead of having them poll
+    context_mgr.subscribe(push_context_event)
+    
+    # Apply each mode's runtime profile to the subsystems that act on it
+    mode_manager = ModeManager()
+    mode_manager.register_profile_target('voice_input', voice_input.apply_profile)
+    mode_manager.register_profile_target('tts_output', tts_output.apply_profile)
+    mode_manager.register_profile_target('status', apply_runtime_profile)
+    socketio.start_background_task(status_broadcaster)
     
     # Set up voice input callback to process speech
     voice_input.set_speech_callback(handle_voice_command)
+    voice_input.set_partial_callback(push_partial_transcript)
     
     # Start continuous listening immediately
     voice_input.start_continuous_listening()
@@ -71,12 +120,16 @@ def initialize_lyra_components():
 def handle_connect():
     """Handle client connection"""
     logging.info("Client connected to LYRA 3.0")
+    client_session()
     emit('status', {'message': 'Connected to LYRA 3.0', 'timestamp': str(datetime.now())})
 
 @socketio.on('disconnect')
 def handle_disconnect():
     """Handle client disconnection"""
     logging.info("Client disconnected from LYRA 3.0")
+    # Login-keyed sessions outlive the socket until they go idle
+    if client_session_key() == request.sid:
+        session_registry.close(request.sid)
 
 @socketio.on('test')
 def handle_test(data):
@@ -106,7 +159,7 @@ def handle_command(data):
         elif command_type == 'text_command':
             # Process text command with voice response
             text = command_data.get('text', '')
-            response = handle_text_command_with_voice(text)
+            response = handle_text_command_with_voice(text, client_session())
             emit('response', {'type': 'command_result', 'data': response})
             
         elif command_type == 'system_status':
@@ -114,6 +167,16 @@ def handle_command(data):
             status = get_system_status()
             emit('response', {'type': 'system_status', 'data': status})
             
+        elif command_type == 'session_info':
+            # Get this client's context and live session totals, sent as binary
+            # JSON with the shared summary spliced in pre-serialized
+            emit('session_info', client_session().get_summary_json(sessions=session_registry.get_stats()))
+            
+        elif command_type == 'metrics_query':
+            # Get recorded history of a system or device metric
+            response = handle_metrics_query(command_data)
+            emit('response', {'type': 'metrics_data', 'data': response})
+            
         elif command_type == 'trinetra_command':
             # Handle TRINETRA commands
             response = handle_trinetra_command(command_data)
@@ -131,36 +194,104 @@ def handle_command(data):
         logging.error(f"Error handling command: {e}")
         emit('response', {'type': 'error', 'data': {'message': str(e)}})
 
-def get_system_status():
-    """Get current system status"""
+def client_session_key():
+    """Key the caller's session by login name if given, else by socket sid"""
+    return request.args.get('login') or request.sid
+
+def client_session():
+    """Get the calling client's session"""
+    return session_registry.get(client_session_key())
+
+def apply_runtime_profile(profile):
+    """Apply the mode's status sampling interval and log level"""
+    global status_interval
+    level = logging.getLevelName(profile.get('log_level', 'INFO'))
+    if not isinstance(level, int):
+        raise ValueError(f"Unknown log level: {profile.get('log_level')}")
+    status_interval = max(1, profile.get('status_interval', STATUS_PUSH_INTERVAL))
+    logging.getLogger().setLevel(level)
+
+def change_mode(mode):
+    """
+    Switch every subsystem to the mode's runtime profile, then commit the mode
+
+    The context (and so the journal and every GUI) only takes the new mode
+    once ModeManager has applied its profile; if that is rolled back the
+    context keeps the previous mode and the error is returned.
+    """
+    with mode_change_lock:
+        result = mode_manager.set_mode(mode)
+        if result['status'] == 'success':
+            context_mgr.set_mode(mode)
+    if result['status'] != 'success':
+        logging.error(result['message'])
+    return result
+
+def interrupt_speech_output(onset):
+    """Barge-in: silence LYRA as soon as the operator talks over it, and record how fast"""
+    result = tts_output.interrupt(onset)
+    if result.get('interrupted'):
+        context_mgr.metrics.record('voice.barge_in_latency_ms', result['latency_ms'])
+
+def push_partial_transcript(text):
+    """Show what the recognizer has heard so far while the user is still speaking"""
     try:
-        import psutil
-        import platform
-        
-        # Get disk usage for the current drive (Windows)
-        if platform.system() == 'Windows':
-            disk_usage = psutil.disk_usage('C:\\')
-        else:
-            disk_usage = psutil.disk_usage('/')
-            
-        return {
-            'cpu_percent': psutil.cpu_percent(interval=1),
-            'memory_percent': psutil.virtual_memory().percent,
-            'disk_percent': (disk_usage.used / disk_usage.total) * 100,
-            'temperature': get_cpu_temperature(),
-            'network_connected': check_internet_connection(),
-            'timestamp': str(datetime.now())
-        }
-    except ImportError:
-        return {
-            'cpu_percent': 0,
-            'memory_percent': 0,
-            'disk_percent': 0,
-            'temperature': 0,
-            'network_connected': False,
-            'timestamp': str(datetime.now()),
-            'note': 'psutil not installed'
-        }
+        socketio.emit('partial_transcript', {'text': text})
+    except Exception as e:
+        logging.debug(f"Could not push partial transcript: {e}")
+
+def push_context_event(event):
+    """Forward a context change event to all connected clients"""
+    try:
+        socketio.emit('context_update', event)
+    except Exception as e:
+        logging.debug(f"Could not push context update: {e}")
+
+def status_broadcaster():
+    """Sample host status and publish it through the context manager"""
+    while True:
+        try:
+            status = get_system_status()
+            status.pop('timestamp', None)
+            # Round readings so sensor noise does not count as a change
+            status = {key: round(value, 1) if isinstance(value, float) else value
+                      for key, value in status.items()}
+            context_mgr.update_system_state('host', status)
+            # Recorded as metrics only; the floor moves too often to publish as state
+            context_mgr.metrics.record_many('voice', voice_input.get_noise_metrics())
+            session_registry.evict_idle()
+        except Exception as e:
+            logging.error(f"Status broadcaster error: {e}")
+        socketio.sleep(status_interval)
+
+def record_command(text, response, source, session=None):
+    """Apply a processed command's effects to the shared or the client's context"""
+    if response.get('action') == 'change_mode':
+        result = change_mode(response.get('data', {}).get('mode'))
+        if result['status'] != 'success':
+            # Report the failure instead of the announced switch
+            response.update(status='error', message=result['message'])
+    entry = {
+        'command': text,
+        'response': response.get('message', ''),
+        'source': source
+    }
+    if session is not None:
+        session.add_conversation_entry(entry)
+    else:
+        context_mgr.add_conversation_entry(entry)
+
+def get_system_status():
+    """Get current system status from the latest telemetry sample, without blocking"""
+    snapshot = telemetry.snapshot()
+    return {
+        'cpu_percent': snapshot.get('cpu_percent', 0),
+        'memory_percent': snapshot.get('memory_percent', 0),
+        'disk_percent': snapshot.get('disk_percent', 0),
+        'temperature': snapshot.get('temperature') or 0,
+        'network_connected': bool(snapshot.get('network_connected')),
+        'timestamp': str(datetime.now())
+    }
 
 def get_cpu_temperature():
     """Get CPU temperature (cross-platform)"""
@@ -243,7 +374,7 @@ def handle_voice_command(text):
             response = {
                 'status': 'success',
                 'action': 'wake_greeting',
-                'message': 'Yes Commander, I am listening. How can I assist you?',
+                'message': WAKE_GREETING,
                 'timestamp': str(datetime.now())
             }
             logging.info(f"Wake word greeting response: {response['message']}")
@@ -251,6 +382,7 @@ def handle_voice_command(text):
         else:
             # Process command through LYRA decision engine
             response = lyra_engine.process_command(text)
+            record_command(text, response, 'voice')
             
             # Speak the response
             if 'message' in response:
@@ -271,7 +403,7 @@ def handle_voice_command(text):
         except Exception as e:
             logging.debug(f"Could not send to GUI: {e}")
 
-def handle_text_command_with_voice(text):
+def handle_text_command_with_voice(text, session=None):
     """Handle text commands and respond with voice"""
     global lyra_engine, tts_output
     
@@ -280,6 +412,7 @@ def handle_text_command_with_voice(text):
         
         # Process command through LYRA decision engine
         response = lyra_engine.process_command(text)
+        record_command(text, response, 'text', session)
         
         # Speak the response if TTS is available
         if tts_output and 'message' in response:
@@ -289,6 +422,14 @@ def handle_text_command_with_voice(text):
     
     return {'status': 'error', 'message': 'Command processing failed'}
 
+def handle_metrics_query(query):
+    """Answer a metrics history query, or list metrics when none is named"""
+    metric = query.get('metric')
+    if not metric:
+        return {'status': 'success', 'metrics': context_mgr.metrics.list_metrics()}
+    return context_mgr.query_metrics(metric, query.get('start'), query.get('end'),
+                                     query.get('resolution'))
+
 def handle_trinetra_command(command_data):
     """Handle TRINETRA ground bot commands"""
     action = command_data.get('action')
@@ -357,6 +498,11 @@ def serve_js():
     except FileNotFoundError:
         return "// JS file not found", 404
 
+@app.route('/api/context')
+def context_summary():
+    """Serve the cached, pre-serialized context summary"""
+    return app.response_class(context_mgr.get_context_summary_json(), mimetype='application/json')
+
 def run_flask_server():
     """Run the Flask-SocketIO server"""
     socketio.run(app, host='127.0.0.1', port=5000, debug=False)
@@ -375,7 +521,7 @@ def main():
     initialize_lyra_components()
     
     # Welcome message
-    tts_output.speak("Welcome Commander. LYRA 3.0 system is now online.")
+    tts_output.speak(WELCOME_MESSAGE)
     
     # Start Flask server for GUI communication
     logging.info("Starting WebSocket server on port 5000...")
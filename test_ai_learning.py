@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+LYRA 3.0 AI Learning Test
+Test knowledge base lookup and storage without network access
+"""
+
+import os
+import sys
+import threading
+import time
+
+# Add core modules to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'core'))
+
+from core.ai_learning import AILearningSystem
+
+def make_learning_system(tmp_path, monkeypatch):
+    """Create a learning system whose data files live in a temp directory"""
+    monkeypatch.chdir(tmp_path)
+    learning = AILearningSystem()
+    learning.knowledge_sources = ['wikipedia']
+    return learning
+
+def fake_wikipedia(title, calls):
+    """Build a Wikipedia stub that resolves every query to one page"""
+    def search(query):
+        calls.append(query)
+        return {
+            'status': 'success',
+            'data': {'title': title, 'extract': f'{title} is a topic LYRA has learned about.', 'summary': f'{title} is a topic.'}
+        }
+    return search
+
+def test_canonicalize_query():
+    """Equivalent phrasings share one canonical form"""
+    learning = AILearningSystem.__new__(AILearningSystem)
+    assert learning._canonicalize_query('Artificial Intelligence') == 'artificial intelligence'
+    assert learning._canonicalize_query('the artificial intelligence?') == 'artificial intelligence'
+    assert learning._canonicalize_query('drones') == learning._canonicalize_query('a drone')
+    assert learning._canonicalize_query('the') == 'the'
+
+def test_stemming_leaves_non_plurals_alone():
+    """Words that only look plural keep their own knowledge keys"""
+    learning = AILearningSystem.__new__(AILearningSystem)
+    for word in ('mars', 'news', 'series', 'species', 'physics', 'glass', 'virus', 'analysis'):
+        assert learning._canonicalize_query(word) == word
+    assert learning._canonicalize_query('batteries') == 'battery'
+    assert learning._canonicalize_query('Athens') == 'athens'
+
+def test_case_variants_share_one_key():
+    """Typed and spoken (lowercase) phrasings of a question map to the same key"""
+    learning = AILearningSystem.__new__(AILearningSystem)
+    assert learning._canonicalize_query('What are Robots') == learning._canonicalize_query('what are robots') == 'robot'
+    assert learning._canonicalize_query('Tell me about Mars') == learning._canonicalize_query('tell me about mars')
+
+def test_alias_learned_from_redirect(tmp_path, monkeypatch):
+    """A redirected query is answered locally the second time"""
+    learning = make_learning_system(tmp_path, monkeypatch)
+    calls = []
+    learning._search_wikipedia = fake_wikipedia('Artificial intelligence', calls)
+
+    assert learning.search_and_learn('AI')['source'] == 'wikipedia'
+    assert learning.search_and_learn('ai')['source'] == 'knowledge_base'
+    assert learning.search_and_learn('the artificial intelligence')['source'] == 'knowledge_base'
+    assert calls == ['AI']
+
+    # Aliases survive a restart
+    reloaded = AILearningSystem()
+    assert reloaded._search_knowledge_base('AI') is not None
+
+def test_fan_out_returns_fastest_answer_and_caches_late_one(tmp_path, monkeypatch):
+    """A slow source neither delays the answer nor is thrown away"""
+    learning = make_learning_system(tmp_path, monkeypatch)
+    learning.knowledge_sources = ['wikipedia', 'duckduckgo']
+    learning.search_deadline = 2.0
+    quick_wikipedia = fake_wikipedia('Quadcopter', [])
+
+    def wikipedia(query):
+        time.sleep(0.05)
+        return quick_wikipedia(query)
+    learning._search_wikipedia = wikipedia
+
+    def slow_duckduckgo(query):
+        time.sleep(0.5)
+        return {'status': 'success', 'data': {'title': 'Multirotor', 'extract': 'A multirotor has several rotors.'}}
+    learning._search_duckduckgo = slow_duckduckgo
+
+    start = time.monotonic()
+    result = learning.search_and_learn('quadcopter')
+    assert result['source'] == 'wikipedia'
+    assert time.monotonic() - start < 0.5
+
+    time.sleep(0.8)
+    assert learning._search_knowledge_base('multirotor')['source'] == 'duckduckgo'
+    assert learning._search_knowledge_base('quadcopter')['source'] == 'wikipedia'
+
+def test_knowledge_stats_track_store_and_forget(tmp_path, monkeypatch):
+    """Incremental statistics match a full rescan after stores and evictions"""
+    learning = make_learning_system(tmp_path, monkeypatch)
+    learning._store_knowledge('Drone', {'title': 'Drone', 'extract': 'x' * 2000}, 'wikipedia')
+    learning._store_knowledge('Drone', {'title': 'Drone', 'extract': 'short'}, 'duckduckgo')
+    learning._store_knowledge('Rover', {'title': 'Rover', 'extract': 'wheels'}, 'wikipedia')
+    learning.learn_from_conversation('hello', 'Hello Commander.')
+    assert learning.forget_knowledge('rovers')
+
+    stats = learning.get_knowledge_stats()
+    assert stats['total_entries'] == 2
+    assert stats['sources'] == {'duckduckgo': 1, 'unknown': 1}
+    assert stats['types'] == {'knowledge': 1, 'conversation': 1}
+    assert stats['size_histogram']['<1KB'] == 2
+    assert stats['age_histogram']['<1d'] == 2
+    assert stats['file_size'] == os.path.getsize(learning.knowledge_base_file)
+
+    incremental = dict(learning._stats)
+    learning._rebuild_stats()
+    assert learning._stats == incremental
+
+def test_search_while_late_results_are_stored(tmp_path, monkeypatch):
+    """Partial-match lookups never see the knowledge base change size under them"""
+    learning = make_learning_system(tmp_path, monkeypatch)
+    for n in range(200):
+        learning._put_entry(f'topic {n}', {'title': f'Topic {n}', 'source': 'wikipedia'})
+    stop = threading.Event()
+
+    def store_late_results():
+        n = 0
+        while not stop.is_set():
+            learning._put_entry(f'late {n}', {'title': f'Late {n}', 'source': 'duckduckgo'})
+            learning._remove_entry(f'late {n - 1}')
+            n += 1
+    writer = threading.Thread(target=store_late_results)
+    writer.start()
+    try:
+        for _ in range(300):
+            assert learning._search_knowledge_base('unknown subject') is None
+            learning.search_local_knowledge('topic')
+    finally:
+        stop.set()
+        writer.join()
+
+def test_size_cap_evicts_oldest_and_keeps_stats_current(tmp_path, monkeypatch):
+    """Storing past the byte cap evicts the least recently learned entries"""
+    learning = make_learning_system(tmp_path, monkeypatch)
+    learning.max_knowledge_bytes = 5000
+    for name in ('Drone', 'Rover', 'Radar'):
+        learning._store_knowledge(name, {'title': name, 'extract': 'x' * 2000}, 'wikipedia')
+    # Relearning Drone makes Rover the oldest
+    learning._store_knowledge('Drone', {'title': 'Drone', 'extract': 'x' * 2000}, 'duckduckgo')
+
+    assert sorted(learning.knowledge_base) == ['drone', 'radar']
+    stats = learning.get_knowledge_stats()
+    assert stats['total_entries'] == 2
+    assert stats['sources'] == {'duckduckgo': 1, 'wikipedia': 1}
+    assert stats['size_histogram']['1-4KB'] == 2
+    assert stats['total_bytes'] <= learning.max_knowledge_bytes
+
+    incremental = dict(learning._stats)
+    learning._rebuild_stats()
+    assert learning._stats == incremental
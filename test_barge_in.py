@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+LYRA 3.0 Barge-in Test
+Test that talking over speech output interrupts it, and how fast
+"""
+
+import os
+import queue
+import sys
+import threading
+import time
+
+import numpy as np
+
+# Add core modules to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'core'))
+
+from core import tts_output as tts_module
+from core.audio_buffer import UtteranceSegmenter
+from core.tts_output import TTSOutput
+from core.vad import VoiceActivityDetector
+from core.voice_input import VoiceInput
+
+RATE = 16000
+CHUNK = 1024
+
+class BlockingEngine:
+    """Speaks until stopped, like a long answer being read out"""
+    def __init__(self):
+        self.stopped = threading.Event()
+
+    def say(self, text):
+        self.stopped.clear()
+
+    def runAndWait(self):
+        self.stopped.wait(timeout=5)
+
+    def stop(self):
+        self.stopped.set()
+
+def voiced(seconds, amplitude):
+    t = np.arange(int(seconds * RATE)) / RATE
+    wave = sum(np.sin(2 * np.pi * 150 * k * t) / k for k in range(1, 8))
+    return (amplitude * wave / np.sqrt(np.mean(wave ** 2))).astype('<i2').tobytes()
+
+def test_interrupt_silences_output_and_flushes_queue(monkeypatch):
+    """Speech stops mid-phrase, nothing queued plays, and the latency is recorded"""
+    monkeypatch.setattr(tts_module, 'TTS_AVAILABLE', True)
+    tts = TTSOutput()
+    try:
+        tts.engine = BlockingEngine()
+        tts.speak('A very long knowledge answer.')
+        tts.speak('And another one queued behind it.')
+        deadline = time.monotonic() + 2
+        while not tts.is_speaking() and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        result = tts.interrupt(time.monotonic())
+        assert result['interrupted']
+        assert result['latency_ms'] < 500
+        assert not tts.is_speaking()
+        assert tts.speech_queue.empty()
+        assert tts.get_barge_in_stats()['count'] == 1
+        assert tts.interrupt() == {'interrupted': False}
+    finally:
+        tts.shutdown()
+
+def test_speech_over_the_echo_is_a_barge_in():
+    """The speaker's own echo never triggers; the user talking louder over it does"""
+    voice = VoiceInput()
+    voice.segmenter = UtteranceSegmenter(RATE, pause=0.5, vad=VoiceActivityDetector(RATE))
+    interrupted = []
+    voice.set_barge_in(lambda: True, interrupted.append)
+
+    def stream(pcm, start):
+        hits = []
+        for index, offset in enumerate(range(0, len(pcm), CHUNK * 2)):
+            chunk = pcm[offset:offset + CHUNK * 2]
+            now = start + index * CHUNK / RATE
+            voice.segmenter.process(chunk)
+            if voice._check_barge_in(chunk, now):
+                hits.append(now)
+        return hits
+
+    assert stream(voiced(2.0, 800), 0.0) == []
+    hits = stream(voiced(0.5, 4000), 2.0)
+    assert len(hits) == 1
+    # Detected within a few chunks of the user starting to talk
+    assert hits[0] - 2.0 < 0.2
+    deadline = time.monotonic() + 2
+    while not interrupted and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert interrupted == hits
+    assert voice.get_audio_stats()['barge_ins'] == 1
+
+class ScriptedRing:
+    """Ring buffer handing out prepared chunks, then ending the segment loop"""
+    def __init__(self, voice, pcm):
+        self.voice = voice
+        self.chunks = [pcm[offset:offset + CHUNK * 2] for offset in range(0, len(pcm), CHUNK * 2)]
+
+    def read(self, max_samples=None, timeout=None):
+        if not self.chunks:
+            self.voice.listening = False
+            return b''
+        return self.chunks.pop(0)
+
+def test_dropped_barge_in_utterance_does_not_carry_over():
+    """A barge-in cut short to nothing leaves the next utterance needing the wake word"""
+    voice = VoiceInput()
+    voice.segmenter = UtteranceSegmenter(RATE, pause=0.5, min_seconds=0.2)
+    voice.utterances = queue.Queue()
+    voice.set_barge_in(lambda: False, lambda onset: None)
+    voice.listening = voice.active = True
+    # The user's interruption is a cough, far shorter than min_seconds
+    voice._barge_in_utterance = True
+    silence = bytes(int(1.0 * RATE) * 2)
+    voice.ring = ScriptedRing(voice, voiced(0.05, 4000) + silence + voiced(1.0, 4000) + silence)
+
+    voice._segment_loop()
+    assert not voice._barge_in_utterance
+    pcm, spotted, barge_in, streamed = voice.utterances.get_nowait()
+    assert not barge_in and not spotted
+    assert voice.utterances.empty()
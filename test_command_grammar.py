@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+LYRA 3.0 Command Grammar Test
+Test grammar generation and grammar-constrained decoding of commands
+"""
+
+import os
+import sys
+
+# Add core modules to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'core'))
+
+from core.command_grammar import UNKNOWN_WORD, build_command_grammar
+from core.context_manager import ContextManager
+from core.decision_engine import DecisionEngine
+from core.voice_input import VoiceInput
+
+class GrammarBackend:
+    """Records how it was asked to decode and answers from a script"""
+    name = 'grammar'
+    streaming = False
+    supports_grammar = True
+
+    def __init__(self, constrained, open_vocabulary):
+        self.answers = {True: constrained, False: open_vocabulary}
+        self.calls = []
+
+    def transcribe(self, pcm, sample_rate, grammar=None):
+        self.calls.append(grammar is not None)
+        return self.answers[grammar is not None]
+
+def make_engine(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return DecisionEngine(ContextManager(config_dir=str(tmp_path / 'config')))
+
+def test_grammar_covers_patterns_handlers_and_custom_commands(tmp_path, monkeypatch):
+    """Pattern words, handler phrases and numbers are in; regex syntax is not"""
+    engine = make_engine(tmp_path, monkeypatch)
+    engine.add_custom_pattern('krait3_control', r'(?:orbit|circle)\s+\d+', 'krait3_orbit')
+    grammar = build_command_grammar(engine, ['hey lyra'])
+
+    for word in ('trinetra', 'hover', 'defense', 'forward', 'orbit', 'twenty', 'hey', 'lyra'):
+        assert word in grammar.words
+    assert 'move forward' in grammar.phrases
+    assert not any(word in grammar.words for word in ('s', 'd', '?:'))
+    assert grammar.recognizer_grammar()[-1] == UNKNOWN_WORD
+    assert 'what' in grammar.question_words
+
+def test_commands_use_grammar_and_questions_fall_back(tmp_path, monkeypatch):
+    """Commands decode once against the grammar; questions are decoded again openly"""
+    grammar = build_command_grammar(make_engine(tmp_path, monkeypatch))
+    voice = VoiceInput()
+
+    voice.backend = GrammarBackend('[unk] move forward', 'trinetra move forward')
+    voice.set_command_grammar(grammar)
+    assert voice._transcribe_utterance(b'\x00\x00', 16000, command=True) == 'move forward'
+    assert voice.backend.calls == [True]
+
+    voice.backend = GrammarBackend('what is [unk]', 'what is photosynthesis')
+    assert voice._transcribe_utterance(b'\x00\x00', 16000, command=True) == 'what is photosynthesis'
+    assert voice.backend.calls == [True, False]
+
+    # Outside command mode the open vocabulary is used directly
+    voice.backend.calls.clear()
+    voice._transcribe_utterance(b'\x00\x00', 16000)
+    assert voice.backend.calls == [False]
+    assert voice.get_audio_stats()['open_vocabulary_retries'] == 1
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+LYRA 3.0 Context Manager Test
+Test conversation history and shared state management
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+
+# Add core modules to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'core'))
+
+import pytest
+
+from core.context_manager import ContextManager, ConversationHistory
+
+def test_history_ring_wraps_and_queries_by_time():
+    """The ring keeps the newest entries and answers time windows"""
+    history = ConversationHistory(capacity=3)
+    for i in range(5):
+        history.append({'n': i}, timestamp=float(i))
+
+    assert [e['n'] for e in history] == [2, 3, 4]
+    assert [e['n'] for e in history.latest(2)] == [3, 4]
+    assert [e['n'] for e in history.since(3.0)] == [3, 4]
+
+    assert history.drop_older_than(4.0) == 2
+    assert [e['n'] for e in history] == [4]
+    history.append({'n': 5}, timestamp=5.0)
+    assert [e['n'] for e in history] == [4, 5]
+
+def test_context_history_capacity(tmp_path):
+    """ContextManager honours the configured history size"""
+    context = ContextManager(config_dir=str(tmp_path), history_size=10)
+    for i in range(25):
+        context.add_conversation_entry({'command': f'cmd {i}'})
+
+    assert context.get_session_info()['commands_processed'] == 10
+    assert context.get_conversation_history(2)[-1]['command'] == 'cmd 24'
+    assert len(context.get_conversation_since(60)) == 10
+
+    context.cleanup_old_data()
+    assert len(context.conversation_history) == 10
+    context.reset_session()
+    assert context.get_conversation_history() == []
+
+def test_snapshots_are_read_only(tmp_path):
+    """Published state cannot be mutated behind the manager's back"""
+    context = ContextManager(config_dir=str(tmp_path))
+    context.update_device_state('trinetra', {'connected': True, 'waypoints': [1, 2]})
+    state = context.get_device_state('trinetra')
+
+    with pytest.raises(TypeError):
+        state['connected'] = False
+    assert state['waypoints'] == (1, 2)
+    assert context.get_context_summary()['system_health'] == 'good'
+
+def test_concurrent_readers_and_writers(tmp_path):
+    """Stress shared state from many threads at once"""
+    context = ContextManager(config_dir=str(tmp_path), history_size=50, compact_every=10**9)
+    iterations = 2000
+    errors = []
+    stop = threading.Event()
+
+    def writer(worker):
+        try:
+            for i in range(iterations):
+                # Both fields change together; readers must never see them differ
+                context.update_device_state('krait3', {'altitude': i, 'target_altitude': i})
+                context.update_system_state(f'worker{worker}', {'tick': i})
+                context.set_user_preference(f'pref{worker}', i)
+                context.set_mode(('home', 'defense', 'night', 'manual')[i % 4])
+                context.add_conversation_entry({'worker': worker, 'tick': i})
+        except Exception as e:
+            errors.append(e)
+
+    def reader():
+        try:
+            while not stop.is_set():
+                summary = context.get_context_summary()
+                json.dumps(summary)
+                krait = summary['device_states']['krait3']
+                assert krait.get('altitude') == krait.get('target_altitude')
+                for component, state in context.get_system_state().items():
+                    assert 'tick' in state
+                for entry in context.get_conversation_history(50):
+                    assert 'tick' in entry
+        except Exception as e:
+            errors.append(e)
+
+    writers = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+    readers = [threading.Thread(target=reader) for _ in range(4)]
+    for thread in readers + writers:
+        thread.start()
+    for thread in writers:
+        thread.join()
+    stop.set()
+    for thread in readers:
+        thread.join()
+
+    assert errors == []
+    assert context.get_device_state('krait3')['altitude'] == iterations - 1
+    assert sorted(context.get_system_state()) == [f'worker{n}' for n in range(4)]
+    assert all(context.get_user_preference(f'pref{n}') == iterations - 1 for n in range(4))
+    assert len(context.conversation_history) == 50
+
+def test_change_events_carry_only_deltas(tmp_path):
+    """Subscribers receive typed events for real changes only"""
+    context = ContextManager(config_dir=str(tmp_path))
+    events = []
+    token = context.subscribe(events.append)
+    device_events = []
+    context.subscribe(device_events.append, [ContextManager.EVENT_DEVICE_STATE_CHANGED])
+
+    context.set_mode('night')
+    context.set_mode('night')
+    context.update_system_state('host', {'cpu_percent': 10, 'memory_percent': 40})
+    context.update_system_state('host', {'cpu_percent': 12, 'memory_percent': 40})
+    context.update_device_state('trinetra', {'connected': True})
+    context.add_conversation_entry({'command': 'status'})
+
+    assert [e['type'] for e in events] == [
+        'mode_changed', 'system_state_changed', 'system_state_changed',
+        'device_state_changed', 'conversation_entry_added'
+    ]
+    assert events[2]['data'] == {'component': 'host', 'changes': {'cpu_percent': 12}}
+    assert device_events[0]['data'] == {'device': 'trinetra', 'changes': {'connected': True}}
+
+    context.unsubscribe(token)
+    context.set_mode('home')
+    assert len(events) == 5
+
+def test_change_events_arrive_in_commit_order(tmp_path):
+    """Concurrent writers to one component never leave a stale value last"""
+    context = ContextManager(config_dir=str(tmp_path))
+    delivered = []
+    context.subscribe(lambda event: delivered.append(event['data']['changes'].get('value')),
+                      [ContextManager.EVENT_SYSTEM_STATE_CHANGED])
+
+    def writer(offset):
+        for n in range(200):
+            context.update_system_state('gps', {'value': offset + n})
+    threads = [threading.Thread(target=writer, args=(offset,)) for offset in (0, 1000, 2000, 3000)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert delivered[-1] == context.get_system_state('gps')['value']
+
+    # A change made by a subscriber is delivered after the event that caused it
+    order = []
+
+    def leave_night_mode(event):
+        order.append(event['data']['mode'])
+        if event['data']['mode'] == 'night':
+            context.set_mode('home')
+    context.subscribe(leave_night_mode, [ContextManager.EVENT_MODE_CHANGED])
+    context.subscribe(lambda event: order.append('second:' + event['data']['mode']),
+                      [ContextManager.EVENT_MODE_CHANGED])
+    context.set_mode('night')
+    assert order == ['night', 'second:night', 'home', 'second:home']
+
+def test_context_summary_is_cached_until_mutation(tmp_path):
+    """An unchanged summary comes from cache; a mutation rebuilds it"""
+    context = ContextManager(config_dir=str(tmp_path))
+    first = context.get_context_summary()
+    cache = context._summary_cache
+    second = context.get_context_summary()
+    assert context._summary_cache is cache
+    assert second['device_states'] is first['device_states']
+
+    encoded = json.loads(context.get_context_summary_json())
+    assert encoded['mode'] == 'home'
+    assert encoded['session_info']['session_duration'].startswith('0:00:')
+    assert encoded['active_components'] == []
+
+    context.update_device_state('krait3', {'connected': True})
+    assert context._summary_cache is cache
+    summary = context.get_context_summary()
+    assert context._summary_cache is not cache
+    assert summary['device_states']['krait3']['connected'] is True
+    assert json.loads(context.get_context_summary_json())['system_health'] == 'good'
+
+def test_journal_replays_mutations_without_save(tmp_path):
+    """Mutations survive a restart through the journal alone"""
+    context = ContextManager(config_dir=str(tmp_path), compact_every=1000)
+    context.set_user_preference('volume', 0.4)
+    context.update_device_state('krait3', {'connected': True, 'altitude': 12})
+    context._fsync_journal()
+
+    # A crash mid-write leaves a torn last line behind
+    with open(context.journal_file, 'a') as f:
+        f.write('{"op": "pref", "key": "vol')
+
+    restored = ContextManager(config_dir=str(tmp_path), compact_every=1000)
+    assert restored.get_user_preference('volume') == 0.4
+    assert restored.get_device_state('krait3')['altitude'] == 12
+    assert restored.is_device_connected('krait3')
+
+    # Mutations made after the crash are replayed on the next restart
+    restored.set_user_preference('voice', 'female')
+    restored._fsync_journal()
+    reloaded = ContextManager(config_dir=str(tmp_path))
+    assert reloaded.get_user_preference('voice') == 'female'
+    assert reloaded.get_user_preference('volume') == 0.4
+
+def test_journal_path_ignores_later_directory_changes(tmp_path, monkeypatch):
+    """A deferred flush writes where the manager was created, not to the current directory"""
+    (tmp_path / 'first').mkdir()
+    (tmp_path / 'second').mkdir()
+    monkeypatch.chdir(tmp_path / 'first')
+    context = ContextManager(fsync_interval=0.2)
+    # As if just flushed, so the next flush is deferred by fsync_interval
+    context._last_fsync = time.monotonic()
+    context.set_user_preference('volume', 0.4)
+    timer = context._fsync_timer
+    monkeypatch.chdir(tmp_path / 'second')
+    timer.join()
+    with open(tmp_path / 'first' / 'config' / 'context.journal') as f:
+        assert json.loads(f.read())['value'] == 0.4
+    assert not (tmp_path / 'second' / 'config').exists()
+
+def test_journal_compacts_into_snapshot(tmp_path):
+    """The journal is folded into a snapshot every compact_every records"""
+    context = ContextManager(config_dir=str(tmp_path), compact_every=10)
+    for i in range(25):
+        context.set_user_preference('counter', i)
+    context._fsync_journal()
+
+    with open(context.journal_file) as f:
+        assert len(f.readlines()) == 5
+    with open(context.context_file) as f:
+        assert json.load(f)['user_preferences']['counter'] == 19
+
+    context.save_context()
+    assert os.path.getsize(context.journal_file) == 0
+    assert ContextManager(config_dir=str(tmp_path)).get_user_preference('counter') == 24
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+LYRA 3.0 Metrics Store Test
+Test multi-resolution metric history
+"""
+
+import os
+import sys
+
+# Add core modules to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'core'))
+
+from core.context_manager import ContextManager
+from core.metrics_store import MetricsStore
+
+def test_samples_downsample_into_every_tier():
+    """Each sample is aggregated into the 1 s, 1 min and 1 h buckets"""
+    store = MetricsStore()
+    for second in range(120):
+        store.record('host.cpu_usage', float(second), timestamp=7200.0 + second)
+
+    fine = store.query('host.cpu_usage', 7200, 7319, resolution='1s')
+    assert len(fine['timestamps']) == 120
+    assert fine['mean'][5] == 5.0
+
+    minutes = store.query('host.cpu_usage', 7200, 7319, resolution='1m')
+    assert minutes['timestamps'] == [7200.0, 7260.0]
+    assert minutes['min'] == [0.0, 60.0]
+    assert minutes['max'] == [59.0, 119.0]
+    assert minutes['mean'] == [29.5, 89.5]
+
+    hours = store.query('host.cpu_usage', 7200, 7319, resolution='1h')
+    assert hours['timestamps'] == [7200.0]
+    assert hours['mean'] == [59.5]
+
+def test_default_footprint_fits_the_device():
+    """A metric with the default tiers takes about 120 KB, and names are capped"""
+    store = MetricsStore()
+    store.record('host.cpu_usage', 1.0)
+    assert store.memory_usage() == 3060 * 40
+    for n in range(store.max_metrics + 10):
+        store.record(f'host.field{n}', 1.0)
+    assert len(store.list_metrics()) == store.max_metrics
+    assert store.memory_usage() < 8 * 1024 * 1024
+
+def test_memory_stays_bounded_and_old_buckets_expire():
+    """Ring slots are reused, so old buckets disappear instead of piling up"""
+    store = MetricsStore(tiers=(('1s', 1, 10), ('1m', 60, 5)))
+    store.record('krait3.altitude', 1.0, timestamp=0.0)
+    size = store.memory_usage()
+
+    for second in range(1, 1000):
+        store.record('krait3.altitude', 2.0, timestamp=float(second))
+
+    assert store.memory_usage() == size
+    fine = store.query('krait3.altitude', 0, 999, resolution='1s')
+    assert fine['timestamps'] == [float(second) for second in range(990, 1000)]
+    # The range is longer than the 1 s tier holds, so the 1 min tier is picked
+    assert store.query('krait3.altitude', 700, 999)['resolution'] == '1m'
+    assert store.query('krait3.altitude', 0, 1, resolution='1d')['status'] == 'error'
+
+def test_context_manager_records_numeric_state(tmp_path):
+    """Numeric system and device fields are recorded; others are skipped"""
+    context = ContextManager(config_dir=str(tmp_path))
+    context.update_system_state('host', {'cpu_usage': 12.5, 'platform': 'Linux'})
+    context.update_device_state('krait3', {'altitude': 40, 'connected': True})
+
+    assert context.metrics.list_metrics() == ['host.cpu_usage', 'krait3.altitude']
+    history = context.query_metrics('krait3.altitude', resolution='1s')
+    assert history['status'] == 'success'
+    assert history['max'] == [40.0]
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+LYRA 3.0 Mode Manager Test
+Test mode runtime profiles and how subsystems apply them
+"""
+
+import os
+import sys
+
+# Add core modules to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'core'))
+
+from core.mode_manager import ModeManager
+from core.tts_output import TTSOutput
+from core.voice_input import VoiceInput
+
+def test_profiles_reach_every_target():
+    """Registered subsystems get the current profile and every later one"""
+    manager = ModeManager()
+    seen = []
+    manager.register_profile_target('recorder', seen.append)
+    manager.set_mode('night')
+    manager.set_mode('defense')
+
+    assert [profile['status_interval'] for profile in seen] == [5, 15, 2]
+    assert seen[1]['listen_duty_cycle'] < 1.0
+    assert seen[2]['detection_fps'] == 0
+
+def test_failed_profile_is_rolled_back():
+    """A subsystem rejecting a profile leaves every subsystem on the old mode"""
+    manager = ModeManager()
+    seen = []
+    manager.register_profile_target('recorder', seen.append)
+
+    def reject_night(profile):
+        if profile['log_level'] == 'WARNING':
+            raise ValueError('rejected')
+    manager.register_profile_target('picky', reject_night)
+
+    result = manager.set_mode('night')
+    assert result['status'] == 'error'
+    assert manager.current_mode == 'home'
+    assert seen[-1] == manager.get_profile('home')
+
+def test_subsystems_apply_profiles():
+    """Voice input and TTS act on duty cycle and verbosity"""
+    voice = VoiceInput()
+    voice.apply_profile(ModeManager().get_profile('night'))
+    assert voice.listen_duty_cycle == 0.5
+
+    tts = TTSOutput()
+    try:
+        tts.apply_profile({'tts_verbosity': 'brief'})
+        assert tts.verbosity == 'brief'
+        assert tts._first_sentence('Mode changed. All sensors online.') == 'Mode changed.'
+        assert tts._first_sentence('No punctuation here') == 'No punctuation here'
+    finally:
+        tts.shutdown()
+
+def test_mode_can_fix_the_energy_threshold():
+    """A mode's profile override replaces the adaptive threshold until removed"""
+    manager = ModeManager()
+    voice = VoiceInput()
+    manager.register_profile_target('voice_input', voice.apply_profile)
+    assert voice.get_noise_metrics()['adaptive_threshold']
+
+    assert manager.customize_mode('home', {'profile': {'energy_threshold': 1200}})['status'] == 'success'
+    assert voice.get_noise_metrics()['energy_threshold'] == 1200
+    assert manager.get_profile('home')['detection_fps'] == 10
+
+    manager.set_mode('night')
+    assert voice.get_noise_metrics()['adaptive_threshold']
+    assert voice.noise_floor.margin == 3.5
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+LYRA 3.0 Phrase Cache Test
+Test the on-disk LRU cache of synthesized phrases and its use by TTSOutput
+"""
+
+import os
+import sys
+import time
+import wave
+
+# Add core modules to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'core'))
+
+from core import tts_output as tts_module
+from core.context_manager import ContextManager
+from core.decision_engine import DecisionEngine
+from core.phrase_cache import PhraseCache
+from core.tts_output import TTSOutput
+
+SETTINGS = {'voice': 'zira', 'rate': 150, 'volume': 0.9}
+
+def write_wav(text, path):
+    """Stand-in synthesizer: 0.1 s of silence per character"""
+    with wave.open(path, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(1000)
+        wav.writeframes(b'\x00\x00' * 100 * len(text))
+
+class RecordingEngine:
+    """Records what it is asked to speak and to render"""
+    def __init__(self):
+        self.spoken = []
+        self.rendered = []
+
+    def say(self, text):
+        self.spoken.append(text)
+
+    def save_to_file(self, text, path):
+        self.rendered.append(text)
+        write_wav(text, path)
+
+    def runAndWait(self):
+        pass
+
+    def stop(self):
+        pass
+
+class FakeOutput:
+    """Output stream collecting what is written to it"""
+    def __init__(self, played):
+        self.played = played
+
+    def write(self, data):
+        self.played.append(data)
+
+    def stop_stream(self):
+        pass
+
+    def close(self):
+        pass
+
+def test_cache_evicts_least_recently_used_and_persists(tmp_path):
+    """Touched phrases survive eviction, and the cache reloads from disk"""
+    cache = PhraseCache(str(tmp_path), max_bytes=3200)
+    for text in ['alpha', 'bravo', 'hotel']:
+        assert cache.put(text, SETTINGS, write_wav)
+    assert cache.get('alpha', SETTINGS)
+    # A different voice is a different phrase
+    assert cache.get('alpha', dict(SETTINGS, rate=200)) is None
+
+    cache.put('delta', SETTINGS, write_wav)
+    assert cache.get('bravo', SETTINGS) is None
+    assert cache.get_stats()['evictions'] == 1
+
+    reloaded = PhraseCache(str(tmp_path), max_bytes=3200)
+    assert reloaded.contains('alpha', SETTINGS) and reloaded.contains('delta', SETTINGS)
+    assert not reloaded.contains('bravo', SETTINGS)
+
+def test_failed_synthesis_leaves_nothing_behind(tmp_path):
+    """A synthesizer error is not cached and its partial file is removed"""
+    def broken(text, path):
+        open(path, 'wb').close()
+
+    cache = PhraseCache(str(tmp_path))
+    assert cache.put('alpha', SETTINGS, broken) is None
+    assert not cache.contains('alpha', SETTINGS)
+    assert os.listdir(tmp_path) == []
+
+def test_prewarmed_phrases_play_from_cache(tmp_path, monkeypatch):
+    """Prewarmed responses play from their file; other short phrases are cached on first use"""
+    monkeypatch.setattr(tts_module, 'TTS_AVAILABLE', True)
+    monkeypatch.setattr(tts_module, 'PYAUDIO_AVAILABLE', True)
+    tts = TTSOutput(phrase_cache=PhraseCache(str(tmp_path)))
+    played = []
+    tts._open_output = lambda width, channels, rate: FakeOutput(played)
+    tts.engine = engine = RecordingEngine()
+    try:
+        assert tts.prewarm(['Switching to night mode', 'Hello Commander. LYRA 3.0 is ready.']) == 3
+        deadline = time.monotonic() + 2
+        while len(engine.rendered) < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert engine.rendered == ['Switching to night mode', 'Hello Commander. LYRA 3.0 is ready.',
+                                   'Hello Commander.']
+
+        for text in ['Switching to night mode', 'Command received.', 'Hello Commander. LYRA 3.0 is ready.']:
+            tts.speak(text)
+            tts.speech_queue.join()
+        tts.speak('Command received.')
+        tts.speech_queue.join()
+
+        # Only the phrase never heard before was rendered, and never spoken live
+        assert engine.rendered[3:] == ['Command received.'] and engine.spoken == []
+        assert sum(len(data) for data in played) == 2 * 100 * (23 + 2 * 17 + 35)
+        assert tts.phrase_cache.get_stats()['hits'] == 3
+    finally:
+        tts.shutdown()
+
+def test_engine_response_templates(tmp_path, monkeypatch):
+    """Templates cover the fixed and parameterised handler messages"""
+    monkeypatch.chdir(tmp_path)
+    engine = DecisionEngine(ContextManager(config_dir=str(tmp_path / 'config')))
+    templates = engine.get_response_templates()
+
+    for message in ['Switching to defense mode', 'TRINETRA moving left', 'KRAIT-3 hover command executed',
+                    'Voice recognition stopped', 'You are welcome, Commander.']:
+        assert message in templates
+    assert engine.process_command('switch to night mode')['message'] in templates
+    assert len(templates) == len(set(templates))
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+LYRA 3.0 Session Registry Test
+Test per-client session contexts, caps and eviction
+"""
+
+import json
+import os
+import sys
+
+# Add core modules to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'core'))
+
+from core.context_manager import ContextManager
+from core.session_registry import SessionRegistry
+
+def make_registry(tmp_path, **kwargs):
+    return SessionRegistry(ContextManager(config_dir=str(tmp_path)), **kwargs)
+
+def test_sessions_keep_separate_history_and_preferences(tmp_path):
+    """Sessions are isolated from each other but share the context manager"""
+    registry = make_registry(tmp_path)
+    registry.context_manager.set_user_preference('voice', 'default')
+    alpha, bravo = registry.get('alpha'), registry.get('bravo')
+
+    alpha.add_conversation_entry({'command': 'status'})
+    assert alpha.set_preference('voice', 'female')
+
+    assert [e['command'] for e in alpha.get_recent_conversation()] == ['status']
+    assert bravo.get_recent_conversation() == []
+    assert alpha.get_preference('voice') == 'female'
+    assert bravo.get_preference('voice') == 'default'
+    assert registry.get('alpha') is alpha
+    assert bravo.get_summary()['client_session']['session_id'] == 'bravo'
+
+def test_summary_json_splices_in_the_session(tmp_path):
+    """The pre-serialized summary decodes to the same summary plus extra fields"""
+    registry = make_registry(tmp_path)
+    alpha = registry.get('alpha')
+    alpha.set_preference('voice', 'female')
+
+    encoded = json.loads(alpha.get_summary_json(sessions=registry.get_stats()))
+    summary = json.loads(json.dumps(alpha.get_summary(), default=str))
+    assert encoded['client_session'] == summary['client_session']
+    assert encoded['device_states'] == summary['device_states']
+    assert encoded['mode'] == 'home'
+    assert encoded['sessions'] == registry.get_stats()
+
+def test_session_memory_is_capped(tmp_path):
+    """History is trimmed by entry count and bytes; oversized preferences are refused"""
+    registry = make_registry(tmp_path, max_history=5, max_session_bytes=1000)
+    session = registry.get('alpha')
+    for i in range(50):
+        session.add_conversation_entry({'command': f'command {i}'})
+
+    assert len(session.get_recent_conversation(100)) == 5
+    session.add_conversation_entry({'command': 'x' * 600})
+    assert session.bytes_used <= 1000
+    assert not session.set_preference('notes', 'y' * 2000)
+    assert registry.get_stats()['bytes'] == session.bytes_used
+
+def test_lru_and_idle_eviction(tmp_path):
+    """The least recently used session goes first; idle sessions expire"""
+    registry = make_registry(tmp_path, max_sessions=2, idle_timeout=60)
+    registry.get('alpha')
+    registry.get('bravo')
+    registry.get('alpha')
+    registry.get('charlie')
+
+    assert registry.get_stats()['sessions'] == 2
+    assert registry.close('bravo') is False
+
+    registry.get('alpha').last_seen -= 120
+    assert registry.evict_idle() == 1
+    stats = registry.get_stats()
+    assert stats['sessions'] == 1
+    assert stats['evicted'] == 2
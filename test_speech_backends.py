@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+LYRA 3.0 Speech Backend Test
+Test backend selection, streaming and the benchmark helpers
+"""
+
+import json
+import os
+import queue
+import sys
+import types
+import wave
+
+import numpy as np
+import pytest
+
+# Add core modules to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'core'))
+
+from core import speech_backends
+from core.audio_buffer import UtteranceSegmenter
+from core.speech_backends import SpeechBackend, SpeechStream, pcm_to_float, select_backend
+from core.voice_input import VoiceInput
+import benchmark_stt
+
+class FakeStreamingBackend(SpeechBackend):
+    """Reports one more word per chunk and ends the utterance after three"""
+    name = 'fake'
+    streaming = True
+
+    @property
+    def available(self):
+        return True
+
+    def stream(self, chunks, sample_rate, on_partial=None):
+        words = []
+        for chunk in chunks:
+            words.append(f'word{len(words)}')
+            if len(words) == 3:
+                return ' '.join(words)
+            on_partial(' '.join(words))
+        return ' '.join(words)
+
+    def transcribe(self, pcm, sample_rate, grammar=None):
+        return self.stream([pcm], sample_rate, on_partial=lambda text: None)
+
+class UnavailableBackend(SpeechBackend):
+    name = 'missing'
+
+    def transcribe(self, pcm, sample_rate, grammar=None):
+        return ''
+
+def test_backend_without_transcribe_fails_on_creation():
+    """An incomplete backend is rejected when created, not on the first utterance"""
+    class IncompleteBackend(SpeechBackend):
+        name = 'incomplete'
+
+    with pytest.raises(TypeError):
+        IncompleteBackend()
+
+def test_select_backend_skips_unavailable(monkeypatch):
+    """The first available backend in order is chosen"""
+    monkeypatch.setitem(speech_backends.BACKENDS, 'missing', UnavailableBackend)
+    monkeypatch.setitem(speech_backends.BACKENDS, 'fake', FakeStreamingBackend)
+    assert select_backend(['missing', 'fake']).name == 'fake'
+    assert select_backend(['missing']) is None
+
+def test_pcm_to_float_resamples():
+    """16-bit PCM becomes float32 audio at the target rate"""
+    pcm = (np.full(8000, 16384, dtype='<i2')).tobytes()
+    audio = pcm_to_float(pcm, 8000, 16000)
+    assert audio.dtype == np.float32
+    assert len(audio) == 16000
+    assert np.allclose(audio, 0.5)
+
+def test_benchmark_reports_partials_and_wer(tmp_path, monkeypatch, capsys):
+    """The benchmark streams corpus files and scores them against references"""
+    monkeypatch.setitem(speech_backends.BACKENDS, 'fake', FakeStreamingBackend)
+    with wave.open(str(tmp_path / 'one.wav'), 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(16000)
+        wav.writeframes(b'\x00\x00' * 16000)
+    (tmp_path / 'one.txt').write_text('word0 word1 other')
+
+    assert benchmark_stt.benchmark(str(tmp_path), ['fake']) == 0
+    output = capsys.readouterr().out
+    assert "first partial" in output
+    assert "WER 33%" in output
+    assert benchmark_stt.word_error_rate('turn on lights', 'turn lights') == 1 / 3
+
+class PausingRecognizer:
+    """Vosk recognizer that closes a segment at every silent chunk"""
+    def __init__(self, model, sample_rate, grammar=None):
+        self.words = []
+
+    def AcceptWaveform(self, chunk):
+        if chunk == b'pause':
+            return True
+        self.words.append(chunk.decode())
+        return False
+
+    def Result(self):
+        text, self.words = ' '.join(self.words), []
+        return json.dumps({'text': text})
+
+    def PartialResult(self):
+        return json.dumps({'partial': ' '.join(self.words)})
+
+    def FinalResult(self):
+        return self.Result()
+
+def test_vosk_keeps_words_after_a_pause(monkeypatch):
+    """Every segment Vosk closes at a pause ends up in the transcript"""
+    monkeypatch.setattr(speech_backends, 'vosk', types.SimpleNamespace(KaldiRecognizer=PausingRecognizer),
+                        raising=False)
+    backend = speech_backends.VoskBackend()
+    backend._model = object()
+    partials = []
+    chunks = [b'turn', b'on', b'pause', b'the', b'lights']
+    assert backend.stream(chunks, 16000, partials.append) == 'turn on the lights'
+    assert partials[-1] == 'turn on the lights'
+    assert backend.transcribe(b'lights', 16000) == 'lights'
+
+class WordPerChunkStream(SpeechStream):
+    """Hears one more word in every chunk that is not silent"""
+    def __init__(self, backend, sample_rate, on_partial=None, grammar=None):
+        super().__init__(backend, sample_rate, on_partial, grammar)
+        self.words = []
+
+    def feed(self, chunk):
+        if np.frombuffer(chunk, dtype='<i2').any():
+            self.words.append(f'word{len(self.words)}')
+            self.on_partial(' '.join(self.words))
+
+    def finish(self):
+        return ' '.join(self.words)
+
+class WordPerChunkBackend(SpeechBackend):
+    name = 'words'
+    streaming = True
+
+    @property
+    def available(self):
+        return True
+
+    def transcribe(self, pcm, sample_rate, grammar=None):
+        return 'decoded again'
+
+    def open_stream(self, sample_rate, on_partial=None, grammar=None):
+        return WordPerChunkStream(self, sample_rate, on_partial, grammar)
+
+class ScriptedRing:
+    """Ring buffer handing out prepared chunks, then ending the segment loop"""
+    def __init__(self, voice, pcm, chunk_bytes=2048):
+        self.voice = voice
+        self.chunks = [pcm[offset:offset + chunk_bytes] for offset in range(0, len(pcm), chunk_bytes)]
+
+    def read(self, max_samples=None, timeout=None):
+        if not self.chunks:
+            self.voice.listening = False
+            return b''
+        return self.chunks.pop(0)
+
+def test_partials_arrive_while_the_user_is_speaking():
+    """The live recognizer reports partials before the utterance ends and its transcript is reused"""
+    voice = VoiceInput()
+    voice.backend = WordPerChunkBackend()
+    voice.wake_word_spotter = None
+    voice.segmenter = UtteranceSegmenter(16000, pause=0.5)
+    voice.utterances = queue.Queue()
+    voice.listening = voice.active = True
+    partials = []
+    voice.set_partial_callback(lambda text: partials.append(
+        (text, voice.segmenter.in_utterance, voice.utterances.empty())))
+    silence = bytes(16000)
+    speech = (np.sin(np.arange(16000) / 5) * 4000).astype('<i2').tobytes()
+    voice.ring = ScriptedRing(voice, silence + speech + silence + silence)
+
+    voice._segment_loop()
+    assert len(partials) > 5
+    # Every partial came while the utterance was still open and before it was queued
+    assert all(in_utterance and nothing_queued for _, in_utterance, nothing_queued in partials)
+    pcm, spotted, barge_in, streamed = voice.utterances.get_nowait()
+    assert streamed == partials[-1][0]
+    assert voice._transcribe_utterance(pcm, 16000, streamed=streamed) == streamed
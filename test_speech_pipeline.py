@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+LYRA 3.0 Speech Pipeline Test
+Test that long responses start playing after their first sentence is rendered
+"""
+
+import os
+import sys
+import tempfile
+import time
+import wave
+
+# Add core modules to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'core'))
+
+from core import tts_output as tts_module
+from core.tts_output import TTSOutput, split_sentences
+
+RATE = 8000
+
+class SlowEngine:
+    """Takes 50 ms to render each sentence into 150 ms of audio"""
+    def __init__(self):
+        self.rendered = []
+
+    def save_to_file(self, text, path):
+        time.sleep(0.05)
+        self.rendered.append(text)
+        with wave.open(path, 'wb') as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(RATE)
+            wav.writeframes(b'\x00\x00' * int(0.15 * RATE))
+
+    def runAndWait(self):
+        pass
+
+    def stop(self):
+        pass
+
+class RealTimeOutput:
+    """Output stream that takes as long to write audio as it lasts"""
+    def __init__(self):
+        self.written = 0
+
+    def write(self, data):
+        self.written += len(data)
+        time.sleep(len(data) / 2 / RATE)
+
+    def stop_stream(self):
+        pass
+
+    def close(self):
+        pass
+
+def test_split_sentences():
+    """Sentences split at their end; overlong ones at clause boundaries"""
+    assert split_sentences('Hello Commander. Pi is 3.14! Ready?') == ['Hello Commander.', 'Pi is 3.14!', 'Ready?']
+    long_sentence = 'Photosynthesis converts light into chemical energy, ' * 6
+    chunks = split_sentences(long_sentence, max_length=120)
+    assert len(chunks) > 1 and all(len(chunk) <= 120 for chunk in chunks)
+    assert ' '.join(chunks) == long_sentence.strip()
+
+def test_first_audio_does_not_wait_for_the_whole_answer(tmp_path, monkeypatch):
+    """Playback starts after one sentence and plays every sentence on one stream"""
+    monkeypatch.setattr(tts_module, 'TTS_AVAILABLE', True)
+    monkeypatch.setattr(tts_module, 'PYAUDIO_AVAILABLE', True)
+    monkeypatch.setattr(tempfile, 'tempdir', str(tmp_path))
+    tts = TTSOutput(phrase_cache=None)
+    outputs = []
+
+    def open_output(width, channels, rate):
+        outputs.append(RealTimeOutput())
+        return outputs[-1]
+
+    tts._open_output = open_output
+    tts.engine = engine = SlowEngine()
+    try:
+        answer = ' '.join(f'This is sentence number {n} of a long knowledge answer.' for n in range(10))
+        tts.speak(answer)
+        assert tts.speech_queue.join(timeout=5)
+
+        assert len(engine.rendered) == 10
+        # Rendering all ten sentences first would take 500 ms
+        assert tts.get_queue_stats()['first_audio_ms'] < 250
+        assert len(outputs) == 1 and outputs[0].written == 10 * int(0.15 * RATE) * 2
+        assert os.listdir(tmp_path) == []
+    finally:
+        tts.shutdown()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+LYRA 3.0 Speech Queue Test
+Test priority ordering, coalescing, superseding, staleness and preemption
+"""
+
+import os
+import queue
+import sys
+import threading
+import time
+
+import pytest
+
+# Add core modules to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'core'))
+
+from core import tts_output as tts_module
+from core.speech_queue import SpeechQueue
+from core.tts_output import TTSOutput
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class BlockingEngine:
+    """Speaks until stopped, recording what it was asked to say"""
+    def __init__(self):
+        self.spoken = []
+        self.stopped = threading.Event()
+
+    def say(self, text):
+        self.spoken.append(text)
+        self.stopped.clear()
+
+    def runAndWait(self):
+        self.stopped.wait(timeout=0.3)
+
+    def stop(self):
+        self.stopped.set()
+
+def drain(speech):
+    texts = []
+    while True:
+        try:
+            item = speech.get(timeout=0)
+        except queue.Empty:
+            return texts
+        texts.append(item['text'])
+        speech.task_done()
+
+def test_priority_order_and_coalescing():
+    """Urgent phrases go first, FIFO within a level; repeats merge into the waiting one"""
+    speech = SpeechQueue()
+    speech.put('Retrieving system status', 'low')
+    speech.put('TRINETRA camera activated')
+    speech.put('Battery low', 'high')
+    assert speech.put('TRINETRA camera activated', 'high') == 'coalesced'
+    speech.put('KRAIT-3 status requested')
+
+    # The repeat promoted the earlier request, which keeps its place among high ones
+    assert drain(speech) == ['TRINETRA camera activated', 'Battery low',
+                             'KRAIT-3 status requested', 'Retrieving system status']
+    assert speech.join(timeout=0)
+    with pytest.raises(ValueError):
+        speech.put('Hello', 'urgent')
+
+def test_superseded_and_stale_speech_is_skipped():
+    """Only the latest phrase on a topic is kept, and old phrases are not spoken"""
+    clock = FakeClock()
+    speech = SpeechQueue(clock=clock)
+    for direction in ['forward', 'left', 'right']:
+        speech.put(f'TRINETRA moving {direction}', topic='trinetra_move')
+        clock.now += 0.2
+    speech.put('Switching to night mode', 'low')
+    assert speech.get_stats()['superseded'] == 2
+
+    clock.now += 6
+    assert drain(speech) == ['TRINETRA moving right']
+    stats = speech.get_stats()
+    assert stats['stale'] == 1 and stats['depth'] == 0
+
+def test_critical_alert_preempts_current_speech(monkeypatch):
+    """A critical alert cuts off the phrase playing; button spam collapses to the latest state"""
+    monkeypatch.setattr(tts_module, 'TTS_AVAILABLE', True)
+    tts = TTSOutput()
+    tts.engine = engine = BlockingEngine()
+    try:
+        tts.speak('Available commands: system status, TRINETRA control, KRAIT-3 control')
+        deadline = time.monotonic() + 2
+        while not tts.is_speaking() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        for direction in ['forward', 'left', 'forward', 'right']:
+            tts.speak(f'TRINETRA moving {direction}')
+        tts.speak('KRAIT-3 emergency_land', 'critical')
+        assert tts.speech_queue.join(timeout=3)
+
+        assert engine.spoken[1:] == ['KRAIT-3 emergency_land', 'TRINETRA moving right']
+        stats = tts.get_queue_stats()
+        assert stats['preempted'] == 1 and stats['superseded'] == 3
+    finally:
+        tts.shutdown()
+
+def test_stop_lands_on_the_phrase_handed_out():
+    """A stop between get() and playback is kept; a critical phrase is not preempted"""
+    speech = SpeechQueue()
+    speech.put('Available commands: system status')
+    item = speech.get(timeout=0)
+    assert speech.stop_current()
+    assert item['stopped'].is_set()
+    speech.task_done()
+    assert not speech.stop_current()
+
+    speech.put('KRAIT-3 emergency_land', 'critical')
+    alert = speech.get(timeout=0)
+    assert not speech.stop_current(below='critical')
+    assert not alert['stopped'].is_set()
+
+def test_stopped_phrase_is_never_played(monkeypatch):
+    """A phrase stopped before the worker starts it stays silent; bad priorities fall back"""
+    monkeypatch.setattr(tts_module, 'TTS_AVAILABLE', True)
+    tts = TTSOutput()
+    tts.engine = engine = BlockingEngine()
+    try:
+        stopped = threading.Event()
+        stopped.set()
+        tts._say('TRINETRA moving left', stopped)
+        assert engine.spoken == []
+
+        tts.speak('Hello Commander', 'urgent')
+        assert tts.speech_queue.join(timeout=3)
+        assert engine.spoken == ['Hello Commander']
+    finally:
+        tts.shutdown()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+LYRA 3.0 Telemetry Test
+Test the background host metrics sampler against a fake /proc and /sys
+"""
+
+import os
+import sys
+import threading
+import time
+
+# Add core modules to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'core'))
+
+from core.telemetry import TelemetrySampler
+
+NET_HEADER = 'Inter-|   Receive\n face |bytes    packets\n'
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+def fake_host(root, busy, idle, received):
+    """Write procfs and sysfs files for cumulative CPU jiffies and received bytes"""
+    write(root / 'proc' / 'stat', f'cpu  {busy} 0 0 {idle} 0 0 0 0 0 0\ncpu0 1 0 0 1 0 0 0 0 0 0\n')
+    write(root / 'proc' / 'meminfo', 'MemTotal:  1000000 kB\nMemFree:  100000 kB\nMemAvailable:  250000 kB\n')
+    write(root / 'proc' / 'loadavg', '0.50 0.40 0.30 1/100 999\n')
+    write(root / 'proc' / 'net' / 'dev', NET_HEADER +
+          '    lo: 999999 0 0 0 0 0 0 0 999999 0 0 0 0 0 0 0\n'
+          f'  eth0: {received} 0 0 0 0 0 0 0 2000 0 0 0 0 0 0 0\n')
+    write(root / 'sys' / 'class' / 'thermal' / 'thermal_zone0' / 'temp', '61250\n')
+
+def test_samples_are_deltas_between_readings(tmp_path):
+    """CPU load and network rate come from the change since the previous sample"""
+    fake_host(tmp_path, busy=1000, idle=9000, received=5000)
+    sampler = TelemetrySampler(proc_root=str(tmp_path / 'proc'), sys_root=str(tmp_path / 'sys'),
+                               disk_path=str(tmp_path))
+    first = sampler.sample()
+    assert first['cpu_percent'] == 0.0
+    assert first['memory_percent'] == 75.0 and first['cpu_temp'] == 61.2
+    assert first['load_avg'] == [0.5, 0.4, 0.3]
+
+    # 300 of the next 400 jiffies busy
+    fake_host(tmp_path, busy=1300, idle=9100, received=9000)
+    second = sampler.sample()
+    assert second['cpu_percent'] == 75.0
+    assert second['net_rx_bytes_per_s'] > 0 and second['net_tx_bytes_per_s'] == 0
+    assert 0 <= second['disk_percent'] <= 100
+    assert sampler.samples == 2
+
+def test_slow_sources_never_hold_up_status_reads(tmp_path):
+    """A source blocking for seconds delays neither snapshots nor core samples"""
+    release = threading.Event()
+
+    def connectivity_check():
+        release.wait(timeout=5)
+        return True
+
+    sampler = TelemetrySampler(interval=0.05)
+    sampler.add_source('network_connected', connectivity_check, interval=30)
+    sampler.add_source('broken', lambda: 1 / 0)
+    sampler.start()
+    try:
+        time.sleep(0.3)
+        started = time.perf_counter()
+        snapshot = sampler.snapshot()
+        assert time.perf_counter() - started < 0.01
+        assert sampler.samples >= 3
+        assert 'network_connected' not in snapshot and 'broken' not in snapshot
+        assert snapshot['age'] < 0.2
+
+        release.set()
+        deadline = time.monotonic() + 2
+        while 'network_connected' not in sampler.snapshot() and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert sampler.snapshot()['network_connected'] is True
+    finally:
+        release.set()
+        sampler.stop()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+LYRA 3.0 Thermal Scheduler Test
+Test profile step-down under heat and load, with hysteresis
+"""
+
+import os
+import sys
+
+# Add core modules to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'core'))
+
+from core.mode_manager import ModeManager
+from core.thermal_scheduler import ThermalScheduler
+
+def reading(temp, cpu=20.0, memory=40.0):
+    return {'cpu_temp': temp, 'cpu_percent': cpu, 'memory_percent': memory}
+
+def test_steps_down_and_recovers_with_hysteresis():
+    """Heat escalates at once; recovery needs sustained calm below the exit threshold"""
+    manager = ModeManager()
+    manager.set_mode('defense')
+    applied = []
+    manager.register_profile_target('recorder', applied.append)
+    scheduler = ThermalScheduler(manager, lambda: {}, recover_samples=2)
+
+    assert scheduler.evaluate(reading(60)) == 0
+    assert scheduler.evaluate(reading(78)) == 2
+    assert applied[-1]['detection_fps'] == 1
+    assert applied[-1]['detection_imgsz'] == 320
+
+    # 74 °C is below the 77 °C entry point but above the 72 °C exit point
+    for _ in range(5):
+        assert scheduler.evaluate(reading(74)) == 2
+
+    assert scheduler.evaluate(reading(71)) == 2
+    assert scheduler.evaluate(reading(71)) == 1
+    assert applied[-1]['detection_fps'] == 5
+
+    # Calm samples have to be consecutive
+    scheduler.evaluate(reading(64))
+    scheduler.evaluate(reading(66))
+    scheduler.evaluate(reading(64))
+    assert scheduler.level == 1
+    assert scheduler.evaluate(reading(64)) == 0
+    assert applied[-1] == manager.mode_configs['defense']['profile']
+
+    reasons = [decision['reason'] for decision in scheduler.decisions]
+    assert reasons[0] == 'cpu_temp 78.0 >= 77.0'
+    assert reasons[1].startswith('cpu_temp 71.0')
+
+def test_load_and_memory_trigger_and_limits_survive_mode_changes():
+    """Any watched metric can escalate, and caps stay on across mode switches"""
+    manager = ModeManager()
+    scheduler = ThermalScheduler(manager, lambda: {})
+
+    assert scheduler.evaluate(reading(50, memory=90.0)) == 1
+    assert scheduler.decisions[-1]['reason'] == 'memory_percent 90.0 >= 85.0'
+
+    manager.set_mode('defense')
+    assert manager.get_profile()['detection_fps'] == 5
+    assert manager.get_profile()['status_interval'] == 10
+
+    assert scheduler.evaluate(reading(50, cpu=97.0)) == 2
+    scheduler.stop()
+    assert scheduler.level == 0
+    assert manager.get_profile() == manager.mode_configs['defense']['profile']
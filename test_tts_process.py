@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+LYRA 3.0 TTS Process Test
+Test the out-of-process speech worker and its watchdog
+"""
+
+import os
+import sys
+import time
+
+import pytest
+
+# Add core modules to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'core'))
+
+from core.tts_process import TTSProcess
+
+class HangingEngine:
+    """
+    pyttsx3 engine whose driver never returns from runAndWait
+
+    Passed to the worker as its engine factory; the spawned child imports it
+    from this module.
+    """
+    def setProperty(self, name, value):
+        pass
+
+    def getProperty(self, name):
+        return []
+
+    def say(self, text):
+        pass
+
+    def runAndWait(self):
+        time.sleep(60)
+
+    def stop(self):
+        pass
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.02)
+    return condition()
+
+def test_worker_process_keeps_the_tts_api(tmp_path, monkeypatch):
+    """Calls reach the worker, answers come back, and errors are raised in the caller"""
+    monkeypatch.chdir(tmp_path)
+    tts = TTSProcess()
+    try:
+        assert tts.process.pid != os.getpid()
+        assert tts._context.get_start_method() == 'spawn'
+        tts.speak('Switching to night mode')
+        tts.speak('TRINETRA moving left')
+        assert wait_for(lambda: tts.get_queue_stats().get('queued') == 2)
+
+        tts.apply_profile({'tts_verbosity': 'brief'})
+        assert tts.verbosity == 'brief'
+        with pytest.raises(ValueError):
+            tts.apply_profile({'tts_verbosity': 'shouting'})
+        # A bad priority is logged and spoken at normal priority, never raised
+        tts.speak('Hello', 'urgent')
+        assert tts.interrupt() == {'interrupted': False}
+    finally:
+        tts.shutdown()
+    assert not tts.process.is_alive()
+
+def test_hung_engine_is_restarted(tmp_path, monkeypatch):
+    """A phrase stuck in the driver gets the worker replaced, with settings restored"""
+    monkeypatch.chdir(tmp_path)
+    tts = TTSProcess(hang_seconds=0.5, hang_seconds_per_char=0, engine_factory=HangingEngine)
+    try:
+        first_pid = tts.process.pid
+        tts.set_voice_settings({'rate': 180})
+        tts.speak('Hello Commander.')
+        assert wait_for(tts.is_speaking)
+        assert wait_for(lambda: tts.restarts == 1)
+        assert tts.process.pid != first_pid and tts.process.is_alive()
+        assert not tts.is_speaking()
+        assert tts.get_voice_settings()['rate'] == 180
+    finally:
+        tts.shutdown()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+LYRA 3.0 Voice Activity Detection Test
+Test speech/noise decisions, hangover smoothing and trimming
+"""
+
+import os
+import sys
+
+import numpy as np
+
+# Add core modules to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'core'))
+
+from core.audio_buffer import UtteranceSegmenter
+from core.vad import NoiseFloorEstimator, VoiceActivityDetector
+
+RATE = 16000
+rng = np.random.default_rng(0)
+
+def voiced(seconds, amplitude=3000):
+    """A vowel-like sound: a 150 Hz fundamental with decaying harmonics"""
+    t = np.arange(int(seconds * RATE)) / RATE
+    wave = sum(np.sin(2 * np.pi * 150 * k * t) / k for k in range(1, 8))
+    return amplitude * wave / np.sqrt(np.mean(wave ** 2))
+
+def hiss(seconds, level=3000):
+    return rng.normal(0, level, int(seconds * RATE))
+
+def silence(seconds):
+    return np.zeros(int(seconds * RATE))
+
+def to_pcm(audio):
+    return np.clip(audio, -32768, 32767).astype('<i2').tobytes()
+
+def test_speech_is_detected_but_loud_noise_is_not():
+    """Noise as loud as the speech is rejected by its flat spectrum"""
+    vad = VoiceActivityDetector(RATE)
+    assert vad.speech_mask(to_pcm(voiced(0.5))).mean() > 0.9
+    assert not vad.speech_mask(to_pcm(hiss(0.5))).any()
+    assert not vad.speech_mask(to_pcm(silence(0.5))).any()
+
+def test_hangover_bridges_pauses_between_words():
+    """Short gaps stay inside one segment, long ones split it"""
+    vad = VoiceActivityDetector(RATE, hangover=10)
+    audio = np.concatenate([silence(0.3), voiced(0.4), silence(0.1), voiced(0.4), silence(0.6), voiced(0.3), silence(0.3)])
+    assert len(vad.segments(to_pcm(audio))) == 2
+
+    # Streaming in odd-sized chunks gives the same decisions
+    pcm = to_pcm(audio)
+    decisions = [vad.is_speech(pcm[i:i + 2000]) for i in range(0, len(pcm), 2000)]
+    assert decisions[0] is False and True in decisions and decisions[-1] is False
+
+def test_trim_and_segmenter_drop_non_speech():
+    """Utterances are trimmed to speech; noise bursts never become utterances"""
+    vad = VoiceActivityDetector(RATE)
+    trimmed = vad.trim(to_pcm(np.concatenate([silence(1.0), voiced(0.5), silence(1.0)])), margin=0.1)
+    assert 0.5 * RATE <= len(trimmed) // 2 <= 0.9 * RATE
+    assert vad.trim(to_pcm(hiss(1.0))) == b''
+
+    segmenter = UtteranceSegmenter(RATE, pause=0.3, vad=VoiceActivityDetector(RATE))
+    audio = to_pcm(np.concatenate([hiss(0.5), silence(0.5), voiced(0.6), silence(0.6)]))
+    utterances = []
+    for offset in range(0, len(audio), 3200):
+        utterances.extend(segmenter.process(audio[offset:offset + 3200]))
+    assert len(utterances) == 1
+    assert segmenter.trimmed_samples > 0
+
+def test_threshold_follows_the_noise_floor():
+    """A louder background raises the threshold within seconds; speech does not"""
+    floor = NoiseFloorEstimator(margin=3.0)
+    floor.calibrate(300)
+    vad = VoiceActivityDetector(RATE, noise_floor=floor)
+
+    def stream(audio):
+        pcm = to_pcm(audio)
+        for offset in range(0, len(pcm), 2048):
+            vad.is_speech(pcm[offset:offset + 2048])
+
+    stream(voiced(3.0))
+    assert floor.threshold == 300
+
+    stream(hiss(5.0, level=400))
+    assert 800 < floor.threshold < 1300
+    # Speech at the old level is now below the threshold
+    assert not vad.speech_mask(to_pcm(voiced(0.5, amplitude=700))).any()
+
+    stream(hiss(3.0, level=50))
+    assert floor.threshold < 300
+
+    floor.override = 500
+    assert floor.get_metrics() == {'noise_floor': round(floor.floor, 1), 'energy_threshold': 500,
+                                   'adaptive_threshold': False}
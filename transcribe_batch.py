@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+LYRA 3.0 Batch Transcription
+Transcribe a directory or list of WAV recordings in parallel
+
+Writes one JSON object per file (transcript, duration, real-time factor and,
+where a .txt reference exists, word error rate) as each file finishes,
+followed by a summary object with throughput and overall real-time factor.
+
+Usage:
+    python transcribe_batch.py recordings/ [more.wav ...] [--backend vosk]
+                               [--workers 4] [--output results.jsonl]
+"""
+
+import argparse
+import os
+import sys
+
+# Add core modules to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'core'))
+
+from core.batch_transcribe import BatchTranscriber, collect_files
+from core.speech_backends import BACKENDS, SpeechBackendError
+
+def main():
+    parser = argparse.ArgumentParser(description='Transcribe WAV recordings with LYRA speech backends')
+    parser.add_argument('sources', nargs='+', help='WAV files or directories of WAV files')
+    parser.add_argument('--backend', choices=list(BACKENDS), help='Speech backend (default: first available)')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: one per CPU core, 0 for none)')
+    parser.add_argument('--output', help='JSONL file to write (default: standard output)')
+    args = parser.parse_args()
+
+    files = []
+    for source in args.sources:
+        files.extend(collect_files(source))
+    if not files:
+        print("❌ No WAV files found", file=sys.stderr)
+        return 1
+
+    try:
+        transcriber = BatchTranscriber(args.backend, args.workers)
+    except SpeechBackendError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            summary = transcriber.run(files, output)
+    else:
+        summary = transcriber.run(files, sys.stdout)
+
+    print(f"📊 {summary['files']} files ({summary['errors']} failed), {summary['audio_seconds']:.1f} s of audio "
+          f"in {summary['wall_seconds']:.1f} s: RTF {summary['rtf']}, "
+          f"{summary['throughput']}x real time on {summary['workers']} workers", file=sys.stderr)
+    return 0 if summary['errors'] == 0 else 2
+
+if __name__ == "__main__":
+    sys.exit(main())